@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from photograph.models import bump_catalog_generation
 
 
 class Album(models.Model):
@@ -35,3 +38,17 @@ class Album(models.Model):
 
     def __str__(self):
         return self.name
+
+
+@receiver([post_save, post_delete], sender=Album)
+def _bump_catalog_generation(sender, raw=False, **kwargs):
+    """Bump the catalog generation when an album changes."""
+    if not raw:
+        bump_catalog_generation()
+
+
+@receiver(m2m_changed, sender=Album.photos.through)
+def _bump_catalog_generation_on_photos(sender, action, **kwargs):
+    """Bump the catalog generation when photos are added to or removed from an album."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_catalog_generation()
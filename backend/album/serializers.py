@@ -23,4 +23,8 @@ class AlbumSerializer(serializers.ModelSerializer):
 
     def get_photos_count(self, obj):
         """Get the count of photos in this album."""
+        # Use the count annotated by AlbumViewSet if available
+        photos_count = getattr(obj, "photos_count", None)
+        if photos_count is not None:
+            return photos_count
         return obj.photos.count()
@@ -1,17 +1,22 @@
 """API views for the album app."""
 
+from django.db.models import Count
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
+from photograph.cache import CachedResponseMixin
 from .models import Album
 from .serializers import AlbumSerializer
 
 
-class AlbumViewSet(viewsets.ModelViewSet):
+class AlbumViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """ViewSet for viewing and editing Album instances."""
 
-    queryset = Album.objects.all().prefetch_related("photos")
+    # Meta.ordering is not applied to aggregation queries, so order explicitly
+    queryset = Album.objects.annotate(photos_count=Count("photos")).order_by(
+        "-created_at"
+    )
     serializer_class = AlbumSerializer
 
     @action(detail=True, methods=["post"])
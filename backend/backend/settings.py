@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -130,6 +130,36 @@ STATIC_URL = "static/"
 MEDIA_URL = "media/"
 MEDIA_ROOT = config("MEDIA_ROOT", default=BASE_DIR / "media", cast=Path)
 
+# Hash algorithm for new photograph hashes: "md5", "blake2b" or "blake3"
+# (blake3 requires the blake3 package). Photographs are only matched by hash
+# within the same algorithm.
+PHOTOCHART_HASH_ALGORITHM = config("PHOTOCHART_HASH_ALGORITHM", default="md5")
+
+# Sizes (longest edge in pixels) of the renditions generated for each
+# photograph, as a comma-separated list
+PHOTOCHART_RENDITION_SIZES = config(
+    "PHOTOCHART_RENDITION_SIZES", default="150,640,1920", cast=Csv(int)
+)
+
+# Caches (https://docs.djangoproject.com/en/5.2/topics/cache/). Local memory
+# by default; e.g., CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# with CACHE_LOCATION=/var/tmp/photochart to share it between server processes,
+# or django.core.cache.backends.redis.RedisCache with
+# CACHE_LOCATION=redis://127.0.0.1:6379 (requires the redis package).
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="photochart"),
+        "TIMEOUT": config("CACHE_TIMEOUT", default=3600, cast=int),
+    }
+}
+
+# Cache (alias in CACHES) for API responses, invalidated when the catalog
+# changes. Empty to disable response caching (ETags are then not sent either).
+PHOTOCHART_API_CACHE = config("PHOTOCHART_API_CACHE", default="default")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
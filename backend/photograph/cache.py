@@ -0,0 +1,128 @@
+"""HTTP caching of API responses, invalidated by the catalog generation.
+
+The catalog only changes during ingest and on edits, yet every request
+recomputed timeline counts, directory listings and album lists. Responses of
+GET requests are now stored in Django's cache framework (the cache named by
+the PHOTOCHART_API_CACHE setting), keyed by the catalog generation and the
+request, and carry an ETag derived from the generation. Clients revalidate
+with If-None-Match and get a 304 until the catalog changes (see
+CatalogGeneration).
+"""
+
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+
+from .models import get_catalog_generation
+
+# Renderer formats whose responses are stored in the cache. Browsable API
+# pages embed per-session data (e.g., CSRF tokens), so they are only
+# validated with the ETag, never shared through the cache.
+CACHED_FORMATS = ("json",)
+
+
+def get_api_cache():
+    """Get the cache for API responses, or None if caching is disabled."""
+    alias = getattr(settings, "PHOTOCHART_API_CACHE", "default")
+    return caches[alias] if alias else None
+
+
+def request_digest(request) -> str:
+    """Get a digest identifying the response to a request.
+
+    Covers the scheme and host (responses contain absolute URLs), the path,
+    the query parameters in sorted order and the Accept header.
+    """
+    query = sorted(
+        (key, value) for key, values in request.GET.lists() for value in values
+    )
+    identity = "\n".join(
+        [
+            request.scheme,
+            request.get_host(),
+            request.path,
+            urlencode(query),
+            request.META.get("HTTP_ACCEPT", ""),
+        ]
+    )
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+class CachedResponseMixin:
+    """Cache and validate the GET responses of a viewset.
+
+    For GET and HEAD requests, once DRF's authentication, permission and
+    throttle checks have passed (in initial()):
+        - A request whose If-None-Match matches the current generation gets a
+          304 without running the action.
+        - Otherwise a response cached for the current generation is returned,
+          or the action runs and its successful JSON response is cached.
+
+    Responses are validated with the ETag only: the generation can change
+    several times within the one-second precision of Last-Modified.
+    Responses carry "Cache-Control: no-cache", so browsers revalidate on
+    every navigation and reuse their copy on a 304. Cached responses are
+    shared by all clients: only for views without per-user content.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        """Run the checks, then answer from the ETag or the cache if possible."""
+        self._response_cache = None
+        super().initial(request, *args, **kwargs)
+
+        cache = get_api_cache()
+        if cache is None or request.method not in ("GET", "HEAD"):
+            return
+
+        generation = get_catalog_generation()
+        digest = request_digest(request)
+        self._response_cache = (
+            cache,
+            f"photochart:api:{generation}:{digest}",
+            f'"{generation}-{digest[:16]}"',
+        )
+        _, key, etag = self._response_cache
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response._from_cache = True
+        if response is not None:
+            # Answer with this response instead of running the action, the
+            # way ViewSet.as_view binds actions to the method handlers
+            setattr(self, request.method.lower(), lambda *args, **kwargs: response)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Cache a successful response and add the validation headers."""
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(
+            self, "_response_cache", None
+        ) is None or response.status_code not in (200, 304):
+            return response
+
+        cache, key, etag = self._response_cache
+        renderer = getattr(response, "accepted_renderer", None)
+        if (
+            response.status_code == 200
+            and not getattr(response, "_from_cache", False)
+            and renderer is not None
+            and renderer.format in CACHED_FORMATS
+        ):
+            response.render()
+            cache.set(key, (response.content, response["Content-Type"]))
+
+        response["ETag"] = etag
+        patch_cache_control(response, no_cache=True)
+        patch_vary_headers(response, ["Accept"])
+        return response
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("photograph", "0006_photopath_size_alter_photopath_path"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="photopath",
+            name="hash_pending",
+            field=models.BooleanField(
+                default=False,
+                help_text="True if the path was indexed with a deferred hash and is not linked to a photograph yet",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="photopath",
+            index=models.Index(
+                fields=["hash_pending"], name="photograph__hash_pe_85a7e4_idx"
+            ),
+        ),
+    ]
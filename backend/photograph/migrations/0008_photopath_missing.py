@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("photograph", "0007_photopath_hash_pending"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="photopath",
+            name="missing",
+            field=models.BooleanField(
+                default=False,
+                help_text="True if the file was not found at this path during the last incremental ingest",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="photopath",
+            index=models.Index(
+                fields=["missing"], name="photograph__missing_f6f5d5_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:01
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("photograph", "0008_photopath_missing"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="photograph",
+            name="hash_algorithm",
+            field=models.CharField(
+                choices=[("md5", "MD5"), ("blake2b", "BLAKE2b"), ("blake3", "BLAKE3")],
+                default="md5",
+                help_text="Algorithm that produced the hash",
+                max_length=16,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="photograph",
+            name="hash",
+            field=models.CharField(
+                blank=True,
+                help_text="Hash of the photo file (32 hex characters for MD5, 64 for BLAKE2b/BLAKE3)",
+                max_length=64,
+                null=True,
+                validators=[
+                    django.core.validators.RegexValidator(
+                        message="Hash must be a 32- or 64-character hexadecimal string",
+                        regex="^[a-f0-9]{32}([a-f0-9]{32})?$",
+                    )
+                ],
+            ),
+        ),
+    ]
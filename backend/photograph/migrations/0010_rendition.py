@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:08
+
+import django.db.models.deletion
+import photograph.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("photograph", "0009_photograph_hash_algorithm"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Rendition",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "size",
+                    models.PositiveIntegerField(
+                        help_text="Requested size of the rendition (longest edge in pixels)"
+                    ),
+                ),
+                (
+                    "image",
+                    models.ImageField(
+                        help_text="Rendition image file",
+                        upload_to=photograph.models.rendition_upload_path,
+                    ),
+                ),
+                (
+                    "width",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Actual width of the rendition in pixels",
+                        null=True,
+                    ),
+                ),
+                (
+                    "height",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Actual height of the rendition in pixels",
+                        null=True,
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="Timestamp when the rendition was created",
+                    ),
+                ),
+                (
+                    "photograph",
+                    models.ForeignKey(
+                        help_text="The photograph this rendition belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="renditions",
+                        to="photograph.photograph",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Rendition",
+                "verbose_name_plural": "Renditions",
+                "ordering": ["photograph", "size"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("photograph", "size"), name="unique_rendition_size"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("photograph", "0010_rendition"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="photograph",
+            index=models.Index(
+                fields=["created_at", "id"], name="photograph__created_2c3f29_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="photograph",
+            index=models.Index(
+                fields=["time", "id"], name="photograph__time_be8284_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="photopath",
+            index=models.Index(
+                fields=["created_at", "id"], name="photograph__created_7901de_idx"
+            ),
+        ),
+    ]
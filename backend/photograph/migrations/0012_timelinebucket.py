@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:24
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def build_timeline(apps, schema_editor):
+    """Count the existing photographs per day (see photograph.models.rebuild_timeline)."""
+    Photograph = apps.get_model("photograph", "Photograph")
+    TimelineBucket = apps.get_model("photograph", "TimelineBucket")
+    days = (
+        Photograph.objects.annotate(date=TruncDate("time"))
+        .values("date")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    TimelineBucket.objects.bulk_create(
+        TimelineBucket(
+            year=item["date"].year if item["date"] else 0,
+            month=item["date"].month if item["date"] else 0,
+            day=item["date"].day if item["date"] else 0,
+            count=item["count"],
+        )
+        for item in days
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("photograph", "0011_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimelineBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "year",
+                    models.PositiveSmallIntegerField(
+                        help_text="Year (0 for unknown time)"
+                    ),
+                ),
+                (
+                    "month",
+                    models.PositiveSmallIntegerField(
+                        help_text="Month (0 for unknown time)"
+                    ),
+                ),
+                (
+                    "day",
+                    models.PositiveSmallIntegerField(
+                        help_text="Day (0 for unknown time)"
+                    ),
+                ),
+                (
+                    "count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of photographs taken on this day"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Timeline Bucket",
+                "verbose_name_plural": "Timeline Buckets",
+                "ordering": ["year", "month", "day"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("year", "month", "day"), name="unique_timeline_day"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_timeline, migrations.RunPython.noop),
+    ]
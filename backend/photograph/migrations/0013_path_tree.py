@@ -0,0 +1,119 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:28
+
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def build_path_tree(apps, schema_editor):
+    """Fill in PhotoPath.directory and count the existing paths per directory.
+
+    See photograph.models.split_path and rebuild_path_tree.
+    """
+    PhotoPath = apps.get_model("photograph", "PhotoPath")
+    PathNode = apps.get_model("photograph", "PathNode")
+    counts = Counter()
+    changed = []
+    for photo_path in PhotoPath.objects.only("id", "path").iterator():
+        parts = [part for part in photo_path.path.replace("\\", "/").split("/") if part]
+        photo_path.directory = "/".join(parts[:-1])
+        changed.append(photo_path)
+        for index in range(len(parts) - 1):
+            counts["/".join(parts[: index + 1])] += 1
+        if len(changed) >= 500:
+            PhotoPath.objects.bulk_update(changed, ["directory"])
+            changed = []
+    PhotoPath.objects.bulk_update(changed, ["directory"])
+    PathNode.objects.bulk_create(
+        (
+            PathNode(
+                path=path,
+                parent=path.rpartition("/")[0],
+                name=path.rpartition("/")[2],
+                count=count,
+            )
+            for path, count in counts.items()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("photograph", "0012_timelinebucket"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PathNode",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "path",
+                    models.CharField(
+                        help_text="Normalized directory path",
+                        max_length=2048,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "parent",
+                    models.CharField(
+                        blank=True,
+                        help_text='Path of the parent directory ("" for top-level directories)',
+                        max_length=2048,
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Last segment of the path", max_length=255
+                    ),
+                ),
+                (
+                    "count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of photo paths in this directory and its subdirectories",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Path Node",
+                "verbose_name_plural": "Path Nodes",
+                "ordering": ["path"],
+            },
+        ),
+        migrations.AddField(
+            model_name="photopath",
+            name="directory",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Normalized directory of the path (see split_path), set on save",
+                max_length=2048,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="photopath",
+            index=models.Index(
+                fields=["directory"], name="photograph__directo_c7bd64_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pathnode",
+            index=models.Index(
+                fields=["parent", "name"], name="photograph__parent_633219_idx"
+            ),
+        ),
+        migrations.RunPython(build_path_tree, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("photograph", "0013_path_tree"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogGeneration",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "generation",
+                    models.PositiveBigIntegerField(
+                        default=0, help_text="Number of times the catalog changed"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="Timestamp of the last change",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Catalog Generation",
+                "verbose_name_plural": "Catalog Generations",
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("photograph", "0014_catalog_generation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="photograph",
+            name="missing",
+            field=models.BooleanField(
+                default=False,
+                help_text="True if none of its files exists anymore, but it was kept because it is in an album",
+            ),
+        ),
+    ]
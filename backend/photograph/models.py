@@ -6,12 +6,17 @@ photo paths across different devices.
 """
 
 import os
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from collections import Counter
+from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 from django.conf import settings
-from django.db import models
-from django.core.files import File
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.core.validators import RegexValidator
 from django.utils import timezone
 
@@ -81,26 +86,69 @@ def photograph_upload_path(instance, filename):
     return f"photographs/{dir1}/{dir2}/{dir3}/photo_{unique_id}{ext}"
 
 
+def rendition_upload_path(instance, filename):
+    """Generate the storage path of a rendition.
+
+    Renditions use the same sharded structure as photograph_upload_path (based
+    on the hash of the photograph, or its ID), under a directory per size:
+    - renditions/640/ab/cd/ef/abcdef1234567890.jpg
+
+    Args:
+        instance: The Rendition instance being saved
+        filename: The original filename
+
+    Returns:
+        A path string for the file upload
+    """
+    path = photograph_upload_path(instance.photograph, filename)
+    return f"renditions/{instance.size}/{path.split('/', 1)[1]}"
+
+
+# Algorithms from photochart.hashing.HashAlgorithm
+HASH_ALGORITHM_CHOICES = [
+    ("md5", "MD5"),
+    ("blake2b", "BLAKE2b"),
+    ("blake3", "BLAKE3"),
+]
+
+
+def get_hash_algorithm():
+    """Get the hash algorithm configured for new hashes (PHOTOCHART_HASH_ALGORITHM)."""
+    return getattr(settings, "PHOTOCHART_HASH_ALGORITHM", "md5")
+
+
+def get_rendition_sizes():
+    """Get the rendition sizes configured for new renditions (PHOTOCHART_RENDITION_SIZES)."""
+    return tuple(getattr(settings, "PHOTOCHART_RENDITION_SIZES", (150, 640, 1920)))
+
+
 class Photograph(models.Model):
     """Photograph model storing photo metadata.
 
     Represents a photograph with optional hash and thumbnail file.
     The hash can be computed using the calculate_hash function from
-    photochart.protocols.
+    photochart.protocols. Photographs are only matched by hash within the
+    same hash_algorithm.
     """
 
     hash = models.CharField(
-        max_length=32,
+        max_length=64,
         null=True,
         blank=True,
-        help_text="MD5 hash of the photo file (32 characters)",
+        help_text="Hash of the photo file (32 hex characters for MD5, 64 for BLAKE2b/BLAKE3)",
         validators=[
             RegexValidator(
-                regex=r"^[a-f0-9]{32}$",
-                message="Hash must be a 32-character hexadecimal string",
+                regex=r"^[a-f0-9]{32}([a-f0-9]{32})?$",
+                message="Hash must be a 32- or 64-character hexadecimal string",
             )
         ],
     )
+    hash_algorithm = models.CharField(
+        max_length=16,
+        choices=HASH_ALGORITHM_CHOICES,
+        default="md5",
+        help_text="Algorithm that produced the hash",
+    )
     thumbnail = models.ImageField(
         upload_to=photograph_upload_path,
         null=True,
@@ -128,6 +176,10 @@ class Photograph(models.Model):
         default=False,
         help_text="True if any error occurred during image creation or data reading",
     )
+    missing = models.BooleanField(
+        default=False,
+        help_text="True if none of its files exists anymore, but it was kept because it is in an album",
+    )
 
     class Meta:
         verbose_name = "Photograph"
@@ -135,8 +187,19 @@ class Photograph(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["hash"]),
+            # Keyset pagination on (created_at, id) and (time, id)
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["time", "id"]),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Load an instance, remembering its timeline day (see TimelineBucket)."""
+        instance = super().from_db(db, field_names, values)
+        if "time" in field_names:
+            instance._timeline_day = timeline_day(instance.time)
+        return instance
+
     def __str__(self):
         if self.hash:
             return f"Photograph ({self.hash[:8]}...)"
@@ -152,7 +215,8 @@ class Photograph(models.Model):
         in a single image read operation.
 
         Args:
-            file_path: Path to the image file
+            file_path: Path to the image file, or a seekable binary stream with
+                its contents
 
         Returns:
             Dictionary with 'datetime' and 'model' keys, or None if extraction fails
@@ -180,10 +244,12 @@ class Photograph(models.Model):
             if self.thumbnail and self.thumbnail.path:
                 from photochart.protocols import calculate_hash
 
-                hash_value = calculate_hash(self.thumbnail.path)
+                algorithm = get_hash_algorithm()
+                hash_value = calculate_hash(self.thumbnail.path, algorithm=algorithm)
                 if hash_value:
                     self.hash = hash_value
-                    self.save(update_fields=["hash"])
+                    self.hash_algorithm = algorithm
+                    self.save(update_fields=["hash", "hash_algorithm"])
                 else:
                     # Hash computation failed (returned None)
                     self.has_errors = True
@@ -216,10 +282,12 @@ class Photograph(models.Model):
 
             from photochart.protocols import calculate_hash
 
-            hash_value = calculate_hash(file_path)
+            algorithm = get_hash_algorithm()
+            hash_value = calculate_hash(file_path, algorithm=algorithm)
             if hash_value:
                 self.hash = hash_value
-                self.save(update_fields=["hash"])
+                self.hash_algorithm = algorithm
+                self.save(update_fields=["hash", "hash_algorithm"])
             else:
                 # Hash computation failed
                 self.has_errors = True
@@ -274,7 +342,53 @@ class Photograph(models.Model):
 
         return f"{timestamp_str}{extension}"
 
-    def get_image_from_file(self, file_path, resolution=None):
+    def set_thumbnail_from_bytes(self, data, file_path, extension=None, save=True):
+        """Store already-encoded image bytes in the thumbnail field.
+
+        Used when the image was rendered elsewhere (e.g., in an ingestion worker
+        process), so no file needs to be opened or decoded here.
+
+        Args:
+            data: Encoded image bytes
+            file_path: Original file path (used to determine extension if not provided)
+            extension: File extension to use (e.g., ".jpg"). If None, auto-detects
+                from the original file.
+            save: Whether to save the model after storing the file
+        """
+        filename = self._generate_timestamp_filename(file_path, extension=extension)
+        self.thumbnail.save(filename, ContentFile(data), save=save)
+
+    def _apply_exif_data(self, exif_data):
+        """Set datetime and model from extracted EXIF data if not already set.
+
+        Args:
+            exif_data: Dictionary with 'datetime' and 'model' keys, as returned
+                by _extract_exif_data (may be None)
+        """
+        if not exif_data:
+            return
+
+        update_fields = []
+
+        # Set datetime if not already set
+        if not self.time and exif_data.get("datetime"):
+            exif_time = exif_data["datetime"]
+            self.time = (
+                timezone.make_aware(exif_time)
+                if timezone.is_naive(exif_time)
+                else exif_time
+            )
+            update_fields.append("time")
+
+        # Set model if not already set
+        if not self.model and exif_data.get("model"):
+            self.model = exif_data["model"]
+            update_fields.append("model")
+
+        if update_fields:
+            self.save(update_fields=update_fields)
+
+    def get_image_from_file(self, file_path, resolution=None, context=None):
         """Load an image from an external file path into the thumbnail field.
 
         Opens the file at the given path and saves it to the model's thumbnail field.
@@ -282,10 +396,14 @@ class Photograph(models.Model):
         If the file requires special processing (e.g., NEF files), it will be
         processed through the appropriate backend.
 
+        The file is read once: rendering and EXIF extraction share the same buffer.
+
         Args:
             file_path: Path to the image file to load
             resolution: Optional target resolution as (width, height) tuple or
                 resolution string (e.g., "1920x1080" or "low", "medium", "high")
+            context: Optional open photochart.context.IngestContext for the file.
+                If given, the file is not read again.
 
         Returns:
             True if the image was successfully loaded, False otherwise
@@ -293,7 +411,15 @@ class Photograph(models.Model):
         if not file_path or not os.path.exists(file_path):
             return False
 
+        own_context = context is None
         try:
+            from photochart.context import IngestContext
+            from photochart.pipeline import render_thumbnail
+
+            if own_context:
+                context = IngestContext(file_path)
+                context.open()
+
             # Parse resolution if it's a string
             resolution_tuple = None
             if resolution:
@@ -304,134 +430,387 @@ class Photograph(models.Model):
                 elif isinstance(resolution, tuple) and len(resolution) == 2:
                     resolution_tuple = resolution
 
-            # Try to process through backend first (for special formats like NEF)
-            from photochart.backends import process_image_file
+            # Backends handle special formats (like NEF); standard formats are
+            # resized if a resolution is given, or copied as they are otherwise.
+            # The image is encoded straight into a temporary file, which
+            # FileSystemStorage moves into place instead of copying it.
+            with TemporaryUploadedFile(
+                os.path.basename(file_path), "application/octet-stream", 0, None
+            ) as sink:
+                _, extension = render_thumbnail(
+                    file_path, context, resolution=resolution_tuple, sink=sink
+                )
+                sink.flush()
+                sink.size = sink.tell()
+                sink.seek(0)
+                filename = self._generate_timestamp_filename(
+                    file_path, extension=extension
+                )
+                self.thumbnail.save(filename, sink)
+
+            # Extract and set EXIF data (datetime and model) if not already set
+            self._apply_exif_data(self._extract_exif_data(context.stream()))
+
+            return True
+        except Exception as e:
+            # Mark as error and return False
+            self.has_errors = True
+            self.save(update_fields=["has_errors"])
+            # Log error if needed (you might want to add logging here)
+            return False
+        finally:
+            if own_context and context is not None:
+                context.close()
+
+    def set_renditions(self, renditions, replace=False):
+        """Store rendered renditions for this photograph.
+
+        Args:
+            renditions: Dictionary mapping each size to (encoded bytes, width,
+                height), as returned by photochart.convert.render_renditions
+            replace: Whether to replace renditions that already exist. If False,
+                only missing sizes are stored.
+
+        Returns:
+            List of the created Rendition instances
+        """
+        existing = {rendition.size: rendition for rendition in self.renditions.all()}
+        created = []
+        for size, (data, width, height) in sorted(renditions.items()):
+            if size in existing:
+                if not replace:
+                    continue
+                existing[size].image.delete(save=False)
+                existing[size].delete()
+            created.append(Rendition.from_bytes(self, size, data, width, height))
+        created = Rendition.objects.bulk_create(created)
+        # bulk_create does not send post_save
+        bump_catalog_generation()
+        return created
+
+    def generate_renditions(self, file_path=None, sizes=None, replace=False):
+        """Render and store the rendition ladder of this photograph.
+
+        All sizes are rendered from a single decode of the source file.
+
+        Args:
+            file_path: Path to the source image file. If None, the first path of
+                the photograph that can be found on disk is used.
+            sizes: Sizes (longest edge in pixels) to render. Defaults to the
+                PHOTOCHART_RENDITION_SIZES setting.
+            replace: Whether to replace renditions that already exist
 
-            processed_image = process_image_file(
-                file_path, output_format="JPEG", resolution=resolution_tuple
+        Returns:
+            List of the created Rendition instances, or None if no source file
+            could be rendered
+        """
+        if file_path is None:
+            for photo_path in self.paths.all():
+                full_path = photo_path.get_full_path()
+                if full_path and os.path.exists(full_path):
+                    file_path = full_path
+                    break
+        if not file_path or not os.path.exists(file_path):
+            return None
+
+        try:
+            from photochart.convert import render_renditions
+
+            renditions = render_renditions(file_path, sizes or get_rendition_sizes())
+        except Exception:
+            self.has_errors = True
+            self.save(update_fields=["has_errors"])
+            return None
+        return self.set_renditions(renditions, replace=replace)
+
+
+class Rendition(models.Model):
+    """Resized copy of a photograph at one size of the rendition ladder.
+
+    Each photograph can have one rendition per size (the longest edge in
+    pixels), so views can serve a file close to the size they display instead
+    of the full thumbnail. All renditions of a photograph are rendered from a
+    single decode of the source (see photochart.convert.render_renditions).
+    """
+
+    photograph = models.ForeignKey(
+        Photograph,
+        on_delete=models.CASCADE,
+        related_name="renditions",
+        help_text="The photograph this rendition belongs to",
+    )
+    size = models.PositiveIntegerField(
+        help_text="Requested size of the rendition (longest edge in pixels)"
+    )
+    image = models.ImageField(
+        upload_to=rendition_upload_path,
+        help_text="Rendition image file",
+    )
+    width = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Actual width of the rendition in pixels"
+    )
+    height = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Actual height of the rendition in pixels"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, help_text="Timestamp when the rendition was created"
+    )
+
+    class Meta:
+        verbose_name = "Rendition"
+        verbose_name_plural = "Renditions"
+        ordering = ["photograph", "size"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["photograph", "size"], name="unique_rendition_size"
             )
+        ]
 
-            if processed_image:
-                # Backend processed the image successfully
-                # Generate timestamp-based filename (processed images are always JPEG)
-                filename = self._generate_timestamp_filename(
-                    file_path, extension=".jpg"
-                )
+    def __str__(self):
+        return f"Rendition {self.size} of {self.photograph}"
 
-                self.thumbnail.save(filename, File(processed_image), save=True)
+    @classmethod
+    def from_bytes(cls, photograph, size, data, width=None, height=None):
+        """Build a rendition and write its file to storage, without saving the row.
 
-                # Extract and set EXIF data (datetime and model) if not already set
-                exif_data = self._extract_exif_data(file_path)
-                if exif_data:
-                    update_fields = []
+        The photograph should have a hash or a primary key, since the file path
+        is derived from them (see rendition_upload_path).
 
-                    # Set datetime if not already set
-                    if not self.time and exif_data.get("datetime"):
-                        exif_time = exif_data["datetime"]
-                        self.time = (
-                            timezone.make_aware(exif_time)
-                            if timezone.is_naive(exif_time)
-                            else exif_time
-                        )
-                        update_fields.append("time")
+        Args:
+            photograph: Photograph the rendition belongs to
+            size: Requested size of the rendition (longest edge in pixels)
+            data: Encoded JPEG bytes
+            width: Actual width of the rendition in pixels
+            height: Actual height of the rendition in pixels
 
-                    # Set model if not already set
-                    if not self.model and exif_data.get("model"):
-                        self.model = exif_data["model"]
-                        update_fields.append("model")
+        Returns:
+            Unsaved Rendition instance
+        """
+        rendition = cls(photograph=photograph, size=size, width=width, height=height)
+        rendition.image.save(f"{size}.jpg", ContentFile(data), save=False)
+        return rendition
 
-                    if update_fields:
-                        self.save(update_fields=update_fields)
 
-                return True
+# Timeline day (year, month, day) of the photographs without time
+UNKNOWN_DAY = (0, 0, 0)
 
-            # Fallback to direct file copy for standard formats
-            # If resolution is specified, we need to process even standard formats
-            if resolution_tuple:
-                from PIL import Image
 
-                # Open and resize the image
-                image = Image.open(file_path)
-                target_width, target_height = resolution_tuple
+def timeline_day(time: Optional[datetime]) -> Tuple[int, int, int]:
+    """Get the timeline day (year, month, day) of a photograph time.
 
-                # Maintain aspect ratio
-                original_width, original_height = image.size
-                aspect_ratio = original_width / original_height
-                target_aspect = target_width / target_height
+    Days are in the current time zone, like the year/month/day filters of the
+    API. Photographs without time belong to UNKNOWN_DAY.
+    """
+    if time is None:
+        return UNKNOWN_DAY
+    if timezone.is_aware(time):
+        time = timezone.localtime(time)
+    return time.year, time.month, time.day
 
-                if aspect_ratio > target_aspect:
-                    # Image is wider - fit to width
-                    new_width = target_width
-                    new_height = int(target_width / aspect_ratio)
-                else:
-                    # Image is taller - fit to height
-                    new_height = target_height
-                    new_width = int(target_height * aspect_ratio)
-
-                image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-                # Save to BytesIO
-                import io
-
-                output_buffer = io.BytesIO()
-                if image.mode in ("RGBA", "LA", "P"):
-                    # Convert to RGB for JPEG
-                    rgb_image = Image.new("RGB", image.size, (255, 255, 255))
-                    if image.mode == "P":
-                        image = image.convert("RGBA")
-                    rgb_image.paste(
-                        image, mask=image.split()[-1] if image.mode == "RGBA" else None
-                    )
-                    image = rgb_image
-                elif image.mode not in ("RGB", "L"):
-                    image = image.convert("RGB")
 
-                image.save(output_buffer, format="JPEG", quality=95)
-                output_buffer.seek(0)
+class TimelineBucket(models.Model):
+    """Number of photographs taken on each day (materialized timeline).
 
-                # Use timestamp-based filename with .jpg extension for resized images
-                filename = self._generate_timestamp_filename(
-                    file_path, extension=".jpg"
-                )
+    The years, months and days endpoints read these rows instead of grouping
+    the whole photograph table by date functions on every request. Buckets are
+    recounted by refresh_timeline() for the days touched by ingest, saves and
+    deletes. Photographs without time are counted in the bucket of
+    UNKNOWN_DAY (year, month and day 0).
+    """
 
-                self.thumbnail.save(filename, File(output_buffer), save=True)
-            else:
-                # No resolution specified, just copy the file directly
-                # Generate timestamp-based filename preserving original extension
-                filename = self._generate_timestamp_filename(file_path, extension=None)
-                with open(file_path, "rb") as f:
-                    self.thumbnail.save(filename, File(f), save=True)
+    year = models.PositiveSmallIntegerField(help_text="Year (0 for unknown time)")
+    month = models.PositiveSmallIntegerField(help_text="Month (0 for unknown time)")
+    day = models.PositiveSmallIntegerField(help_text="Day (0 for unknown time)")
+    count = models.PositiveIntegerField(
+        default=0, help_text="Number of photographs taken on this day"
+    )
 
-            # Extract and set EXIF data (datetime and model) if not already set
-            exif_data = self._extract_exif_data(file_path)
-            if exif_data:
-                update_fields = []
-
-                # Set datetime if not already set
-                if not self.time and exif_data.get("datetime"):
-                    exif_time = exif_data["datetime"]
-                    self.time = (
-                        timezone.make_aware(exif_time)
-                        if timezone.is_naive(exif_time)
-                        else exif_time
+    class Meta:
+        verbose_name = "Timeline Bucket"
+        verbose_name_plural = "Timeline Buckets"
+        ordering = ["year", "month", "day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["year", "month", "day"], name="unique_timeline_day"
+            )
+        ]
+
+    def __str__(self):
+        if (self.year, self.month, self.day) == UNKNOWN_DAY:
+            return f"Unknown: {self.count}"
+        return f"{self.year:04d}-{self.month:02d}-{self.day:02d}: {self.count}"
+
+
+def refresh_timeline(days: Iterable[Tuple[int, int, int]]) -> None:
+    """Recount the timeline buckets of some days.
+
+    Each day is counted with a range query on the indexed time column, so
+    refreshing is cheap and idempotent (it cannot drift like +1/-1 updates).
+
+    Args:
+        days: Timeline days (see timeline_day) whose photographs changed
+    """
+    with transaction.atomic():
+        for year, month, day in sorted(set(days)):
+            if (year, month, day) == UNKNOWN_DAY:
+                photographs = Photograph.objects.filter(time__isnull=True)
+            else:
+                start = timezone.make_aware(datetime(year, month, day))
+                end = timezone.make_aware(
+                    datetime.combine(
+                        date(year, month, day) + timedelta(days=1), datetime.min.time()
                     )
-                    update_fields.append("time")
+                )
+                photographs = Photograph.objects.filter(time__gte=start, time__lt=end)
+            count = photographs.count()
+            if count:
+                TimelineBucket.objects.update_or_create(
+                    year=year, month=month, day=day, defaults={"count": count}
+                )
+            else:
+                TimelineBucket.objects.filter(year=year, month=month, day=day).delete()
 
-                # Set model if not already set
-                if not self.model and exif_data.get("model"):
-                    self.model = exif_data["model"]
-                    update_fields.append("model")
 
-                if update_fields:
-                    self.save(update_fields=update_fields)
+def rebuild_timeline() -> int:
+    """Rebuild all timeline buckets from the photograph table.
 
-            return True
-        except Exception as e:
-            # Mark as error and return False
-            self.has_errors = True
-            self.save(update_fields=["has_errors"])
-            # Log error if needed (you might want to add logging here)
-            return False
+    Only needed if photographs were changed without going through the model
+    or the ingest writers (e.g., with QuerySet.update()).
+
+    Returns:
+        Number of buckets
+    """
+    from django.db.models import Count
+    from django.db.models.functions import TruncDate
+
+    days = (
+        Photograph.objects.annotate(date=TruncDate("time"))
+        .values("date")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    buckets = [
+        TimelineBucket(
+            year=item["date"].year if item["date"] else 0,
+            month=item["date"].month if item["date"] else 0,
+            day=item["date"].day if item["date"] else 0,
+            count=item["count"],
+        )
+        for item in days
+    ]
+    with transaction.atomic():
+        TimelineBucket.objects.all().delete()
+        TimelineBucket.objects.bulk_create(buckets)
+    bump_catalog_generation()
+    return len(buckets)
+
+
+@receiver(post_save, sender=Photograph)
+def _update_timeline_on_save(sender, instance, created, raw, update_fields, **kwargs):
+    """Refresh the timeline buckets of a saved photograph if its day changed."""
+    if raw or "time" in instance.get_deferred_fields():
+        return
+    if not created and update_fields is not None and "time" not in update_fields:
+        return
+    old_day = getattr(instance, "_timeline_day", None)
+    new_day = timeline_day(instance.time)
+    if created or old_day != new_day:
+        refresh_timeline([day for day in (old_day, new_day) if day is not None])
+    instance._timeline_day = new_day
+
+
+@receiver(post_delete, sender=Photograph)
+def _update_timeline_on_delete(sender, instance, **kwargs):
+    """Refresh the timeline bucket of a deleted photograph."""
+    if "time" not in instance.get_deferred_fields():
+        refresh_timeline([timeline_day(instance.time)])
+
+
+def split_path(path: str) -> Tuple[str, str]:
+    """Split a stored path into its directory and file name, as browsed in the UI.
+
+    Separators are normalized to "/" and empty segments dropped, so
+    "/home/me/a.jpg", "home/me/a.jpg" and "home\\me\\a.jpg" all split into
+    ("home/me", "a.jpg"). Files at the top level have directory "".
+
+    Args:
+        path: Stored path of a PhotoPath
+
+    Returns:
+        Tuple of (directory, file name)
+    """
+    parts = [part for part in path.replace("\\", "/").split("/") if part]
+    if not parts:
+        return "", ""
+    return "/".join(parts[:-1]), parts[-1]
+
+
+def normalize_directory(path: str) -> str:
+    """Normalize a directory path like split_path does (e.g., "/home/me/" -> "home/me")."""
+    return "/".join(part for part in path.replace("\\", "/").split("/") if part)
+
+
+def directory_ancestors(directory: str) -> List[str]:
+    """Get a directory and its ancestors, top-level first (e.g., ["home", "home/me"])."""
+    parts = directory.split("/") if directory else []
+    return ["/".join(parts[: index + 1]) for index in range(len(parts))]
+
+
+class HashPolicy(str, Enum):
+    """When a PhotoPath computes the hash that links it to a Photograph.
+
+    - NOW: read the file and hash it during save (default)
+    - PRECOMPUTED: use a hash the caller already computed, without reading the file
+    - DEFERRED: only index the path; it is queued and linked later
+      (see PhotoPathManager.pending_hash)
+    """
+
+    NOW = "now"
+    PRECOMPUTED = "precomputed"
+    DEFERRED = "deferred"
+
+
+class PhotoPathManager(models.Manager):
+    """Manager for PhotoPath exposing the hashing policy and the deferred-hash queue."""
+
+    def create(self, hash_policy=HashPolicy.NOW, hash_value=None, **kwargs):
+        """Create a PhotoPath, choosing when its file is hashed.
+
+        Args:
+            hash_policy: HashPolicy controlling when the file is hashed
+            hash_value: Precomputed hash of the file. Implies HashPolicy.PRECOMPUTED.
+            **kwargs: Field values, plus the extra keyword arguments accepted by
+                PhotoPath.save (store_image, resolution, full_path, extract_exif,
+                hash_algorithm)
+
+        Returns:
+            The created PhotoPath instance
+        """
+        save_kwargs = {
+            key: kwargs.pop(key)
+            for key in (
+                "store_image",
+                "resolution",
+                "full_path",
+                "extract_exif",
+                "hash_algorithm",
+            )
+            if key in kwargs
+        }
+        obj = self.model(**kwargs)
+        self._for_write = True
+        obj.save(
+            force_insert=True,
+            using=self.db,
+            hash_policy=hash_policy,
+            hash_value=hash_value,
+            **save_kwargs,
+        )
+        return obj
+
+    def pending_hash(self):
+        """Get the deferred-hash queue: paths indexed without hashing their file."""
+        return self.filter(hash_pending=True)
 
 
 class PhotoPath(models.Model):
@@ -445,6 +824,12 @@ class PhotoPath(models.Model):
         max_length=2048,
         help_text="Path to the photo file. For mounted devices, this is relative to the mount point. For root filesystem, this is an absolute path.",
     )
+    directory = models.CharField(
+        max_length=2048,
+        blank=True,
+        default="",
+        help_text="Normalized directory of the path (see split_path), set on save",
+    )
     device = models.CharField(
         max_length=255, help_text="Device identifier where the photo is located"
     )
@@ -477,6 +862,16 @@ class PhotoPath(models.Model):
         blank=True,
         help_text="File size in bytes",
     )
+    hash_pending = models.BooleanField(
+        default=False,
+        help_text="True if the path was indexed with a deferred hash and is not linked to a photograph yet",
+    )
+    missing = models.BooleanField(
+        default=False,
+        help_text="True if the file was not found at this path during the last incremental ingest",
+    )
+
+    objects = PhotoPathManager()
 
     class Meta:
         verbose_name = "Photo Path"
@@ -484,11 +879,25 @@ class PhotoPath(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["path"]),
+            # Files of a directory in the directory browser
+            models.Index(fields=["directory"]),
             models.Index(fields=["device"]),
             models.Index(fields=["photograph"]),
+            models.Index(fields=["hash_pending"]),
+            models.Index(fields=["missing"]),
+            # Keyset pagination on (created_at, id)
+            models.Index(fields=["created_at", "id"]),
         ]
         unique_together = [["path", "device"]]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Load an instance, remembering its directory (see PathNode)."""
+        instance = super().from_db(db, field_names, values)
+        if "directory" in field_names:
+            instance._tree_directory = instance.directory
+        return instance
+
     def __str__(self):
         return f"{self.path} on {self.device}"
 
@@ -520,39 +929,142 @@ class PhotoPath(models.Model):
             except (IndexError, ValueError):
                 pass
 
-        # Try to find mount point by reading /proc/mounts
+        # Try to find mount point in the mount table
         # Look for mount points that match device patterns
         try:
-            with open("/proc/mounts", "r") as f:
-                mounts = []
-                for line in f:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        device = parts[0]
-                        mount = parts[1]
-                        mounts.append((device, mount))
-
-                # Sort by mount path length (longest first)
-                mounts.sort(key=lambda x: len(x[1]), reverse=True)
-
-                # Try to match device identifier with mount point
-                # Check if any mount point name matches device
-                for device, mount in mounts:
-                    if mount == "/":
-                        continue
-                    mount_name = Path(mount).name
-                    # Check if device string contains mount name or mount path
-                    if mount_name in self.device or mount in self.device:
-                        if os.path.exists(mount):
-                            full_path = str(Path(mount) / self.path)
-                            if os.path.exists(full_path):
-                                return full_path
-        except (OSError, IOError):
-            pass
+            from photochart.device import get_mount_table
+
+            mounts = get_mount_table().mounts
+        except Exception:
+            mounts = []
+
+        # Try to match device identifier with mount point
+        # Check if any mount point name matches device
+        for mount in mounts:
+            if mount.mount_point == "/":
+                continue
+            mount_name = Path(mount.mount_point).name
+            # Check if device string contains mount name or mount path
+            if mount_name in self.device or mount.mount_point in self.device:
+                full_path = str(Path(mount.mount_point) / self.path)
+                if os.path.exists(full_path):
+                    return full_path
 
         # If we can't reconstruct, return None
         return None
 
+    @staticmethod
+    def _stat_datetime(timestamp):
+        """Convert a stat timestamp to a timezone-aware datetime."""
+        # fromtimestamp returns naive datetime in local timezone
+        dt = datetime.fromtimestamp(timestamp)
+        # Make timezone-aware using Django's default timezone
+        if timezone.is_naive(dt):
+            dt = timezone.make_aware(dt)
+        return dt
+
+    @classmethod
+    def stat_fingerprint(cls, stat_result):
+        """Get the fingerprint used to detect changed files from an os.stat_result.
+
+        The fingerprint is the (size, file_updated_at) pair, as stored by
+        set_file_stat(), so it can be compared with the stored fields.
+
+        Args:
+            stat_result: os.stat_result of the file
+
+        Returns:
+            Tuple of (size, modification datetime)
+        """
+        return stat_result.st_size, cls._stat_datetime(stat_result.st_mtime)
+
+    def set_file_stat(self, stat_result):
+        """Set file size and timestamps from an os.stat_result.
+
+        Lets callers that already have the stat of the file (e.g., from the
+        ingestion workers) fill in these fields without touching the file again.
+
+        Args:
+            stat_result: os.stat_result of the file
+        """
+        self.file_created_at = self._stat_datetime(stat_result.st_ctime)
+        self.size, self.file_updated_at = self.stat_fingerprint(stat_result)
+
+    def _process_file(
+        self,
+        file_access_path,
+        context,
+        extract_exif,
+        store_image,
+        resolution,
+        hash_algorithm,
+    ):
+        """Create or link the Photograph and fill it in from the file.
+
+        Args:
+            file_access_path: Path used to access the file
+            context: Open IngestContext for the file, or None if it could not be read
+            extract_exif: Whether to extract EXIF data into the Photograph
+            store_image: Whether to store the image in the Photograph's thumbnail field
+            resolution: Optional resolution for image storage
+            hash_algorithm: Hash algorithm to use
+        """
+        # Process photograph creation/linking if not already set
+        if not self.photograph:
+            try:
+                # Compute hash from the file
+                hash_value = (
+                    context.hexdigest(hash_algorithm) if context is not None else None
+                )
+
+                if hash_value:
+                    # Find or create a Photograph with this hash
+                    photograph, created = Photograph.objects.get_or_create(
+                        hash=hash_value, hash_algorithm=hash_algorithm, defaults={}
+                    )
+
+                    # Link this PhotoPath to the Photograph
+                    self.photograph = photograph
+                else:
+                    # Hash computation failed - create photograph without hash and mark error
+                    photograph = Photograph.objects.create()
+                    photograph.has_errors = True
+                    photograph.save(update_fields=["has_errors"])
+                    self.photograph = photograph
+            except Exception:
+                # Any error during hash computation or photograph creation
+                photograph = Photograph.objects.create()
+                photograph.has_errors = True
+                photograph.save(update_fields=["has_errors"])
+                self.photograph = photograph
+
+        # Extract and set EXIF data (datetime and model) if not already set
+        # This should happen regardless of whether we're storing the image
+        if extract_exif and context is not None:
+            try:
+                self.photograph._apply_exif_data(
+                    self.photograph._extract_exif_data(context.stream())
+                )
+            except Exception:
+                # Any error during EXIF extraction
+                self.photograph.has_errors = True
+                self.photograph.save(update_fields=["has_errors"])
+
+        # Store image if requested (regardless of whether photograph was just created or already existed)
+        if store_image:
+            try:
+                if not self.photograph.thumbnail:
+                    success = self.photograph.get_image_from_file(
+                        file_access_path, resolution=resolution, context=context
+                    )
+                    if not success:
+                        # Image loading failed - error already set in get_image_from_file
+                        pass
+            except Exception:
+                # Any error during image storage
+                self.photograph.has_errors = True
+                self.photograph.save(update_fields=["has_errors"])
+
     def save(self, *args, **kwargs):
         """Override save to automatically create or link Photograph.
 
@@ -566,15 +1078,46 @@ class PhotoPath(models.Model):
         If a Photograph with the same hash already exists, it will be linked.
         Otherwise, a new Photograph will be created with the computed hash.
 
+        The file is read only once: hashing, EXIF extraction and image storage
+        all work from the same IngestContext.
+
+        The hash_policy keyword controls when the hash is computed. With a
+        precomputed hash the file is not read for hashing; with a deferred hash
+        the path is only indexed (no photograph is linked, nothing is read) and
+        it is added to the queue returned by PhotoPath.objects.pending_hash().
+
         Keyword Args:
             store_image: If True, store the image file in the Photograph's thumbnail field
             resolution: Optional resolution for image storage (only used if store_image=True)
             full_path: Optional full path to use for file access (if path is relative to mount point)
+            extract_exif: If False, skip reading EXIF data from the file (e.g., when the
+                caller already applied it to the Photograph). Defaults to True.
+            hash_policy: HashPolicy value (default: HashPolicy.NOW)
+            hash_value: Precomputed hash of the file. Implies HashPolicy.PRECOMPUTED.
+            hash_algorithm: Algorithm of the (pre)computed hash. Defaults to the
+                PHOTOCHART_HASH_ALGORITHM setting.
+
+        Raises:
+            ValueError: If HashPolicy.PRECOMPUTED is requested without a hash_value
         """
         # Extract custom kwargs
         store_image = kwargs.pop("store_image", False)
         resolution = kwargs.pop("resolution", None)
         full_path = kwargs.pop("full_path", None)
+        extract_exif = kwargs.pop("extract_exif", True)
+        hash_policy = HashPolicy(kwargs.pop("hash_policy", HashPolicy.NOW))
+        hash_value = kwargs.pop("hash_value", None)
+        hash_algorithm = kwargs.pop("hash_algorithm", None) or get_hash_algorithm()
+
+        self.directory = split_path(self.path or "")[0]
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "path" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "directory"}
+
+        if hash_value is not None:
+            hash_policy = HashPolicy.PRECOMPUTED
+        elif hash_policy == HashPolicy.PRECOMPUTED:
+            raise ValueError("hash_value is required with HashPolicy.PRECOMPUTED")
 
         # Use full_path for file access if provided, otherwise try to get full path
         # This allows storing relative paths while still accessing files
@@ -615,117 +1158,291 @@ class PhotoPath(models.Model):
         # Update file timestamps if path exists
         if file_access_path and os.path.exists(file_access_path):
             try:
-                # Get file creation and modification times
-                file_created = os.path.getctime(file_access_path)
-                file_updated = os.path.getmtime(file_access_path)
-
-                # Convert to datetime objects (fromtimestamp returns naive datetime in local timezone)
-                file_created_dt = datetime.fromtimestamp(file_created)
-                file_updated_dt = datetime.fromtimestamp(file_updated)
-
-                # Make timezone-aware using Django's default timezone
-                if timezone.is_naive(file_created_dt):
-                    file_created_dt = timezone.make_aware(file_created_dt)
-                if timezone.is_naive(file_updated_dt):
-                    file_updated_dt = timezone.make_aware(file_updated_dt)
-
                 # Always update file timestamps to reflect current file state
-                self.file_created_at = file_created_dt
-                self.file_updated_at = file_updated_dt
-
-                # Get file size
-                try:
-                    file_size = os.path.getsize(file_access_path)
-                    self.size = file_size
-                except (OSError, ValueError):
-                    # If we can't get file size, leave field as None
-                    pass
+                self.set_file_stat(os.stat(file_access_path))
             except (OSError, ValueError):
                 # If we can't get file timestamps, leave fields as None
                 pass
 
-        # Process photograph creation/linking if not already set and file exists
-        if (
-            not self.photograph
+        # Link a precomputed hash without reading the file
+        if not self.photograph and hash_policy == HashPolicy.PRECOMPUTED:
+            self.photograph, created = Photograph.objects.get_or_create(
+                hash=hash_value, hash_algorithm=hash_algorithm, defaults={}
+            )
+
+        if not self.photograph and hash_policy == HashPolicy.DEFERRED:
+            # Only index the path; the deferred-hash queue links it later
+            self.hash_pending = True
+        # Hashing, EXIF extraction and image storage share a single read of the file
+        elif (
+            (not self.photograph or extract_exif or store_image)
             and file_access_path
             and os.path.exists(file_access_path)
         ):
             try:
-                from photochart.protocols import calculate_hash
+                from photochart.context import IngestContext
 
-                # Compute hash from the file
-                hash_value = calculate_hash(file_access_path)
+                context = IngestContext(file_access_path)
+                context.open()
+            except Exception:
+                # Steps below record the failure on the Photograph
+                context = None
+            try:
+                self._process_file(
+                    file_access_path,
+                    context,
+                    extract_exif=extract_exif,
+                    store_image=store_image,
+                    resolution=resolution,
+                    hash_algorithm=hash_algorithm,
+                )
+            finally:
+                if context is not None:
+                    context.close()
 
-                if hash_value:
-                    # Find or create a Photograph with this hash
-                    photograph, created = Photograph.objects.get_or_create(
-                        hash=hash_value, defaults={}
-                    )
+        if self.photograph:
+            self.hash_pending = False
 
-                    # Link this PhotoPath to the Photograph
-                    self.photograph = photograph
-                else:
-                    # Hash computation failed - create photograph without hash and mark error
-                    photograph = Photograph.objects.create()
-                    photograph.has_errors = True
-                    photograph.save(update_fields=["has_errors"])
-                    self.photograph = photograph
-            except Exception:
-                # Any error during hash computation or photograph creation
-                photograph = Photograph.objects.create()
-                photograph.has_errors = True
-                photograph.save(update_fields=["has_errors"])
-                self.photograph = photograph
+        # Call the parent save method
+        super().save(*args, **kwargs)
 
-        # Extract and set EXIF data (datetime and model) if not already set
-        # This should happen regardless of whether we're storing the image
-        if self.photograph and file_access_path and os.path.exists(file_access_path):
-            try:
-                exif_data = self.photograph._extract_exif_data(file_access_path)
-                if exif_data:
-                    update_fields = []
-
-                    # Set datetime if not already set
-                    if not self.photograph.time and exif_data.get("datetime"):
-                        exif_time = exif_data["datetime"]
-                        self.photograph.time = (
-                            timezone.make_aware(exif_time)
-                            if timezone.is_naive(exif_time)
-                            else exif_time
-                        )
-                        update_fields.append("time")
 
-                    # Set model if not already set
-                    if not self.photograph.model and exif_data.get("model"):
-                        self.photograph.model = exif_data["model"]
-                        update_fields.append("model")
+# Number of directories per query when updating the directory tree
+PATH_TREE_CHUNK_SIZE = 500
 
-                    if update_fields:
-                        self.photograph.save(update_fields=update_fields)
-            except Exception:
-                # Any error during EXIF extraction
-                self.photograph.has_errors = True
-                self.photograph.save(update_fields=["has_errors"])
 
-        # Store image if requested (regardless of whether photograph was just created or already existed)
-        if (
-            store_image
-            and self.photograph
-            and file_access_path
-            and os.path.exists(file_access_path)
-        ):
-            try:
-                if not self.photograph.thumbnail:
-                    success = self.photograph.get_image_from_file(
-                        file_access_path, resolution=resolution
-                    )
-                    if not success:
-                        # Image loading failed - error already set in get_image_from_file
-                        pass
-            except Exception:
-                # Any error during image storage
-                self.photograph.has_errors = True
-                self.photograph.save(update_fields=["has_errors"])
+class PathNode(models.Model):
+    """A directory of the photo paths, with the number of paths below it.
 
-        # Call the parent save method
-        super().save(*args, **kwargs)
+    The directory browser lists the children of a directory from these rows
+    (one indexed query on parent) and its files from PhotoPath.directory,
+    instead of loading and splitting every path string below it. Directories
+    are normalized like split_path, so paths of all devices share one tree.
+    The top level ("") has no node.
+    """
+
+    path = models.CharField(
+        max_length=2048, unique=True, help_text="Normalized directory path"
+    )
+    parent = models.CharField(
+        max_length=2048,
+        blank=True,
+        help_text='Path of the parent directory ("" for top-level directories)',
+    )
+    name = models.CharField(max_length=255, help_text="Last segment of the path")
+    count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of photo paths in this directory and its subdirectories",
+    )
+
+    class Meta:
+        verbose_name = "Path Node"
+        verbose_name_plural = "Path Nodes"
+        ordering = ["path"]
+        indexes = [
+            # Children of a directory, sorted by name
+            models.Index(fields=["parent", "name"]),
+        ]
+
+    def __str__(self):
+        return f"{self.path}: {self.count}"
+
+
+def update_path_tree(changes: Mapping[str, int]) -> None:
+    """Apply changes in the number of photo paths per directory to the tree.
+
+    Each change is added to the directory and all its ancestors. Unlike
+    timeline buckets, nodes are not recounted: recounting a top-level
+    directory would scan every path below it on each ingest batch. Nodes
+    whose count drops to 0 are removed. rebuild_path_tree() repairs counts
+    changed outside the model and the ingest writers.
+
+    Args:
+        changes: Mapping of directory (see split_path) to the number of photo
+            paths added to it (negative if removed)
+    """
+    from django.db.models.functions import Greatest
+
+    deltas: Counter = Counter()
+    for directory, change in changes.items():
+        for ancestor in directory_ancestors(directory):
+            deltas[ancestor] += change
+    paths = sorted(path for path, delta in deltas.items() if delta)
+    if not paths:
+        return
+
+    with transaction.atomic():
+        existing = set()
+        for start in range(0, len(paths), PATH_TREE_CHUNK_SIZE):
+            existing.update(
+                PathNode.objects.filter(
+                    path__in=paths[start : start + PATH_TREE_CHUNK_SIZE]
+                ).values_list("path", flat=True)
+            )
+
+        # One UPDATE per distinct change (e.g., +1 for all ancestors of a file)
+        by_delta: Dict[int, List[str]] = {}
+        for path in paths:
+            if path in existing:
+                by_delta.setdefault(deltas[path], []).append(path)
+        for delta, delta_paths in by_delta.items():
+            for start in range(0, len(delta_paths), PATH_TREE_CHUNK_SIZE):
+                PathNode.objects.filter(
+                    path__in=delta_paths[start : start + PATH_TREE_CHUNK_SIZE]
+                ).update(count=Greatest(models.F("count") + delta, 0))
+
+        PathNode.objects.bulk_create(
+            [
+                PathNode(
+                    path=path,
+                    parent=path.rpartition("/")[0],
+                    name=path.rpartition("/")[2],
+                    count=deltas[path],
+                )
+                for path in paths
+                if path not in existing and deltas[path] > 0
+            ],
+            batch_size=PATH_TREE_CHUNK_SIZE,
+        )
+
+        removed = [path for path in paths if deltas[path] < 0]
+        for start in range(0, len(removed), PATH_TREE_CHUNK_SIZE):
+            PathNode.objects.filter(
+                path__in=removed[start : start + PATH_TREE_CHUNK_SIZE], count=0
+            ).delete()
+
+
+def rebuild_path_tree() -> int:
+    """Rebuild the directory tree from the photo path table.
+
+    Only needed if photo paths were changed without going through the model
+    or the ingest writers (e.g., with QuerySet.update() or raw SQL).
+
+    Returns:
+        Number of directories
+    """
+    from django.db.models import Count
+
+    counts: Counter = Counter()
+    directories = (
+        PhotoPath.objects.values("directory").annotate(count=Count("id")).order_by()
+    )
+    for item in directories.iterator():
+        for ancestor in directory_ancestors(item["directory"]):
+            counts[ancestor] += item["count"]
+    with transaction.atomic():
+        PathNode.objects.all().delete()
+        PathNode.objects.bulk_create(
+            (
+                PathNode(
+                    path=path,
+                    parent=path.rpartition("/")[0],
+                    name=path.rpartition("/")[2],
+                    count=count,
+                )
+                for path, count in counts.items()
+            ),
+            batch_size=PATH_TREE_CHUNK_SIZE,
+        )
+    bump_catalog_generation()
+    return len(counts)
+
+
+@receiver(post_save, sender=PhotoPath)
+def _update_path_tree_on_save(sender, instance, created, raw, **kwargs):
+    """Count a saved photo path in the directory tree if its directory changed."""
+    if raw or "directory" in instance.get_deferred_fields():
+        return
+    old_directory = getattr(instance, "_tree_directory", None)
+    if created:
+        update_path_tree({instance.directory: 1})
+    elif old_directory is not None and old_directory != instance.directory:
+        update_path_tree({old_directory: -1, instance.directory: 1})
+    instance._tree_directory = instance.directory
+
+
+@receiver(post_delete, sender=PhotoPath)
+def _update_path_tree_on_delete(sender, instance, **kwargs):
+    """Remove a deleted photo path from the directory tree."""
+    if "directory" not in instance.get_deferred_fields():
+        update_path_tree({instance.directory: -1})
+
+
+# Primary key of the single CatalogGeneration row
+CATALOG_GENERATION_ID = 1
+
+
+class CatalogGeneration(models.Model):
+    """Counter of changes to the catalog (a single row).
+
+    Cached API responses and their ETag headers are tied to the current
+    generation (see photograph.cache), so bumping it invalidates them all at
+    once. It is kept in the database rather than in the cache, so the server
+    also sees changes made by other processes, such as the ingest CLI.
+    """
+
+    generation = models.PositiveBigIntegerField(
+        default=0, help_text="Number of times the catalog changed"
+    )
+    updated_at = models.DateTimeField(
+        default=timezone.now, help_text="Timestamp of the last change"
+    )
+
+    class Meta:
+        verbose_name = "Catalog Generation"
+        verbose_name_plural = "Catalog Generations"
+
+    def __str__(self):
+        return f"Generation {self.generation}"
+
+
+def get_catalog_generation() -> int:
+    """Get the current catalog generation (0 if the catalog never changed)."""
+    generation = (
+        CatalogGeneration.objects.filter(pk=CATALOG_GENERATION_ID)
+        .values_list("generation", flat=True)
+        .first()
+    )
+    return generation or 0
+
+
+def bump_catalog_generation() -> None:
+    """Record a change to the catalog, invalidating cached API responses.
+
+    Called on saves and deletes of photographs, paths, renditions, albums and
+    planned actions, and by the ingest writers after bulk writes (which send
+    no signals). Inside an atomic block the bump is deferred until the
+    transaction commits, and happens at most once per transaction.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        _increment_catalog_generation()
+        return
+    # Django replaces the list of on-commit hooks on commit and on (savepoint)
+    # rollback, so it identifies the transaction the bump was scheduled in
+    if getattr(connection, "_catalog_generation_hooks", None) is (
+        connection.run_on_commit
+    ):
+        return
+    connection._catalog_generation_hooks = connection.run_on_commit
+    transaction.on_commit(_increment_catalog_generation)
+
+
+def _increment_catalog_generation() -> None:
+    """Increment the catalog generation, creating its row if needed."""
+    updated = CatalogGeneration.objects.filter(pk=CATALOG_GENERATION_ID).update(
+        generation=models.F("generation") + 1, updated_at=timezone.now()
+    )
+    if not updated:
+        CatalogGeneration.objects.get_or_create(
+            pk=CATALOG_GENERATION_ID, defaults={"generation": 1}
+        )
+
+
+@receiver([post_save, post_delete], sender=Photograph)
+@receiver([post_save, post_delete], sender=PhotoPath)
+@receiver([post_save, post_delete], sender=Rendition)
+def _bump_catalog_generation(sender, raw=False, **kwargs):
+    """Bump the catalog generation when a photograph, path or rendition changes."""
+    if not raw:
+        bump_catalog_generation()
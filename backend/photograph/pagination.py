@@ -0,0 +1,202 @@
+"""Keyset (cursor) pagination for the photograph app.
+
+Page number pagination turns deep pages into ``OFFSET n`` scans and runs a
+``COUNT(*)`` on every request. Keyset pagination instead remembers the
+position of the last row of a page, ``(value, id)`` of the ordering field, and
+fetches the next page with ``WHERE (field, id) > (value, id)``, which a
+composite index on ``(field, id)`` answers in constant time at any depth.
+"""
+
+import base64
+import binascii
+import json
+
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination on ``(field, id)``, with an optional count.
+
+    Responses keep the shape of page number pagination (count, next,
+    previous and results), so clients that follow ``next`` work unchanged.
+
+    Query parameters:
+        - cursor: Opaque position from a next or previous link
+        - ordering: One of the view's ``keyset_orderings`` (e.g., "-created_at",
+          "time"). Defaults to the first one.
+        - page_size: Number of results per page (up to max_page_size)
+        - count: "false" skips the ``COUNT(*)``; count is then null. Next and
+          previous links carry count=false, so walking all pages counts once.
+
+    NULL values of a nullable ordering field sort after all other values in
+    ascending order (and first in descending order), as in PostgreSQL.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    count_query_param = "count"
+    default_orderings = ("-created_at", "created_at")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Get the page of results after the cursor position."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, view)
+        self.field = self.ordering.lstrip("-")
+        self.nullable = queryset.model._meta.get_field(self.field).null
+        position, reverse = self.decode_cursor(request, queryset.model)
+
+        self.count = queryset.count() if self.include_count(request) else None
+
+        # Walking backwards (previous link) reverses the ordering
+        descending = self.ordering.startswith("-") != reverse
+        queryset = queryset.order_by(*self.get_order_by(descending))
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position, descending))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        """Wrap a page of serialized results with count and links."""
+        return Response(
+            {
+                "count": self.count,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        """Describe the paginated response for OpenAPI schemas."""
+        return {
+            "type": "object",
+            "required": ["count", "results"],
+            "properties": {
+                "count": {"type": "integer", "nullable": True, "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        """Get the page size, from the page_size query parameter if valid."""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, view):
+        """Get the requested ordering, or the view's default ordering."""
+        orderings = getattr(view, "keyset_orderings", self.default_orderings)
+        ordering = request.query_params.get(self.ordering_query_param)
+        return ordering if ordering in orderings else orderings[0]
+
+    def include_count(self, request):
+        """Check whether the total count was requested (it is by default)."""
+        value = request.query_params.get(self.count_query_param, "true")
+        return value.lower() not in ("false", "0", "no")
+
+    def get_order_by(self, descending):
+        """Get the order_by() expressions for the ordering field and id."""
+        if not self.nullable:
+            prefix = "-" if descending else ""
+            return [prefix + self.field, prefix + "id"]
+        if descending:
+            return [F(self.field).desc(nulls_first=True), "-id"]
+        return [F(self.field).asc(nulls_last=True), "id"]
+
+    def get_position_filter(self, position, descending):
+        """Get the filter selecting the rows after a position, in walk order."""
+        value, pk = position
+        lookup = "lt" if descending else "gt"
+        if value is None:
+            # Within the NULL values, only id orders the rows
+            after = Q(**{f"{self.field}__isnull": True, f"id__{lookup}": pk})
+            if descending:
+                after |= Q(**{f"{self.field}__isnull": False})
+            return after
+        # (field, id) > (value, pk), with the range on field spelled out so the
+        # (field, id) index is searched from the position instead of scanned
+        after = Q(**{f"{self.field}__{lookup}e": value}) & (
+            Q(**{f"{self.field}__{lookup}": value}) | Q(**{f"id__{lookup}": pk})
+        )
+        if self.nullable and not descending:
+            after |= Q(**{f"{self.field}__isnull": True})
+        return after
+
+    def decode_cursor(self, request, model):
+        """Decode the cursor query parameter.
+
+        Returns:
+            Tuple of (position, reverse), where position is a (value, id)
+            tuple, or None on the first page
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            value, pk = cursor["p"]
+            if value is not None:
+                value = model._meta.get_field(self.field).to_python(value)
+            position = (value, int(pk))
+            reverse = bool(cursor.get("r", False))
+        except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        return position, reverse
+
+    def encode_cursor(self, instance, reverse):
+        """Get a link to the page after (or before, if reverse) an instance."""
+        value = getattr(instance, self.field)
+        if hasattr(value, "isoformat"):
+            # Full precision: the position must match the row exactly
+            value = value.isoformat()
+        cursor = {"p": [value, instance.pk]}
+        if reverse:
+            cursor["r"] = True
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(cursor, separators=(",", ":")).encode("ascii")
+        ).decode("ascii")
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.cursor_query_param, encoded)
+        return replace_query_param(url, self.count_query_param, "false")
+
+    def get_next_link(self):
+        """Get the link to the next page, or None on the last page."""
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        """Get the link to the previous page, or None on the first page."""
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Past the end: start over from the first page
+            url = self.request.build_absolute_uri()
+            return remove_query_param(url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
@@ -1,7 +1,44 @@
 """Serializers for the photograph app."""
 
 from rest_framework import serializers
-from .models import Photograph, PhotoPath
+from .models import Photograph, PhotoPath, get_rendition_sizes
+
+
+def requested_fields(request):
+    """Get the field names of the ?fields= sparse fieldset, or None for all."""
+    if request is None:
+        return None
+    fields = request.query_params.get("fields")
+    if not fields:
+        return None
+    return {field.strip() for field in fields.split(",") if field.strip()}
+
+
+class CompactSerializerMixin:
+    """Shared behaviour of the flat list serializers (?view=compact).
+
+    - Fields not listed in the ?fields= query parameter are dropped, so their
+      values are never computed.
+    - Media URLs are made absolute with a single host lookup per response
+      instead of one build_absolute_uri() per row.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get("request"))
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+    def absolute_url(self, url):
+        """Make a media URL absolute using the request host."""
+        request = self.context.get("request")
+        if request is None or not url.startswith("/"):
+            return url
+        prefix = getattr(self, "_url_prefix", None)
+        if prefix is None:
+            prefix = self._url_prefix = request.build_absolute_uri("/")[:-1]
+        return prefix + url
 
 
 class PhotoPathSerializer(serializers.ModelSerializer):
@@ -22,6 +59,7 @@ class PhotoPathSerializer(serializers.ModelSerializer):
             "device",
             "photograph",
             "size",
+            "missing",
             "photograph_image_url",
             "photograph_paths_count",
             "photograph_has_errors",
@@ -121,6 +159,7 @@ class PhotographSerializer(serializers.ModelSerializer):
 
     paths = PhotoPathSerializer(many=True, read_only=True)
     image_url = serializers.SerializerMethodField()
+    renditions = serializers.SerializerMethodField()
     albums = serializers.SerializerMethodField()
 
     class Meta:
@@ -128,17 +167,20 @@ class PhotographSerializer(serializers.ModelSerializer):
         fields = [
             "id",
             "hash",
+            "hash_algorithm",
             "thumbnail",
             "image_url",
+            "renditions",
             "time",
             "model",
             "has_errors",
+            "missing",
             "paths",
             "albums",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        read_only_fields = ["id", "missing", "created_at", "updated_at"]
 
     def get_image_url(self, obj):
         """Get the URL for the image if it exists."""
@@ -149,6 +191,30 @@ class PhotographSerializer(serializers.ModelSerializer):
             return obj.thumbnail.url
         return None
 
+    def get_renditions(self, obj):
+        """Get the rendition URLs of the photograph, keyed by size."""
+        # Use prefetched renditions if available
+        if (
+            hasattr(obj, "_prefetched_objects_cache")
+            and "renditions" in obj._prefetched_objects_cache
+        ):
+            renditions = obj._prefetched_objects_cache["renditions"]
+        else:
+            renditions = obj.renditions.all()
+        request = self.context.get("request")
+        return {
+            str(rendition.size): {
+                "url": (
+                    request.build_absolute_uri(rendition.image.url)
+                    if request
+                    else rendition.image.url
+                ),
+                "width": rendition.width,
+                "height": rendition.height,
+            }
+            for rendition in renditions
+        }
+
     def get_albums(self, obj):
         """Get list of albums this photograph belongs to."""
         # Use prefetched albums if available
@@ -166,3 +232,101 @@ class PhotographSerializer(serializers.ModelSerializer):
             }
             for album in albums
         ]
+
+
+class PhotoPathCompactSerializer(CompactSerializerMixin, serializers.ModelSerializer):
+    """Flat serializer for photo path lists (?view=compact).
+
+    Expects the photograph to be selected with the path and the queryset to be
+    annotated with photograph_paths_count (see PhotoPathViewSet.get_queryset).
+    """
+
+    photograph_image_url = serializers.SerializerMethodField()
+    photograph_paths_count = serializers.IntegerField(read_only=True)
+    photograph_has_errors = serializers.BooleanField(
+        source="photograph.has_errors", read_only=True, default=None
+    )
+    photograph_model = serializers.CharField(
+        source="photograph.model", read_only=True, default=None
+    )
+
+    class Meta:
+        model = PhotoPath
+        fields = [
+            "id",
+            "path",
+            "device",
+            "photograph",
+            "size",
+            "missing",
+            "photograph_image_url",
+            "photograph_paths_count",
+            "photograph_has_errors",
+            "photograph_model",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+    def get_photograph_image_url(self, obj):
+        """Get the image URL for the linked photograph if it exists."""
+        if obj.photograph and obj.photograph.thumbnail:
+            return self.absolute_url(obj.photograph.thumbnail.url)
+        return None
+
+
+class PhotographCompactSerializer(CompactSerializerMixin, serializers.ModelSerializer):
+    """Flat serializer for photograph lists (?view=compact).
+
+    Paths are summarized by paths_count, and albums by their id and name.
+    rendition_url points to the smallest configured rendition, if it exists.
+    Expects the queryset to be annotated with paths_count, to prefetch albums
+    and to prefetch the smallest renditions into smallest_renditions (see
+    PhotographViewSet.get_queryset).
+    """
+
+    image_url = serializers.SerializerMethodField()
+    rendition_url = serializers.SerializerMethodField()
+    paths_count = serializers.IntegerField(read_only=True)
+    albums = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Photograph
+        fields = [
+            "id",
+            "hash",
+            "image_url",
+            "rendition_url",
+            "time",
+            "model",
+            "has_errors",
+            "missing",
+            "paths_count",
+            "albums",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+    def get_image_url(self, obj):
+        """Get the URL for the image if it exists."""
+        if obj.thumbnail:
+            return self.absolute_url(obj.thumbnail.url)
+        return None
+
+    def get_rendition_url(self, obj):
+        """Get the URL of the smallest rendition if it exists."""
+        renditions = getattr(obj, "smallest_renditions", None)
+        if renditions is None:
+            sizes = get_rendition_sizes()
+            if not sizes:
+                return None
+            renditions = obj.renditions.filter(size=min(sizes))
+        for rendition in renditions:
+            if rendition.image:
+                return self.absolute_url(rendition.image.url)
+        return None
+
+    def get_albums(self, obj):
+        """Get the id and name of the albums this photograph belongs to."""
+        return [{"id": album.id, "name": album.name} for album in obj.albums.all()]
@@ -1,26 +1,77 @@
 """API views for the photograph app."""
 
-import re
+from collections import Counter
 from datetime import datetime
 from django.utils import timezone
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
-from .models import Photograph, PhotoPath
-from .serializers import PhotographSerializer, PhotoPathSerializer
+from django.db.models import Count, Prefetch, Q
+from .cache import CachedResponseMixin
+from .models import (
+    UNKNOWN_DAY,
+    PathNode,
+    Photograph,
+    PhotoPath,
+    Rendition,
+    TimelineBucket,
+    get_rendition_sizes,
+    normalize_directory,
+    split_path,
+)
+from .pagination import KeysetPagination
+from .serializers import (
+    PhotographCompactSerializer,
+    PhotographSerializer,
+    PhotoPathCompactSerializer,
+    PhotoPathSerializer,
+    requested_fields,
+)
+
+
+def is_compact_view(view):
+    """Check whether a list or detail request asked for ?view=compact."""
+    request = getattr(view, "request", None)
+    return (
+        request is not None
+        and view.action in ("list", "retrieve")
+        and request.query_params.get("view") == "compact"
+    )
 
 
-class PhotographViewSet(viewsets.ModelViewSet):
+class PhotographViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """ViewSet for viewing and editing Photograph instances."""
 
-    queryset = Photograph.objects.all().prefetch_related("paths", "albums")
+    queryset = Photograph.objects.all().prefetch_related(
+        "paths", "albums", "renditions"
+    )
     serializer_class = PhotographSerializer
+    pagination_class = KeysetPagination
+    keyset_orderings = ("-created_at", "created_at", "-time", "time")
 
     def get_queryset(self):
         """Filter queryset based on query parameters."""
         queryset = super().get_queryset()
 
+        if is_compact_view(self):
+            # Flat rows: count paths in the same query, prefetch albums only
+            queryset = queryset.prefetch_related(None).annotate(
+                paths_count=Count("paths")
+            )
+            fields = requested_fields(self.request)
+            if fields is None or "albums" in fields:
+                queryset = queryset.prefetch_related("albums")
+            sizes = get_rendition_sizes()
+            if sizes and (fields is None or "rendition_url" in fields):
+                # Only the smallest rendition, which the grid displays
+                queryset = queryset.prefetch_related(
+                    Prefetch(
+                        "renditions",
+                        queryset=Rendition.objects.filter(size=min(sizes)),
+                        to_attr="smallest_renditions",
+                    )
+                )
+
         # Filter by year
         year = self.request.query_params.get("year", None)
         if year and year != "Unknown":
@@ -68,6 +119,12 @@ class PhotographViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def get_serializer_class(self):
+        """Use the flat serializer for ?view=compact."""
+        if is_compact_view(self):
+            return PhotographCompactSerializer
+        return super().get_serializer_class()
+
     def get_serializer_context(self):
         """Add request to serializer context for image URLs."""
         context = super().get_serializer_context()
@@ -77,27 +134,22 @@ class PhotographViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"])
     def years(self, request):
         """Get list of years with photo counts."""
-        from django.db.models import Count, Q
-        from django.db.models.functions import ExtractYear
-
-        queryset = self.get_queryset()
+        from django.db.models import Sum
 
-        # Get years from photos with time
-        years_with_time = (
-            queryset.exclude(time__isnull=True)
-            .annotate(year=ExtractYear("time"))
-            .values("year")
-            .annotate(count=Count("id"))
+        # Read the materialized timeline instead of grouping all photographs
+        years = (
+            TimelineBucket.objects.values("year")
+            .annotate(count=Sum("count"))
             .order_by("year")
         )
 
-        # Count photos without time
-        unknown_count = queryset.filter(time__isnull=True).count()
-
-        result = [
-            {"year": str(item["year"]), "count": item["count"]}
-            for item in years_with_time
-        ]
+        result = []
+        unknown_count = 0
+        for item in years:
+            if item["year"] == UNKNOWN_DAY[0]:
+                unknown_count = item["count"]
+            else:
+                result.append({"year": str(item["year"]), "count": item["count"]})
 
         if unknown_count > 0:
             result.append({"year": "Unknown", "count": unknown_count})
@@ -107,26 +159,23 @@ class PhotographViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"])
     def months(self, request):
         """Get list of months for a given year with photo counts."""
-        from django.db.models import Count, Q
-        from django.db.models.functions import ExtractYear, ExtractMonth
+        from django.db.models import Sum
 
         year = request.query_params.get("year")
         if not year or year == "Unknown":
             return Response([])
 
-        queryset = self.get_queryset()
         try:
             year_int = int(year)
-            start_date = timezone.make_aware(datetime(year_int, 1, 1))
-            end_date = timezone.make_aware(datetime(year_int + 1, 1, 1))
-            queryset = queryset.filter(time__gte=start_date, time__lt=end_date)
         except (ValueError, TypeError):
             return Response([])
+        if year_int == UNKNOWN_DAY[0]:
+            return Response([])
 
         months = (
-            queryset.annotate(month=ExtractMonth("time"))
+            TimelineBucket.objects.filter(year=year_int)
             .values("month")
-            .annotate(count=Count("id"))
+            .annotate(count=Sum("count"))
             .order_by("month")
         )
 
@@ -140,32 +189,21 @@ class PhotographViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"])
     def days(self, request):
         """Get list of days for a given year/month with photo counts."""
-        from django.db.models import Count
-        from django.db.models.functions import ExtractYear, ExtractMonth, ExtractDay
-
         year = request.query_params.get("year")
         month = request.query_params.get("month")
         if not year or not month:
             return Response([])
 
-        queryset = self.get_queryset()
         try:
             year_int = int(year)
             month_int = int(month)
-            start_date = timezone.make_aware(datetime(year_int, month_int, 1))
-            if month_int == 12:
-                end_date = timezone.make_aware(datetime(year_int + 1, 1, 1))
-            else:
-                end_date = timezone.make_aware(datetime(year_int, month_int + 1, 1))
-            queryset = queryset.filter(time__gte=start_date, time__lt=end_date)
         except (ValueError, TypeError):
             return Response([])
+        if year_int == UNKNOWN_DAY[0]:
+            return Response([])
 
-        days = (
-            queryset.annotate(day=ExtractDay("time"))
-            .values("day")
-            .annotate(count=Count("id"))
-            .order_by("day")
+        days = TimelineBucket.objects.filter(year=year_int, month=month_int).values(
+            "day", "count"
         )
 
         return Response(
@@ -187,7 +225,7 @@ class PhotographViewSet(viewsets.ModelViewSet):
         )
 
 
-class PhotoPathViewSet(viewsets.ModelViewSet):
+class PhotoPathViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """ViewSet for viewing and editing PhotoPath instances."""
 
     queryset = (
@@ -196,11 +234,21 @@ class PhotoPathViewSet(viewsets.ModelViewSet):
         .prefetch_related("photograph__paths", "photograph__albums")
     )
     serializer_class = PhotoPathSerializer
+    pagination_class = KeysetPagination
+    keyset_orderings = ("-created_at", "created_at")
 
     def get_queryset(self):
         """Filter queryset based on query parameters."""
         queryset = super().get_queryset()
 
+        if is_compact_view(self):
+            # Flat rows: the photograph is joined and its paths counted in one query
+            queryset = (
+                queryset.prefetch_related(None)
+                .select_related("photograph")
+                .annotate(photograph_paths_count=Count("photograph__paths"))
+            )
+
         # Filter by path prefix
         path_prefix = self.request.query_params.get("path_prefix", None)
         only_direct = (
@@ -208,167 +256,56 @@ class PhotoPathViewSet(viewsets.ModelViewSet):
         )
 
         if path_prefix:
-            # Normalize path separators
-            normalized_prefix = path_prefix.replace("\\", "/")
             if only_direct:
-                # Only get direct children (files in this directory, not in subdirectories)
-                # Path should start with prefix + "/" and the remaining part should not contain "/"
-                prefix_with_slash = normalized_prefix + "/"
-                queryset = queryset.filter(path__startswith=prefix_with_slash)
-
-                # Filter to only include paths where the part after prefix+"/" has no "/"
-                # We use a regex pattern: prefix + "/" + filename (no more "/")
-                from django.db import connection
-
-                prefix_pattern = re.escape(prefix_with_slash)
-
-                if connection.vendor == "postgresql":
-                    # PostgreSQL supports regex
-                    queryset = queryset.extra(
-                        where=["path ~ %s"], params=[rf"^{prefix_pattern}[^/]+$"]
-                    )
-                elif connection.vendor == "mysql":
-                    # MySQL supports regex
-                    queryset = queryset.extra(
-                        where=["path REGEXP %s"], params=[rf"^{prefix_pattern}[^/]+$"]
-                    )
-                else:
-                    # For SQLite and others, we'll need to filter differently
-                    # Use a workaround: filter paths that don't have another "/" after the prefix
-                    # This is less efficient but works across databases
-                    # We'll let the pagination handle it and filter will still reduce the dataset
-                    pass  # Fall back to startswith, which still helps
+                # Only direct children (files in this directory, not in
+                # subdirectories), from the indexed directory column
+                queryset = queryset.filter(directory=normalize_directory(path_prefix))
             else:
-                queryset = queryset.filter(path__startswith=normalized_prefix)
+                # Normalize path separators
+                queryset = queryset.filter(
+                    path__startswith=path_prefix.replace("\\", "/")
+                )
 
         return queryset
 
-    def _extract_segments_from_paths(self, paths, path_prefix=""):
-        """Extract directory/file segments from a list of paths.
-
-        Args:
-            paths: List of path strings
-            path_prefix: Optional prefix to filter and remove from paths
-
-        Returns:
-            Dictionary mapping (segment_name, is_directory) to set of paths
-        """
-        segments = {}  # key: (segment_name, is_directory), value: set of paths
-
-        # Normalize prefix
-        normalized_prefix = (
-            path_prefix.replace("\\", "/").strip("/") if path_prefix else ""
-        )
-
-        for path_obj in paths:
-            if not path_obj:
-                continue
-
-            # Normalize path separators
-            normalized_path = path_obj.replace("\\", "/")
-            normalized_path_clean = normalized_path.strip("/")
-
-            # Remove prefix and get remaining path
-            if normalized_prefix:
-                if normalized_path_clean.startswith(normalized_prefix + "/"):
-                    remaining = normalized_path_clean[len(normalized_prefix) + 1 :]
-                elif normalized_path_clean == normalized_prefix:
-                    continue  # This is the prefix itself, skip
-                else:
-                    continue
-            else:
-                remaining = normalized_path_clean
-
-            if not remaining:
-                continue
-
-            # Get first segment (directory or file)
-            # Split on "/" and get the first non-empty part
-            parts = [p for p in remaining.split("/") if p]  # Filter out empty parts
-            if len(parts) > 0:
-                first_segment = parts[0]
-                is_directory = len(parts) > 1  # Has more parts after the first
-
-                # Track this segment
-                segment_key = (first_segment, is_directory)
-                if segment_key not in segments:
-                    segments[segment_key] = set()
-                segments[segment_key].add(normalized_path)  # Store path for counting
-
-        return segments
-
     @action(detail=False, methods=["get"])
     def directories(self, request):
-        """Get directory structure for a given path prefix."""
-        import logging
-
-        logger = logging.getLogger(__name__)
-
-        try:
-            path_prefix = request.query_params.get("path_prefix", "")
-            normalized_prefix = path_prefix.replace("\\", "/") if path_prefix else ""
-
-            # Build queryset - only get paths we need
-            if normalized_prefix:
-                # Normalize prefix for database query
-                normalized_prefix_clean = normalized_prefix.strip("/")
-                # Try multiple patterns to match paths with/without leading slashes
-                from django.db.models import Q
-
-                # Pattern 1: prefix/ (e.g., "home/")
-                pattern1 = normalized_prefix_clean + "/"
-                # Pattern 2: /prefix/ (e.g., "/home/")
-                pattern2 = "/" + normalized_prefix_clean + "/"
-                # Pattern 3: prefix exactly (for files, e.g., "home")
-                pattern3 = normalized_prefix_clean
-
-                queryset = PhotoPath.objects.filter(
-                    Q(path__startswith=pattern1)
-                    | Q(path__startswith=pattern2)
-                    | Q(path=pattern3)
-                )
-            else:
-                # Root level - get all paths
-                queryset = PhotoPath.objects.all()
-
-            # Get distinct paths and process them in Python
-            # Limit to prevent memory issues with very large datasets
-            paths = list(queryset.values_list("path", flat=True).distinct()[:10000])
-
-            logger.debug(f"Found {len(paths)} paths for prefix: {normalized_prefix}")
-
-            # Extract segments using helper function
-            segments = self._extract_segments_from_paths(paths, normalized_prefix)
+        """Get the subdirectories and files of a directory, with photo path counts.
 
-            # Build result with counts
-            directories = {}
-            files = {}
+        Subdirectories come from the PathNode tree (count: number of photo
+        paths below them) and files from the indexed PhotoPath.directory column
+        (count: number of photo paths with that name, e.g., on several devices).
+        """
+        directory = normalize_directory(request.query_params.get("path_prefix", ""))
 
-            for (segment_name, is_directory), path_set in segments.items():
-                count = len(path_set)
-                if is_directory:
-                    directories[segment_name] = count
-                else:
-                    files[segment_name] = count
+        subdirectories = (
+            PathNode.objects.filter(parent=directory)
+            .order_by("name")
+            .values_list("name", "count")
+        )
+        files = Counter(
+            split_path(path)[1]
+            for path in PhotoPath.objects.filter(directory=directory)
+            .order_by()
+            .values_list("path", flat=True)
+        )
 
-            # Combine and sort results
-            result = [
+        return Response(
+            [
                 {"name": name, "is_directory": True, "count": count}
-                for name, count in sorted(directories.items())
-            ] + [
+                for name, count in subdirectories
+            ]
+            + [
                 {"name": name, "is_directory": False, "count": count}
                 for name, count in sorted(files.items())
             ]
+        )
 
-            logger.debug(
-                f"Returning {len(result)} segments: {len(directories)} directories, {len(files)} files"
-            )
-            if result:
-                logger.debug(f"Sample segments: {result[:5]}")
-            return Response(result)
-        except Exception as e:
-            logger.error(f"Error in directories endpoint: {str(e)}", exc_info=True)
-            return Response([])
+    def get_serializer_class(self):
+        """Use the flat serializer for ?view=compact."""
+        if is_compact_view(self):
+            return PhotoPathCompactSerializer
+        return super().get_serializer_class()
 
     def get_serializer_context(self):
         """Add request to serializer context for image URLs."""
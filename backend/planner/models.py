@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from photograph.models import bump_catalog_generation
 
 
 class PlannedAction(models.Model):
@@ -42,3 +45,10 @@ class PlannedAction(models.Model):
 
     def __str__(self):
         return f"{self.get_action_type_display()} for {self.photograph}"
+
+
+@receiver([post_save, post_delete], sender=PlannedAction)
+def _bump_catalog_generation(sender, raw=False, **kwargs):
+    """Bump the catalog generation when a planned action changes."""
+    if not raw:
+        bump_catalog_generation()
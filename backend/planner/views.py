@@ -1,11 +1,12 @@
 """API views for the planner app."""
 
 from rest_framework import viewsets
+from photograph.cache import CachedResponseMixin
 from .models import PlannedAction
 from .serializers import PlannedActionSerializer
 
 
-class PlannedActionViewSet(viewsets.ModelViewSet):
+class PlannedActionViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """ViewSet for viewing and editing PlannedAction instances."""
 
     queryset = PlannedAction.objects.all().select_related("photograph")
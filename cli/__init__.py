@@ -2,15 +2,11 @@
 CLI module for PhotoChart Django backend.
 
 This module provides command-line interface for managing photo collections.
+Command implementations are imported lazily (see cli.registry).
 """
 
 from .main import main
-from .parser import _expand_abbreviations, _print_help_for, build_parser
-from .commands import (
-    cmd_ingest,
-    cmd_convert,
-    HAS_RICH,
-)
+from .parser import _expand_abbreviations, _print_help_for, build_parser, HAS_RICH
 
 __all__ = [
     "build_parser",
@@ -21,3 +17,13 @@ __all__ = [
     "_print_help_for",
     "HAS_RICH",
 ]
+
+
+def __getattr__(name: str):
+    """Resolve command functions (e.g., cli.cmd_ingest) on first access."""
+    from .registry import COMMANDS, resolve_command
+
+    for command in COMMANDS.values():
+        if command.target.split(":")[1] == name:
+            return resolve_command(command.name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,9 @@
 """
 CLI command implementations for Django backend.
 
-All commands use Django ORM.
+Commands are imported lazily at dispatch time (see cli.registry). Django is
+set up before this module is imported only for commands that need the ORM, so
+Django models must be imported inside those commands.
 """
 
 from __future__ import annotations
@@ -11,26 +13,13 @@ import os
 import sys
 from pathlib import Path
 
-try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-
-    HAS_RICH = True
-    _console = Console()
-except Exception:  # pragma: no cover
-    HAS_RICH = False
-    _console = None
-
-# Django models - these will be imported after django.setup() in main.py
-from photograph.models import PhotoPath
-from photochart.resolution import get_resolution_presets
-from photochart.metadata import extract_metadata
+from .parser import HAS_RICH
 
 
 def cmd_ingest(args: argparse.Namespace) -> int:
     """Ingest photos from a directory and persist to database."""
     from photochart.ingest import ingest_photos
+    from photograph.models import get_rendition_sizes
 
     log_path = getattr(args, "log", None)
 
@@ -42,6 +31,14 @@ def cmd_ingest(args: argparse.Namespace) -> int:
         recursive=not getattr(args, "no_recursive", False),
         store_images=getattr(args, "store_images", True),
         log_path=log_path,
+        workers=getattr(args, "workers", 1),
+        defer_hash=getattr(args, "defer_hash", False),
+        batch_size=getattr(args, "batch_size", 500),
+        incremental=getattr(args, "incremental", False),
+        hash_algorithm=getattr(args, "hash_algorithm", None),
+        rendition_sizes=(
+            get_rendition_sizes() if getattr(args, "renditions", False) else None
+        ),
     )
 
     if not result["success"]:
@@ -52,21 +49,156 @@ def cmd_ingest(args: argparse.Namespace) -> int:
         return 1
 
     print(f"Ingested {result['count']} photo(s) from '{args.path}'.")
+    if result.get("updated", 0) > 0:
+        print(f"Re-processed {result['updated']} changed file(s).")
+    if result.get("missing", 0) > 0:
+        print(f"Flagged {result['missing']} missing file(s).")
     if result.get("hashes_calculated", 0) > 0:
         print(f"Calculated {result['hashes_calculated']} hash(es).")
+    if result.get("hashes_deferred", 0) > 0:
+        print(
+            f"Queued {result['hashes_deferred']} path(s) for deferred hashing. "
+            "Run 'pf hash' to process them."
+        )
     if result.get("images_stored", 0) > 0:
         print(f"Stored {result['images_stored']} image(s) in database.")
+    if result.get("renditions_stored", 0) > 0:
+        print(f"Stored {result['renditions_stored']} rendition(s).")
     if log_path:
         print(f"Log file written to: {log_path}")
 
     return 0
 
 
+def cmd_hash(args: argparse.Namespace) -> int:
+    """Hash paths from the deferred-hash queue and link them to photographs."""
+    from photochart.ingest import hash_pending_paths
+    from photograph.models import get_rendition_sizes
+
+    log_path = getattr(args, "log", None)
+
+    result = hash_pending_paths(
+        resolution=getattr(args, "resolution", None),
+        store_images=getattr(args, "store_images", True),
+        limit=getattr(args, "limit", None),
+        log_path=log_path,
+        workers=getattr(args, "workers", 1),
+        hash_algorithm=getattr(args, "hash_algorithm", None),
+        rendition_sizes=(
+            get_rendition_sizes() if getattr(args, "renditions", False) else None
+        ),
+    )
+
+    if not result["success"]:
+        for err in result.get("errors", []):
+            print(f"Error during hashing: {err}", file=sys.stderr)
+        if log_path:
+            print(f"Detailed error information logged to: {log_path}", file=sys.stderr)
+        return 1
+
+    print(f"Linked {result['count']} queued path(s) to photographs.")
+    if result.get("images_stored", 0) > 0:
+        print(f"Stored {result['images_stored']} image(s) in database.")
+    if result.get("renditions_stored", 0) > 0:
+        print(f"Stored {result['renditions_stored']} rendition(s).")
+    if log_path:
+        print(f"Log file written to: {log_path}")
+
+    return 0
+
+
+def cmd_renditions(args: argparse.Namespace) -> int:
+    """Render the rendition ladder for photographs that do not have it yet."""
+    from photochart.ingest import generate_renditions
+
+    log_path = getattr(args, "log", None)
+
+    result = generate_renditions(
+        sizes=getattr(args, "sizes", None),
+        replace=getattr(args, "replace", False),
+        limit=getattr(args, "limit", None),
+        log_path=log_path,
+        workers=getattr(args, "workers", 1),
+    )
+
+    if not result["success"]:
+        for err in result.get("errors", []):
+            print(f"Error during rendering: {err}", file=sys.stderr)
+        if log_path:
+            print(f"Detailed error information logged to: {log_path}", file=sys.stderr)
+        return 1
+
+    print(
+        f"Stored {result['renditions_stored']} rendition(s) "
+        f"for {result['count']} photograph(s)."
+    )
+    if result["errors"]:
+        print(f"Encountered {len(result['errors'])} error(s).", file=sys.stderr)
+    if log_path:
+        print(f"Log file written to: {log_path}")
+
+    return 0
+
+
+def cmd_timeline(args: argparse.Namespace) -> int:
+    """Rebuild the per-day timeline counts from the photographs."""
+    from photograph.models import rebuild_timeline
+
+    buckets = rebuild_timeline()
+    print(f"Rebuilt timeline: {buckets} day(s).")
+    return 0
+
+
+def cmd_path_tree(args: argparse.Namespace) -> int:
+    """Rebuild the directory tree of the photo paths."""
+    from photograph.models import rebuild_path_tree
+
+    directories = rebuild_path_tree()
+    print(f"Rebuilt directory tree: {directories} directory(ies).")
+    return 0
+
+
 def cmd_convert(args: argparse.Namespace) -> int:
-    """Convert an image file to a standard format."""
+    """Convert image files to a standard format."""
+    from photochart.sources import is_glob
+
+    sources = args.source if isinstance(args.source, list) else [args.source]
+    if len(sources) > 1 or is_glob(sources[0]) or os.path.isdir(sources[0]):
+        return _cmd_convert_batch(args, sources)
+    return _cmd_convert_file(args, sources[0])
+
+
+def _cmd_convert_batch(args: argparse.Namespace, sources: list[str]) -> int:
+    """Convert files, directories and glob patterns into a mirrored output tree."""
+    from photochart.batch_convert import convert_images
+
+    result = convert_images(
+        sources,
+        output_root=args.output,
+        resolution=getattr(args, "resolution", None),
+        output_format=getattr(args, "format", "JPEG").upper(),
+        recursive=not getattr(args, "no_recursive", False),
+        overwrite=getattr(args, "overwrite", False),
+        workers=getattr(args, "workers", 1),
+    )
+
+    for err in result["errors"]:
+        print(f"Error: {err}", file=sys.stderr)
+    print(f"Converted {result['converted']} of {result['found']} file(s).")
+    if result["skipped"] > 0:
+        print(
+            f"Skipped {result['skipped']} file(s) that are up to date "
+            "or already in the output format."
+        )
+    if result["failed"] > 0:
+        print(f"Failed to convert {result['failed']} file(s).", file=sys.stderr)
+    return 0 if result["success"] else 1
+
+
+def _cmd_convert_file(args: argparse.Namespace, src: str) -> int:
+    """Convert a single image file to a standard format."""
     from photochart.convert import convert_image
 
-    src = args.source
     output_format = getattr(args, "format", "JPEG").upper()
 
     # Check if source file exists
@@ -128,6 +260,8 @@ def cmd_convert(args: argparse.Namespace) -> int:
 
 def cmd_list_resolutions(args: argparse.Namespace) -> int:
     """List all available resolution presets."""
+    from photochart.resolution import get_resolution_presets
+
     presets = get_resolution_presets()
 
     if not HAS_RICH:
@@ -139,6 +273,11 @@ def cmd_list_resolutions(args: argparse.Namespace) -> int:
         return 0
 
     # Rich table output
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.table import Table
+
+    console = Console()
     table = Table(title="[bold cyan]Available Resolution Presets[/]")
     table.add_column("[bold]Preset Name[/]", style="bold yellow", justify="left")
     table.add_column("[bold]Resolution[/]", style="cyan", justify="center")
@@ -171,14 +310,62 @@ def cmd_list_resolutions(args: argparse.Namespace) -> int:
 
         table.add_row(name, f"{width}x{height}", description)
 
-    _console.print(Panel.fit(table, title="[bold green]Resolution Presets[/]"))
-    _console.print("\n[dim]You can also use explicit resolutions like '1920x1080'[/]")
+    console.print(Panel.fit(table, title="[bold green]Resolution Presets[/]"))
+    console.print("\n[dim]You can also use explicit resolutions like '1920x1080'[/]")
     return 0
 
 
 def cmd_info(args: argparse.Namespace) -> int:
-    """Display metadata for an image file."""
-    file_path = args.file
+    """Display metadata for image files."""
+    from photochart.metadata import parse_fields
+    from photochart.sources import is_glob
+
+    sources = args.file if isinstance(args.file, list) else [args.file]
+    fields = getattr(args, "fields", None)
+    if fields is not None:
+        try:
+            parse_fields(fields)
+        except ValueError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            return 2
+
+    if (
+        getattr(args, "jsonl", False)
+        or fields is not None
+        or len(sources) > 1
+        or is_glob(sources[0])
+        or os.path.isdir(sources[0])
+    ):
+        return _cmd_info_batch(args, sources, fields)
+    return _cmd_info_file(sources[0])
+
+
+def _cmd_info_batch(
+    args: argparse.Namespace, sources: list[str], fields: list[str] | None
+) -> int:
+    """Print the metadata of files, directories and glob patterns as JSON Lines."""
+    from photochart.metadata import iter_metadata, metadata_to_json
+
+    count = 0
+    for record in iter_metadata(
+        sources,
+        fields=fields,
+        recursive=not getattr(args, "no_recursive", False),
+        workers=getattr(args, "workers", 1),
+    ):
+        sys.stdout.write(metadata_to_json(record) + "\n")
+        count += 1
+
+    if count == 0:
+        print("Error: No image files found in: " + ", ".join(sources), file=sys.stderr)
+        return 1
+    return 0
+
+
+def _cmd_info_file(file_path: str) -> int:
+    """Display metadata for a single image file."""
+    from photochart.metadata import extract_metadata
+
     path = Path(file_path)
 
     if not path.exists():
@@ -240,8 +427,12 @@ def cmd_info(args: argparse.Namespace) -> int:
         return 0
 
     # Rich output
+    from rich.console import Console
+    from rich.panel import Panel
     from rich.text import Text
 
+    console = Console()
+
     panels = []
 
     # File information panel
@@ -323,10 +514,10 @@ def cmd_info(args: argparse.Namespace) -> int:
 
     # Display all panels
     if panels:
-        _console.print(f"\n[bold]Metadata for:[/] [cyan]{file_path}[/]\n")
+        console.print(f"\n[bold]Metadata for:[/] [cyan]{file_path}[/]\n")
         for panel in panels:
-            _console.print(panel)
+            console.print(panel)
     else:
-        _console.print(f"[yellow]No metadata found for: {file_path}[/]")
+        console.print(f"[yellow]No metadata found for: {file_path}[/]")
 
     return 0
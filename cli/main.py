@@ -8,23 +8,13 @@ import sys
 import os
 from typing import Optional
 
-# Setup Django environment before importing Django models
+# Add project root to path (so photochart can be found). Django is only set up
+# when a command that needs the ORM is dispatched (see cli.registry).
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-# Add project root to path first (so photochart can be found)
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
-# Also add backend directory to path so Django apps can be found
-backend_dir = os.path.join(project_root, "backend")
-if backend_dir not in sys.path:
-    sys.path.insert(0, backend_dir)
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.backend.settings")
 
-import django
-
-django.setup()
-
-from .parser import build_parser, _expand_abbreviations, _print_help_for
-from .commands import HAS_RICH
+from .parser import build_parser, _expand_abbreviations, _print_help_for, HAS_RICH
 
 
 def main(argv: Optional[list[str]] = None) -> int:
@@ -34,9 +24,6 @@ def main(argv: Optional[list[str]] = None) -> int:
     argv = _expand_abbreviations(argv, parser)
     args = parser.parse_args(argv)
 
-    # Django doesn't need database configuration like SQLAlchemy did
-    # The database is configured via Django settings
-
     if not hasattr(args, "func"):
         # Top-level invoked without subcommand: show fancy help if available
         if HAS_RICH:
@@ -5,25 +5,35 @@ Argument parser for CLI commands.
 from __future__ import annotations
 
 import argparse
+import importlib.util
 
-try:
-    from rich.table import Table
-    from rich.console import Console
-    from rich.panel import Panel
+from .registry import lazy_command
 
-    _console = Console()
-except Exception:
-    Table = None
-    Panel = None
-    _console = None
+# Rich is only imported when the fancy help is rendered
+HAS_RICH = importlib.util.find_spec("rich") is not None
 
-from .commands import (
-    cmd_ingest,
-    cmd_convert,
-    cmd_list_resolutions,
-    cmd_info,
-    HAS_RICH,
-)
+
+def _parse_sizes(value: str) -> list[int]:
+    """Parse a comma-separated list of rendition sizes (e.g., '150,640,1920')."""
+    try:
+        sizes = [int(size) for size in value.split(",") if size.strip()]
+    except ValueError:
+        sizes = []
+    if not sizes or any(size <= 0 for size in sizes):
+        raise argparse.ArgumentTypeError(
+            f"invalid sizes '{value}': expected positive integers like '150,640,1920'"
+        )
+    return sizes
+
+
+def _parse_fields(value: str) -> list[str]:
+    """Parse a comma-separated list of metadata fields (e.g., 'file.size,exif.Model')."""
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    if not fields:
+        raise argparse.ArgumentTypeError(
+            f"invalid fields '{value}': expected names like 'file.size,exif.Model'"
+        )
+    return fields
 
 
 def _print_help_for(parser: argparse.ArgumentParser):
@@ -33,6 +43,11 @@ def _print_help_for(parser: argparse.ArgumentParser):
             return 2
 
         # Attempt to render a nicer help using Rich
+        from rich.console import Console
+        from rich.panel import Panel
+        from rich.table import Table
+
+        console = Console()
         prog = parser.prog or "pf"
         desc = parser.description or ""
         table = Table(title=f"[bold cyan]{prog}[/] - {desc}")
@@ -77,9 +92,9 @@ def _print_help_for(parser: argparse.ArgumentParser):
             opt_table.add_column("[bold]Description[/]", style="white")
             for name, help_text in opts:
                 opt_table.add_row(name, help_text)
-            _console.print(Panel.fit(opt_table))
+            console.print(Panel.fit(opt_table))
 
-        _console.print(Panel.fit(table, title=f"[bold green]{prog} help[/]"))
+        console.print(Panel.fit(table, title=f"[bold green]{prog} help[/]"))
         return 2
 
     return _f
@@ -115,11 +130,20 @@ def build_parser() -> argparse.ArgumentParser:
             "Use 'pf list-resolutions' to see all available presets."
         ),
     )
-    p_ing.add_argument(
+    hash_group = p_ing.add_mutually_exclusive_group()
+    hash_group.add_argument(
         "--hash",
         action="store_true",
         help="Calculate and store hash for each photo",
     )
+    hash_group.add_argument(
+        "--defer-hash",
+        action="store_true",
+        help=(
+            "Only index the paths without reading the files. "
+            "Use 'pf hash' later to hash them and link them to photographs."
+        ),
+    )
     p_ing.add_argument(
         "--no-recursive",
         action="store_true",
@@ -136,22 +160,184 @@ def build_parser() -> argparse.ArgumentParser:
         "--log",
         help="Path to log file where detailed error information will be written",
     )
-    p_ing.set_defaults(func=cmd_ingest)
+    p_ing.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of worker processes for hashing, EXIF reading and thumbnailing "
+            "(default: 1, 0 uses all CPUs). Database writes always happen in a single writer."
+        ),
+    )
+    p_ing.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Re-process already ingested files whose size or modification time changed, "
+            "and flag ingested files that no longer exist as missing"
+        ),
+    )
+    p_ing.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Number of files written to the database per transaction (default: 500)",
+    )
+    p_ing.add_argument(
+        "--hash-algorithm",
+        choices=["md5", "blake2b", "blake3"],
+        help=(
+            "Hash algorithm for new hashes (default: PHOTOCHART_HASH_ALGORITHM setting, md5). "
+            "Photographs are only matched by hash within the same algorithm; blake3 "
+            "requires the blake3 package."
+        ),
+    )
+    p_ing.add_argument(
+        "--renditions",
+        action="store_true",
+        help=(
+            "Also store the rendition ladder of each new photograph "
+            "(sizes from the PHOTOCHART_RENDITION_SIZES setting, default: 150,640,1920)"
+        ),
+    )
+    p_ing.set_defaults(func=lazy_command("ingest"))
+
+    # hash
+    p_hash = sub.add_parser(
+        "hash",
+        help="Hash paths indexed with a deferred hash",
+        description="Hash paths indexed with 'ingest --defer-hash' and link them to photographs",
+    )
+    p_hash.add_argument(
+        "--resolution",
+        help=(
+            "Optional resolution for stored images. Can be explicit (e.g., '1920x1080') "
+            "or a preset name. Use 'pf list-resolutions' to see all available presets."
+        ),
+    )
+    p_hash.add_argument(
+        "--no-store-images",
+        action="store_false",
+        dest="store_images",
+        default=True,
+        help="Do not store image files in the database media directory",
+    )
+    p_hash.add_argument(
+        "--limit",
+        type=int,
+        help="Maximum number of queued paths to process",
+    )
+    p_hash.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, 0 uses all CPUs)",
+    )
+    p_hash.add_argument(
+        "--log",
+        help="Path to log file where detailed error information will be written",
+    )
+    p_hash.add_argument(
+        "--hash-algorithm",
+        choices=["md5", "blake2b", "blake3"],
+        help=(
+            "Hash algorithm for new hashes (default: PHOTOCHART_HASH_ALGORITHM setting, md5). "
+            "Photographs are only matched by hash within the same algorithm; blake3 "
+            "requires the blake3 package."
+        ),
+    )
+    p_hash.add_argument(
+        "--renditions",
+        action="store_true",
+        help="Also store the rendition ladder of each new photograph",
+    )
+    p_hash.set_defaults(func=lazy_command("hash"))
+
+    # renditions
+    p_ren = sub.add_parser(
+        "renditions",
+        help="Render the rendition ladder for ingested photographs",
+        description=(
+            "Render the rendition ladder (e.g., 150, 640 and 1920 pixels) for "
+            "photographs that do not have it yet, from a single decode of each file"
+        ),
+    )
+    p_ren.add_argument(
+        "--sizes",
+        type=_parse_sizes,
+        help=(
+            "Comma-separated rendition sizes (longest edge in pixels). "
+            "Default: PHOTOCHART_RENDITION_SIZES setting (150,640,1920)"
+        ),
+    )
+    p_ren.add_argument(
+        "--replace",
+        action="store_true",
+        help="Render all photographs, replacing their existing renditions of these sizes",
+    )
+    p_ren.add_argument(
+        "--limit",
+        type=int,
+        help="Maximum number of photographs to process",
+    )
+    p_ren.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, 0 uses all CPUs)",
+    )
+    p_ren.add_argument(
+        "--log",
+        help="Path to log file where detailed error information will be written",
+    )
+    p_ren.set_defaults(func=lazy_command("renditions"))
+
+    # timeline
+    p_tl = sub.add_parser(
+        "timeline",
+        help="Rebuild the timeline counts from the photographs",
+        description=(
+            "Recount the per-day photo counts behind the timeline (years, months "
+            "and days). Only needed after bulk edits that bypass the ORM signals, "
+            "such as QuerySet.update() or raw SQL."
+        ),
+    )
+    p_tl.set_defaults(func=lazy_command("timeline"))
+
+    # path-tree
+    p_tree = sub.add_parser(
+        "path-tree",
+        help="Rebuild the directory tree of the photo paths",
+        description=(
+            "Recount the directories and per-directory path counts behind the "
+            "directory browser. Only needed after bulk edits that bypass the ORM "
+            "signals, such as QuerySet.update() or raw SQL."
+        ),
+    )
+    p_tree.set_defaults(func=lazy_command("path-tree"))
 
     # convert
     p_conv = sub.add_parser(
         "convert",
-        help="Convert an image to a standard format",
-        description="Convert an image file to a standard format (e.g., JPEG) with optional resizing",
+        help="Convert images to a standard format",
+        description=(
+            "Convert image files to a standard format (e.g., JPEG) with optional resizing. "
+            "Sources can be files, directories or glob patterns (quote them, e.g. 'shoot/**/*.nef'); "
+            "the directory structure is mirrored into the output directory."
+        ),
     )
     p_conv.add_argument(
         "source",
-        help="Path to the source image file",
+        nargs="+",
+        help="Source image files, directories or glob patterns",
     )
     p_conv.add_argument(
         "--output",
         "-o",
-        help="Path to the output image file (defaults to the same path as input with appropriate extension)",
+        help=(
+            "Output file for a single source file, or output root directory "
+            "(defaults to the same path as each input with the appropriate extension)"
+        ),
     )
     p_conv.add_argument(
         "--resolution",
@@ -168,7 +354,23 @@ def build_parser() -> argparse.ArgumentParser:
         choices=["JPEG", "PNG"],
         help="Output format (default: JPEG)",
     )
-    p_conv.set_defaults(func=cmd_convert)
+    p_conv.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, 0 uses all CPUs)",
+    )
+    p_conv.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Convert files even if their output exists and is newer than the source",
+    )
+    p_conv.add_argument(
+        "--no-recursive",
+        action="store_true",
+        help="Do not recursively search subdirectories of source directories",
+    )
+    p_conv.set_defaults(func=lazy_command("convert"))
 
     # list-resolutions
     p_res = sub.add_parser(
@@ -176,19 +378,49 @@ def build_parser() -> argparse.ArgumentParser:
         help="List all available resolution presets",
         description="Display all available resolution presets that can be used with --resolution",
     )
-    p_res.set_defaults(func=cmd_list_resolutions)
+    p_res.set_defaults(func=lazy_command("list-resolutions"))
 
     # info
     p_info = sub.add_parser(
         "info",
         help="Show metadata for a raw image",
-        description="Display all available metadata from a raw image file, including EXIF data and RAW-specific information",
+        description=(
+            "Display all available metadata from a raw image file, including EXIF data "
+            "and RAW-specific information. With several files, directories or glob "
+            "patterns (or --jsonl), print one JSON record per file (JSON Lines)."
+        ),
     )
     p_info.add_argument(
         "file",
-        help="Path to the image file to inspect",
+        nargs="+",
+        help="Image files, directories or glob patterns to inspect",
+    )
+    p_info.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Print JSON Lines records even for a single file",
+    )
+    p_info.add_argument(
+        "--fields",
+        type=_parse_fields,
+        help=(
+            "Comma-separated fields to extract: categories (file, image, exif, raw) "
+            "or keys within them (e.g., 'file.size,exif.Model,exif.DateTimeOriginal'). "
+            "Only the requested tags are decoded. Implies --jsonl."
+        ),
+    )
+    p_info.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, 0 uses all CPUs)",
+    )
+    p_info.add_argument(
+        "--no-recursive",
+        action="store_true",
+        help="Do not recursively search subdirectories of source directories",
     )
-    p_info.set_defaults(func=cmd_info)
+    p_info.set_defaults(func=lazy_command("info"))
 
     return p
 
@@ -0,0 +1,99 @@
+"""
+Lazy registry of CLI commands.
+
+Each subcommand declares where its implementation lives and whether it needs
+the Django ORM. Nothing is imported until a command is dispatched: Django is
+only set up (and models, backends and rich only imported) for the command
+that actually runs, so pure-file commands like 'convert', 'info' and
+'list-resolutions' start without loading the Django apps.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import sys
+from typing import Callable, NamedTuple
+
+_django_ready = False
+
+
+class Command(NamedTuple):
+    """A CLI subcommand.
+
+    Attributes:
+        name: Subcommand name (e.g., "ingest")
+        target: Implementation as "module:function" (e.g., "cli.commands:cmd_ingest")
+        needs_orm: Whether Django must be set up before the command is imported
+    """
+
+    name: str
+    target: str
+    needs_orm: bool
+
+
+COMMANDS = {
+    command.name: command
+    for command in (
+        Command("ingest", "cli.commands:cmd_ingest", needs_orm=True),
+        Command("hash", "cli.commands:cmd_hash", needs_orm=True),
+        Command("renditions", "cli.commands:cmd_renditions", needs_orm=True),
+        Command("timeline", "cli.commands:cmd_timeline", needs_orm=True),
+        Command("path-tree", "cli.commands:cmd_path_tree", needs_orm=True),
+        Command("convert", "cli.commands:cmd_convert", needs_orm=False),
+        Command(
+            "list-resolutions", "cli.commands:cmd_list_resolutions", needs_orm=False
+        ),
+        Command("info", "cli.commands:cmd_info", needs_orm=False),
+    )
+}
+
+
+def setup_django() -> None:
+    """Set up Django (once) so models can be imported."""
+    global _django_ready
+    if _django_ready:
+        return
+
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    # Add backend directory to path so Django apps can be found
+    backend_dir = os.path.join(project_root, "backend")
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.backend.settings")
+
+    import django
+
+    django.setup()
+    _django_ready = True
+
+
+def resolve_command(name: str) -> Callable[[argparse.Namespace], int]:
+    """Import the implementation of a command, setting up Django if it needs it.
+
+    Args:
+        name: Subcommand name
+
+    Returns:
+        Command function taking the parsed arguments and returning an exit code
+    """
+    command = COMMANDS[name]
+    if command.needs_orm:
+        setup_django()
+    module_name, function_name = command.target.split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def lazy_command(name: str) -> Callable[[argparse.Namespace], int]:
+    """Get a placeholder for a command that resolves it when called.
+
+    Used as the 'func' default of subparsers, so building the parser imports
+    none of the command implementations.
+    """
+
+    def _run(args: argparse.Namespace) -> int:
+        return resolve_command(name)(args)
+
+    _run.__name__ = COMMANDS[name].target.split(":")[1]
+    return _run
@@ -2,6 +2,7 @@
 
 import type {
   Photograph,
+  PhotographSummary,
   PhotoPath,
   Hash,
   Directory,
@@ -53,11 +54,9 @@ async function fetchAllPages<T>(
   const allItems: T[] = [];
   let url = `${API_BASE_URL}${endpoint}`;
 
-  // Add query parameters if provided
-  if (params) {
-    const searchParams = new URLSearchParams(params);
-    url += `?${searchParams.toString()}`;
-  }
+  // Add query parameters; the total count is not needed to walk all pages
+  const searchParams = new URLSearchParams({ ...params, count: "false" });
+  url += `?${searchParams.toString()}`;
 
   let nextUrl: string | null = url;
 
@@ -79,12 +78,12 @@ export const api = {
   getPhotographs: (): Promise<PaginatedResponse<Photograph>> =>
     fetchAPI("/photographs/"),
 
-  getAllPhotographs: (params?: { year?: string; month?: string; day?: string }): Promise<Photograph[]> => {
-    const queryParams: Record<string, string> = {};
+  getAllPhotographs: (params?: { year?: string; month?: string; day?: string }): Promise<PhotographSummary[]> => {
+    const queryParams: Record<string, string> = { view: "compact" };
     if (params?.year) queryParams.year = params.year;
     if (params?.month) queryParams.month = params.month;
     if (params?.day) queryParams.day = params.day;
-    return fetchAllPages<Photograph>("/photographs/", Object.keys(queryParams).length > 0 ? queryParams : undefined);
+    return fetchAllPages<PhotographSummary>("/photographs/", queryParams);
   },
 
   getPhotographYears: (): Promise<Array<{ year: string; count: number }>> =>
@@ -1,6 +1,6 @@
 import { useState, useEffect, useMemo, useRef } from "react";
 import { api } from "../api";
-import type { Photograph, Album } from "../types";
+import type { PhotographSummary, Album } from "../types";
 
 type SortMode = "id" | "date";
 type NavigationPath = {
@@ -10,7 +10,7 @@ type NavigationPath = {
 };
 
 export function Photographs() {
-  const [photographs, setPhotographs] = useState<Photograph[]>([]);
+  const [photographs, setPhotographs] = useState<PhotographSummary[]>([]);
   const [loading, setLoading] = useState(false); // Start as false, only set true when actually fetching
   const [error, setError] = useState<string | null>(null);
   const [sortMode, setSortMode] = useState<SortMode>("id");
@@ -224,8 +224,8 @@ export function Photographs() {
   // Build hierarchical structure: Year > Month > Day, with "Unknown" for photos without time
   // This is now only used when we have actual photo data (at leaf levels)
   const hierarchy = useMemo(() => {
-    const structure: Record<string, Record<string, Record<string, Photograph[]>>> = {};
-    const unknownPhotos: Photograph[] = [];
+    const structure: Record<string, Record<string, Record<string, PhotographSummary[]>>> = {};
+    const unknownPhotos: PhotographSummary[] = [];
 
     photographs.forEach((photo) => {
       // Check if photo has a valid time
@@ -614,9 +614,9 @@ export function Photographs() {
                   className={`photograph-card ${selectedPhotos.has(photo.id) ? "selected" : ""}`}
                   onClick={() => togglePhotoSelection(photo.id)}
                 >
-                {photo.image_url ? (
+                {photo.rendition_url || photo.image_url ? (
                   <img
-                    src={photo.image_url}
+                    src={photo.rendition_url ?? photo.image_url ?? undefined}
                     alt={photo.hash || `Photo ${photo.id}`}
                     className="photograph-image"
                   />
@@ -671,9 +671,9 @@ export function Photographs() {
                   </div>
                   <div className="photograph-paths">
                     <span className="field-label">Paths:</span>{" "}
-                    {photo.paths.length > 0 ? (
+                    {photo.paths_count > 0 ? (
                       <span className="paths-count">
-                        {photo.paths.length} path{photo.paths.length !== 1 ? "s" : ""}
+                        {photo.paths_count} path{photo.paths_count !== 1 ? "s" : ""}
                       </span>
                     ) : (
                       <span className="no-paths">No paths</span>
@@ -17,12 +17,29 @@ export interface Photograph {
   time: string | null;
   model: string | null;
   has_errors: boolean;
+  missing: boolean;
   paths: PhotoPath[];
   albums: Album[];
   created_at: string;
   updated_at: string;
 }
 
+/** Flat photograph row returned by /photographs/?view=compact */
+export interface PhotographSummary {
+  id: number;
+  hash: string | null;
+  image_url: string | null;
+  rendition_url: string | null;
+  time: string | null;
+  model: string | null;
+  has_errors: boolean;
+  missing: boolean;
+  paths_count: number;
+  albums: Array<{ id: number; name: string }>;
+  created_at: string;
+  updated_at: string;
+}
+
 export interface PhotoPath {
   id: number;
   path: string;
@@ -85,7 +102,7 @@ export interface PlannedAction {
 }
 
 export interface PaginatedResponse<T> {
-  count: number;
+  count: number | null;
   next: string | null;
   previous: string | null;
   results: T[];
@@ -1,25 +1,47 @@
 """Image backends for processing different image file formats.
 
 This module provides a backend system for handling various image formats,
-including RAW formats like NEF (Nikon RAW) that require special processing.
+including RAW formats (NEF, CR2, ARW, DNG, ...) that require special processing.
+
+Backends are registered per file extension. Besides the built-in ones, other
+packages can provide backends through the "photochart.backends" entry-point
+group: each entry point names a backend class with an ``extensions`` attribute
+listing the extensions it handles, e.g. in pyproject.toml:
+
+    [project.entry-points."photochart.backends"]
+    heif = "mypackage.backends:HeifBackend"
+
+One instance of each backend class is created and reused for every file.
 """
 
 import os
 import io
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Protocol, Dict, Type
+from typing import Any, BinaryIO, Optional, Protocol, Dict, Type
 from logging import Logger
 
 from .log import get_logger
+from .thumbnail import fit_resolution, scale_image
 
 LOGGER = get_logger(__name__)
 
 
+# Entry-point group for backends provided by other packages
+BACKEND_ENTRY_POINT_GROUP = "photochart.backends"
+
+
 class ImageBackend(Protocol):
     """Protocol for image processing backends.
 
     Backends should implement methods to process image files that cannot
-    be handled by standard image libraries like PIL/Pillow.
+    be handled by standard image libraries like PIL/Pillow. A single instance
+    of each backend is shared by all files, so backends should keep expensive
+    probes (like optional imports) in __init__ or cache them.
+
+    Backends may also implement ``supports(extension) -> bool``, which the
+    registry uses instead of can_process to dispatch files without touching
+    the filesystem.
     """
 
     def can_process(self, file_path: str) -> bool:
@@ -38,53 +60,119 @@ class ImageBackend(Protocol):
         file_path: str,
         output_format: str = "JPEG",
         resolution: Optional[tuple[int, int]] = None,
-    ) -> Optional[io.BytesIO]:
+        source: Optional[BinaryIO] = None,
+        sink: Optional[BinaryIO] = None,
+    ) -> Optional[BinaryIO]:
         """Process the image file and return it as a standard format.
 
         Args:
             file_path: Path to the image file to process
             output_format: Desired output format (e.g., "JPEG", "PNG")
             resolution: Optional target resolution as (width, height) tuple
+            source: Optional already-open binary stream with the file contents.
+                If given, it is read instead of opening file_path again.
+            sink: Optional writable binary stream (e.g., the destination file).
+                If given, the encoded image is written to it directly instead
+                of to a new in-memory buffer.
 
         Returns:
-            BytesIO object containing the processed image, or None if processing fails
+            The sink, or a BytesIO positioned at the start of the encoded image
+            if no sink was given; None if processing fails
         """
         ...
 
 
-class NEFBackend:
-    """Backend for processing Nikon NEF (RAW) files.
+# RAW extensions decoded through rawpy (LibRaw)
+RAW_EXTENSIONS = (
+    ".3fr",
+    ".ari",
+    ".arw",
+    ".bay",
+    ".cap",
+    ".cr2",
+    ".crw",
+    ".dcr",
+    ".dcs",
+    ".dng",
+    ".drf",
+    ".eip",
+    ".erf",
+    ".fff",
+    ".iiq",
+    ".k25",
+    ".kdc",
+    ".mdc",
+    ".mef",
+    ".mos",
+    ".mrw",
+    ".nef",
+    ".nrw",
+    ".orf",
+    ".pef",
+    ".pxn",
+    ".raf",
+    ".raw",
+    ".rw2",
+    ".rwl",
+    ".sr2",
+    ".srf",
+    ".srw",
+    ".x3f",
+)
+
+
+@lru_cache(maxsize=None)
+def rawpy_available() -> bool:
+    """Check (once per process) whether rawpy can be imported.
 
-    This backend uses rawpy to extract embedded JPEG previews from NEF files
-    or convert them to standard image formats. The embedded preview is preferred
-    as it's faster and doesn't require full RAW processing.
+    Returns:
+        True if rawpy is available, False otherwise
     """
+    try:
+        import rawpy  # noqa: F401
+
+        return True
+    except ImportError:
+        LOGGER.warning(
+            "rawpy is not available. RAW file processing will be disabled. "
+            "Install it with: pip install rawpy"
+        )
+        return False
+
+
+class RawBackend:
+    """Backend for processing RAW files (CR2, NEF, ARW, DNG, RAF, ...).
+
+    This backend uses rawpy to extract the embedded preview from RAW files,
+    which is much faster than demosaicing the sensor data. The preview is used
+    whenever it is at least as large as the requested resolution (or always,
+    if no resolution is requested). Otherwise, or if the file has no usable
+    preview, the RAW data is processed with parameters chosen for the
+    requested resolution (see _postprocess_params).
+    """
+
+    # Extensions handled by this backend
+    extensions = RAW_EXTENSIONS
 
     def __init__(self, logger: Logger = LOGGER):
-        """Initialize the NEF backend.
+        """Initialize the RAW backend.
 
         Args:
             logger: Logger instance for error reporting
         """
         self.logger = logger
-        self._rawpy_available = self._check_rawpy_availability()
+        self._rawpy_available = rawpy_available()
 
-    def _check_rawpy_availability(self) -> bool:
-        """Check if rawpy is available.
+    def supports(self, extension: str) -> bool:
+        """Check if this backend handles an extension, without touching the file.
+
+        Args:
+            extension: Lowercase file extension, including the dot
 
         Returns:
-            True if rawpy can be imported, False otherwise
+            True if the extension is a RAW extension and rawpy is available
         """
-        try:
-            import rawpy  # noqa: F401
-
-            return True
-        except ImportError:
-            self.logger.warning(
-                "rawpy is not available. NEF file processing will be disabled. "
-                "Install it with: pip install rawpy"
-            )
-            return False
+        return self._rawpy_available and extension in self.extensions
 
     def can_process(self, file_path: str) -> bool:
         """Check if this backend can process the given file.
@@ -93,83 +181,163 @@ class NEFBackend:
             file_path: Path to the image file
 
         Returns:
-            True if the file is a NEF file and rawpy is available, False otherwise
+            True if the file has a RAW extension and rawpy is available, False otherwise
         """
         if not self._rawpy_available:
             return False
 
         path = Path(file_path)
-        return path.suffix.lower() == ".nef" and os.path.exists(file_path)
+        return path.suffix.lower() in self.extensions and os.path.exists(file_path)
+
+    def _extract_preview(self, raw, file_path: str, resolution):
+        """Get the embedded preview of a RAW file, if it is large enough.
+
+        Args:
+            raw: Open rawpy.RawPy object
+            file_path: Path to the RAW file (for logging)
+            resolution: Optional target resolution as (width, height) tuple
+
+        Returns:
+            PIL Image with the preview (not loaded yet for JPEG previews), or
+            None if there is no usable preview or it is smaller than the target
+        """
+        import rawpy
+        from PIL import Image
+
+        try:
+            thumb = raw.extract_thumb()
+        except (rawpy.LibRawNoThumbnailError, rawpy.LibRawUnsupportedThumbnailError):
+            self.logger.debug("No embedded preview in RAW file: %s", file_path)
+            return None
+        except Exception as exc:
+            self.logger.debug(
+                "Could not extract preview from RAW file %s: %s", file_path, exc
+            )
+            return None
+
+        if thumb.format == rawpy.ThumbFormat.JPEG:
+            # Only the header is read here; pixels are decoded later, at a
+            # reduced scale if a resolution is given
+            image = Image.open(io.BytesIO(thumb.data))
+        else:
+            image = Image.fromarray(thumb.data)
+
+        if resolution:
+            target_width, target_height = fit_resolution(image.size, resolution)
+            if image.width < target_width or image.height < target_height:
+                self.logger.debug(
+                    "Embedded preview of %s is %dx%d, smaller than %dx%d",
+                    file_path,
+                    image.width,
+                    image.height,
+                    target_width,
+                    target_height,
+                )
+                image.close()
+                return None
+
+        self.logger.debug(
+            "Using %dx%d embedded preview of RAW file: %s",
+            image.width,
+            image.height,
+            file_path,
+        )
+        return image
+
+    def _postprocess_params(self, raw, resolution) -> Dict[str, Any]:
+        """Choose rawpy postprocess parameters for a target resolution.
+
+        Without a resolution, the RAW data is rendered at full size and quality.
+        With one, the render only needs to be as large as the target:
+        - half_size averages each 2x2 Bayer block into one pixel (no
+          demosaicing at all), used when half the sensor size still covers the
+          target
+        - otherwise a full-size render with the fast linear demosaic
+        In both cases automatic brightening (a histogram pass) is skipped.
+
+        Args:
+            raw: Open rawpy.RawPy object
+            resolution: Optional target resolution as (width, height) tuple
+
+        Returns:
+            Keyword arguments for raw.postprocess()
+        """
+        import rawpy
+
+        params: Dict[str, Any] = {"output_bps": 8}
+        if not resolution:
+            return params
+
+        params.update(use_camera_wb=True, no_auto_bright=True)
+        width, height = raw.sizes.width, raw.sizes.height
+        if raw.sizes.flip in (5, 6):
+            # Rotated by 90 degrees in the output
+            width, height = height, width
+        target_width, target_height = fit_resolution((width, height), resolution)
+        if width // 2 >= target_width and height // 2 >= target_height:
+            params["half_size"] = True
+        else:
+            params["demosaic_algorithm"] = rawpy.DemosaicAlgorithm.LINEAR
+        return params
 
     def process_to_standard_format(
         self,
         file_path: str,
         output_format: str = "JPEG",
         resolution: Optional[tuple[int, int]] = None,
-    ) -> Optional[io.BytesIO]:
-        """Process a NEF file and return it as a standard format.
+        source: Optional[BinaryIO] = None,
+        sink: Optional[BinaryIO] = None,
+    ) -> Optional[BinaryIO]:
+        """Process a RAW file and return it as a standard format.
 
-        This method first tries to extract the embedded JPEG preview from the NEF file,
-        which is faster and doesn't require full RAW processing. If that fails,
-        it falls back to processing the RAW data.
+        This method first tries the embedded preview of the RAW file, which is
+        faster and doesn't require RAW processing. If there is none, or it is
+        smaller than the requested resolution, the RAW data is processed, only
+        as large and as carefully as the requested resolution needs.
 
         Args:
-            file_path: Path to the NEF file
+            file_path: Path to the RAW file
             output_format: Desired output format (default: "JPEG")
             resolution: Optional target resolution as (width, height) tuple
+            source: Optional already-open binary stream with the file contents
+            sink: Optional writable binary stream the encoded image is written to
 
         Returns:
-            BytesIO object containing the processed image, or None if processing fails
+            The sink, or a BytesIO positioned at the start of the encoded image
+            if no sink was given; None if processing fails
         """
         if not self._rawpy_available:
             self.logger.error(
-                "rawpy is not available for processing NEF file: %s", file_path
+                "rawpy is not available for processing RAW file: %s", file_path
             )
             return None
 
-        if not os.path.exists(file_path):
-            self.logger.error("NEF file does not exist: %s", file_path)
+        if source is None and not os.path.exists(file_path):
+            self.logger.error("RAW file does not exist: %s", file_path)
             return None
 
         try:
             import rawpy
             from PIL import Image
 
-            with rawpy.imread(file_path) as raw:
-                # First, try to extract the embedded JPEG preview
-                # This is much faster than processing the RAW data
-                try:
-                    # Try to get the embedded JPEG preview
-                    thumb = raw.extract_thumb()
-                    if thumb.format == rawpy.ThumbFormat.JPEG:
-                        # Embedded JPEG preview found
-                        preview_data = thumb.data
-                        image = Image.open(io.BytesIO(preview_data))
-                        self.logger.debug(
-                            "Extracted embedded JPEG preview from NEF file: %s",
-                            file_path,
-                        )
-                    else:
-                        # Preview is in a different format, process it
-                        image = Image.fromarray(thumb.data)
-                        self.logger.debug(
-                            "Extracted embedded preview (non-JPEG) from NEF file: %s",
-                            file_path,
-                        )
-                except Exception as preview_error:
-                    # If preview extraction fails, process the RAW data
+            with rawpy.imread(source if source is not None else file_path) as raw:
+                image = self._extract_preview(raw, file_path, resolution)
+                if image is None:
+                    params = self._postprocess_params(raw, resolution)
+                    rgb_array = raw.postprocess(**params)
+                    image = Image.fromarray(rgb_array)
                     self.logger.debug(
-                        "Could not extract preview from NEF file %s: %s. "
-                        "Processing RAW data instead.",
-                        file_path,
-                        preview_error,
+                        "Processed RAW data of file %s with %s", file_path, params
                     )
-                    # Process the RAW data with default settings
-                    rgb_array = raw.postprocess()
-                    image = Image.fromarray(rgb_array)
 
-                # Convert to the desired output format
-                output_buffer = io.BytesIO()
+                # Resize first: an embedded JPEG preview is then decoded
+                # directly at a reduced scale
+                if resolution:
+                    image = scale_image(image, resolution, logger=self.logger)
+
+                # Convert to the desired output format. The encoder writes
+                # straight to the sink, if there is one
+                output_buffer = sink if sink is not None else io.BytesIO()
                 if output_format.upper() == "JPEG":
                     # Convert RGBA to RGB if necessary for JPEG
                     if image.mode in ("RGBA", "LA", "P"):
@@ -185,51 +353,39 @@ class NEFBackend:
                     elif image.mode not in ("RGB", "L"):
                         image = image.convert("RGB")
 
-                # Resize image if resolution is specified
-                if resolution:
-                    target_width, target_height = resolution
-                    # Maintain aspect ratio
-                    original_width, original_height = image.size
-                    aspect_ratio = original_width / original_height
-                    target_aspect = target_width / target_height
-
-                    if aspect_ratio > target_aspect:
-                        # Image is wider - fit to width
-                        new_width = target_width
-                        new_height = int(target_width / aspect_ratio)
-                    else:
-                        # Image is taller - fit to height
-                        new_height = target_height
-                        new_width = int(target_height * aspect_ratio)
-
-                    image = image.resize(
-                        (new_width, new_height), Image.Resampling.LANCZOS
-                    )
-                    self.logger.debug(
-                        "Resized image to %dx%d (requested: %dx%d)",
-                        new_width,
-                        new_height,
-                        target_width,
-                        target_height,
-                    )
-
                 if output_format.upper() == "JPEG":
                     image.save(output_buffer, format="JPEG", quality=95)
                 else:
                     image.save(output_buffer, format=output_format)
 
-                output_buffer.seek(0)
-                self.logger.info("Successfully processed NEF file: %s", file_path)
+                if sink is None:
+                    output_buffer.seek(0)
+                self.logger.info("Successfully processed RAW file: %s", file_path)
                 return output_buffer
 
         except Exception as exc:
-            self.logger.error("Failed to process NEF file %s: %s", file_path, exc)
+            self.logger.error("Failed to process RAW file %s: %s", file_path, exc)
             return None
 
 
+class NEFBackend(RawBackend):
+    """Backend for processing Nikon NEF (RAW) files.
+
+    Kept for compatibility: RawBackend handles NEF files along with every other
+    RAW format.
+    """
+
+    extensions = (".nef",)
+
+
 # Backend registry
 _BACKENDS: Dict[str, Type[ImageBackend]] = {}
 
+# Shared backend instances, by class
+_INSTANCES: Dict[Type[ImageBackend], ImageBackend] = {}
+
+_entry_points_loaded = False
+
 
 def register_backend(extension: str, backend_class: Type[ImageBackend]) -> None:
     """Register an image backend for a specific file extension.
@@ -241,6 +397,69 @@ def register_backend(extension: str, backend_class: Type[ImageBackend]) -> None:
     _BACKENDS[extension.lower()] = backend_class
 
 
+def load_entry_point_backends() -> None:
+    """Register the backends provided through the photochart.backends entry points.
+
+    Called automatically on the first lookup of an extension that has no
+    registered backend (scanning the installed distributions is slow, so
+    extensions handled by the built-in backends never trigger it). Entry points
+    that fail to load are logged and skipped. Backends registered with
+    register_backend() for the same extension take precedence.
+    """
+    global _entry_points_loaded
+    _entry_points_loaded = True
+
+    from importlib.metadata import entry_points
+
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        eps = eps.select(group=BACKEND_ENTRY_POINT_GROUP)
+    else:  # Python < 3.10
+        eps = eps.get(BACKEND_ENTRY_POINT_GROUP, [])
+
+    for entry_point in eps:
+        try:
+            backend_class = entry_point.load()
+            extensions = list(getattr(backend_class, "extensions", ()))
+        except Exception as exc:
+            LOGGER.warning("Could not load image backend %s: %s", entry_point.name, exc)
+            continue
+        if not extensions:
+            LOGGER.warning(
+                "Image backend %s does not declare any extensions", entry_point.name
+            )
+        for extension in extensions:
+            _BACKENDS.setdefault(extension.lower(), backend_class)
+
+
+def _get_instance(backend_class: Type[ImageBackend]) -> ImageBackend:
+    """Get the shared instance of a backend class, creating it on first use."""
+    backend = _INSTANCES.get(backend_class)
+    if backend is None:
+        backend = _INSTANCES[backend_class] = backend_class()
+    return backend
+
+
+@lru_cache(maxsize=None)
+def _accepts_sink(backend_class: Type[ImageBackend]) -> bool:
+    """Check whether a backend class accepts the sink argument.
+
+    Backends written before the argument was added to the protocol do not.
+    """
+    import inspect
+
+    try:
+        parameters = inspect.signature(
+            backend_class.process_to_standard_format
+        ).parameters
+    except (TypeError, ValueError):
+        return False
+    return "sink" in parameters or any(
+        parameter.kind == inspect.Parameter.VAR_KEYWORD
+        for parameter in parameters.values()
+    )
+
+
 def get_backend(file_path: str) -> Optional[ImageBackend]:
     """Get the appropriate backend for a given file path.
 
@@ -248,16 +467,21 @@ def get_backend(file_path: str) -> Optional[ImageBackend]:
         file_path: Path to the image file
 
     Returns:
-        An instance of the appropriate backend, or None if no backend is available
+        The shared instance of the appropriate backend, or None if no backend
+        is available
     """
-    path = Path(file_path)
-    extension = path.suffix.lower()
-
+    extension = os.path.splitext(file_path)[1].lower()
     backend_class = _BACKENDS.get(extension)
+    if backend_class is None and not _entry_points_loaded:
+        load_entry_point_backends()
+        backend_class = _BACKENDS.get(extension)
     if backend_class is None:
         return None
 
-    backend = backend_class()
+    backend = _get_instance(backend_class)
+    supports = getattr(backend, "supports", None)
+    if supports is not None:
+        return backend if supports(extension) else None
     if backend.can_process(file_path):
         return backend
 
@@ -269,7 +493,9 @@ def process_image_file(
     output_format: str = "JPEG",
     resolution: Optional[tuple[int, int]] = None,
     logger: Logger = LOGGER,
-) -> Optional[io.BytesIO]:
+    source: Optional[BinaryIO] = None,
+    sink: Optional[BinaryIO] = None,
+) -> Optional[BinaryIO]:
     """Process an image file using the appropriate backend.
 
     This function automatically selects the correct backend based on the file extension
@@ -280,9 +506,15 @@ def process_image_file(
         output_format: Desired output format (default: "JPEG")
         resolution: Optional target resolution as (width, height) tuple
         logger: Logger instance for error reporting
+        source: Optional already-open binary stream with the file contents,
+            passed to the backend so the file is not opened again
+        sink: Optional writable, seekable binary stream (e.g., the destination
+            file). The encoded image is written to it directly; if processing
+            fails, anything written to it is truncated away.
 
     Returns:
-        BytesIO object containing the processed image, or None if processing fails
+        The sink, or a BytesIO positioned at the start of the encoded image if
+        no sink was given; None if processing fails
     """
     backend = get_backend(file_path)
     if backend is None:
@@ -290,8 +522,32 @@ def process_image_file(
         # Return None to indicate it should be handled by default methods
         return None
 
-    return backend.process_to_standard_format(file_path, output_format, resolution)
-
-
-# Register the NEF backend
-register_backend(".nef", NEFBackend)
+    if sink is None:
+        return backend.process_to_standard_format(
+            file_path, output_format, resolution, source=source
+        )
+
+    start = sink.tell()
+    if _accepts_sink(type(backend)):
+        output = backend.process_to_standard_format(
+            file_path, output_format, resolution, source=source, sink=sink
+        )
+    else:
+        # Backend without sink support: copy its buffer without another copy in memory
+        output = backend.process_to_standard_format(
+            file_path, output_format, resolution, source=source
+        )
+        if output is not None:
+            sink.write(output.getbuffer())
+            output = sink
+
+    if output is None:
+        # Drop partial output, so the caller can fall back to another encoder
+        sink.seek(start)
+        sink.truncate()
+    return output
+
+
+# Register the RAW backend for every RAW extension
+for _extension in RAW_EXTENSIONS:
+    register_backend(_extension, RawBackend)
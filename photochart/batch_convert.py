@@ -0,0 +1,251 @@
+"""Batch conversion of image files into a mirrored output tree.
+
+This module converts many files in one run: sources can be files, directories
+or glob patterns, and the directory structure below each source is mirrored
+into an output root. Outputs that are newer than their source are skipped, so
+an interrupted export can be resumed, and conversions run in a pool of worker
+processes through the same pipeline as ingestion.
+"""
+
+import os
+from logging import Logger
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .log import get_logger
+from .convert import convert_image
+from .resolution import parse_resolution
+from .sources import iter_image_sources
+
+LOGGER = get_logger(__name__)
+
+# Extension of the output files for each output format
+OUTPUT_EXTENSIONS = {
+    "JPEG": ".jpg",
+    "PNG": ".png",
+}
+
+
+def output_path_for(
+    src: str, base: str, output_root: Optional[str], extension: str
+) -> str:
+    """Get the output path of a source file.
+
+    Args:
+        src: Source file path
+        base: Directory the source is mirrored relative to
+        output_root: Output root directory, or None to write next to the source
+        extension: Extension of the output file (e.g., ".jpg")
+
+    Returns:
+        Output file path
+    """
+    if output_root is None:
+        return os.path.splitext(src)[0] + extension
+    relative_path = os.path.relpath(src, base)
+    return os.path.join(output_root, os.path.splitext(relative_path)[0] + extension)
+
+
+def plan_conversions(
+    sources: Iterable[str],
+    output_root: Optional[str] = None,
+    output_format: str = "JPEG",
+    recursive: bool = True,
+) -> Iterator[Tuple[str, str]]:
+    """Expand source arguments into (source file, output file) pairs.
+
+    - Files are converted into the output root (or next to themselves).
+    - Directories are walked, and their structure is mirrored below the output root.
+    - Glob patterns (recursive "**" included) are expanded; matched files are
+      mirrored relative to the part of the pattern before the first wildcard,
+      and only image files are kept.
+
+    Args:
+        sources: Files, directories or glob patterns
+        output_root: Output root directory, or None to write next to the sources
+        output_format: Output format (determines the output extension)
+        recursive: Whether to descend into subdirectories of directory sources
+
+    Yields:
+        Tuples of (source path, output path)
+    """
+    extension = OUTPUT_EXTENSIONS.get(output_format.upper(), ".jpg")
+    for src, base in iter_image_sources(sources, recursive):
+        yield src, output_path_for(src, base, output_root, extension)
+
+
+def is_up_to_date(src: str, dst: str) -> bool:
+    """Check whether an output file exists and is not older than its source."""
+    try:
+        return os.stat(dst).st_mtime_ns >= os.stat(src).st_mtime_ns
+    except OSError:
+        return False
+
+
+def convert_file(
+    src: str,
+    dst: str,
+    resolution: Optional[Tuple[int, int]] = None,
+    output_format: str = "JPEG",
+    logger: Logger = LOGGER,
+) -> Dict[str, Any]:
+    """Convert one file, reporting the outcome as a dictionary.
+
+    Top-level (picklable) wrapper around convert_image for run_pipeline.
+
+    Args:
+        src: Source file path
+        dst: Output file path
+        resolution: Optional target resolution as (width, height) tuple
+        output_format: Output format
+        logger: Logger instance for operation tracking
+
+    Returns:
+        Dictionary with:
+            - success: whether the file was converted
+            - errors: list of error messages
+    """
+    success = convert_image(
+        src, dst, resolution=resolution, output_format=output_format, logger=logger
+    )
+    errors = [] if success else [f"Failed to convert {src} to {dst}"]
+    return {"success": success, "errors": errors}
+
+
+def convert_images(
+    sources: Iterable[str],
+    output_root: Optional[str] = None,
+    resolution: Optional[Union[str, Tuple[int, int]]] = None,
+    output_format: str = "JPEG",
+    recursive: bool = True,
+    overwrite: bool = False,
+    workers: int = 1,
+    logger: Logger = LOGGER,
+) -> Dict[str, Any]:
+    """Convert files, directories and glob patterns into a mirrored output tree.
+
+    Outputs that already exist and are not older than their source are skipped,
+    unless overwrite is True, and so are sources that would be written over
+    themselves (already in the output format, with no output root). Other
+    source files are never overwritten: a source whose output is another,
+    older source file (e.g., "a.nef" and a camera "a.jpg") is reported as an
+    error, like sources that would be written to the same output (e.g.,
+    "a.nef" and "a.dng").
+
+    Args:
+        sources: Files, directories or glob patterns
+        output_root: Output root directory, or None to write next to the sources
+        resolution: Optional resolution (e.g., "1920x1080", "medium" or a
+            (width, height) tuple). If None, original resolution is preserved.
+        output_format: Output format ("JPEG" or "PNG")
+        recursive: Whether to descend into subdirectories of directory sources
+        overwrite: Whether to convert files whose output is up to date
+        workers: Number of worker processes (0 uses all CPUs)
+        logger: Logger instance for operation tracking
+
+    Returns:
+        Dictionary with:
+            - success: False if any file failed or no file was found
+            - found: number of source files found
+            - converted: number of files converted
+            - skipped: number of files skipped because their output is up to date,
+              or because they are their own output
+            - failed: number of files that could not be converted
+            - errors: list of error messages
+
+    Examples:
+        >>> convert_images(["shoot/"], "export/", resolution="medium", workers=0)
+        {'success': True, 'found': 412, 'converted': 412, 'skipped': 0, ...}
+    """
+    # Imported here so that planning helpers stay cheap to import
+    from tqdm import tqdm
+
+    from .pipeline import run_pipeline
+
+    result: Dict[str, Any] = {
+        "success": True,
+        "found": 0,
+        "converted": 0,
+        "skipped": 0,
+        "failed": 0,
+        "errors": [],
+    }
+
+    sources = list(sources)
+    resolution_tuple = None
+    if isinstance(resolution, str):
+        resolution_tuple = parse_resolution(resolution)
+        if resolution_tuple is None:
+            result["success"] = False
+            result["errors"].append(
+                f"Invalid resolution format: '{resolution}'. "
+                "Use format 'WIDTHxHEIGHT' or a preset name (e.g., 'low', 'medium', 'high')"
+            )
+            return result
+    elif resolution:
+        resolution_tuple = tuple(resolution)
+
+    planned = list(plan_conversions(sources, output_root, output_format, recursive))
+    source_keys = {os.path.abspath(src) for src, _ in planned}
+    tasks: List[Tuple[str, str]] = []
+    outputs: Dict[str, str] = {}
+    for src, dst in planned:
+        result["found"] += 1
+        dst_key = os.path.abspath(dst)
+        if dst_key == os.path.abspath(src):
+            # Already in the output format, where the output would be written
+            # (e.g., JPEG files of a camera folder converted without an output root)
+            result["skipped"] += 1
+            logger.debug("Skipped %s: already in the output format", src)
+            continue
+        if dst_key in outputs:
+            result["failed"] += 1
+            result["errors"].append(
+                f"Skipped {src}: {dst} is already the output of {outputs[dst_key]}"
+            )
+            continue
+        outputs[dst_key] = src
+        if dst_key in source_keys:
+            # Source files are never overwritten. An up-to-date one is the
+            # output of a previous run without an output root.
+            if not overwrite and is_up_to_date(src, dst):
+                result["skipped"] += 1
+            else:
+                result["failed"] += 1
+                result["errors"].append(
+                    f"Skipped {src}: the output would overwrite the source file {dst}"
+                )
+            continue
+        if not overwrite and is_up_to_date(src, dst):
+            result["skipped"] += 1
+            continue
+        tasks.append((src, dst))
+
+    if result["found"] == 0:
+        result["success"] = False
+        result["errors"].append("No image files found in: " + ", ".join(sources))
+        return result
+
+    with tqdm(
+        total=len(tasks),
+        desc="Converting images",
+        unit="file",
+        unit_scale=False,
+        dynamic_ncols=True,
+    ) as pbar:
+        for (src, dst), converted in run_pipeline(
+            tasks,
+            convert_file,
+            lambda task: (task[0], task[1], resolution_tuple, output_format),
+            workers=workers,
+        ):
+            pbar.set_postfix_str(os.path.basename(src)[:50], refresh=False)
+            if converted.get("success"):
+                result["converted"] += 1
+            else:
+                result["failed"] += 1
+                result["errors"].extend(converted.get("errors", []))
+            pbar.update(1)
+
+    if result["failed"]:
+        result["success"] = False
+    return result
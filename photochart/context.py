@@ -0,0 +1,145 @@
+"""Single-read file access for ingestion.
+
+This module provides an ingest context that reads a file once (memory-mapped
+when possible) and shares the same bytes between hashing, EXIF reading and
+image decoding, instead of opening the file once per step.
+"""
+
+import io
+import os
+import mmap
+from logging import Logger
+from typing import BinaryIO, Dict, Optional, Union
+
+from .log import get_logger
+from .hashing import DEFAULT_HASH_ALGORITHM, HashAlgorithm, hash_buffer
+from .hash_cache import cached_hexdigest
+
+LOGGER = get_logger(__name__)
+
+
+class IngestContext:
+    """Shared, read-once view of a file used by all per-file ingestion steps.
+
+    The file is memory-mapped on entry (falling back to a plain read for files
+    that cannot be mapped, such as empty files or some network mounts). The
+    hash is computed incrementally from the mapped bytes, and the same buffer
+    is exposed as a seekable stream for Pillow or rawpy.
+
+    Streams returned by stream() share one position, so steps using them must
+    run one after another, not concurrently.
+
+    Examples:
+        >>> with IngestContext("photo.jpg") as ctx:
+        ...     file_hash = ctx.hexdigest()
+        ...     exif = extract_exif(ctx.stream())
+    """
+
+    def __init__(self, path: str, logger: Logger = LOGGER):
+        """Initialize the context.
+
+        Args:
+            path: Path to the file
+            logger: Logger instance for error reporting
+        """
+        self.path = path
+        self.logger = logger
+        self._file: Optional[BinaryIO] = None
+        self._data: Optional[Union[mmap.mmap, bytes]] = None
+        self._hexdigests: Dict[HashAlgorithm, str] = {}
+
+    def __enter__(self) -> "IngestContext":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Open the file and map (or read) its contents.
+
+        Raises:
+            OSError: If the file cannot be opened or read
+        """
+        self._file = open(self.path, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and some filesystems cannot be memory-mapped
+            self._data = self._file.read()
+
+    def close(self) -> None:
+        """Release the mapping and close the file."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def data(self) -> Union[mmap.mmap, bytes]:
+        """The file contents as a buffer (memory map or bytes)."""
+        if self._data is None:
+            raise ValueError(f"IngestContext for {self.path} is not open")
+        return self._data
+
+    @property
+    def size(self) -> int:
+        """Size of the file in bytes."""
+        return len(self.data)
+
+    def stream(self) -> BinaryIO:
+        """Get a seekable binary stream over the file contents, rewound to the start.
+
+        Returns:
+            File-like object suitable for Image.open or rawpy.imread
+        """
+        data = self.data
+        if isinstance(data, mmap.mmap):
+            data.seek(0)
+            return data
+        return io.BytesIO(data)
+
+    def stat(self) -> os.stat_result:
+        """Get the stat of the open file without another path lookup."""
+        if self._file is None:
+            raise ValueError(f"IngestContext for {self.path} is not open")
+        return os.fstat(self._file.fileno())
+
+    def read(self) -> bytes:
+        """Get a copy of the full file contents as bytes."""
+        return bytes(self.data)
+
+    def hexdigest(
+        self, algorithm: Union[HashAlgorithm, str] = DEFAULT_HASH_ALGORITHM
+    ) -> Optional[str]:
+        """Calculate the hash of the file contents.
+
+        The digest is fed incrementally from the shared buffer and cached,
+        so calling this more than once does not re-hash the file. The
+        persistent hash cache is consulted first, so an unchanged file that
+        was hashed before is not hashed at all.
+
+        Args:
+            algorithm: Hash algorithm to use (see photochart.hashing.HashAlgorithm)
+
+        Returns:
+            Hash as a hexadecimal string, or None if hashing fails
+        """
+        algorithm = HashAlgorithm(algorithm)
+        if algorithm not in self._hexdigests:
+            try:
+                digest = cached_hexdigest(
+                    self.stat(),
+                    algorithm.value,
+                    lambda: hash_buffer(self.data, algorithm),
+                    restat=self.stat,
+                )
+                if digest is None:
+                    return None
+                self._hexdigests[algorithm] = digest
+            except Exception as exc:
+                self.logger.error("Failed to calculate hash for %s: %s", self.path, exc)
+                return None
+        return self._hexdigests[algorithm]
@@ -7,17 +7,182 @@ with support for special formats (NEF, RAW, etc.) and optional resizing.
 import os
 import io
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
 from logging import Logger
 
 from .log import get_logger
 from .protocols import cp, check_disk_space
 from .backends import process_image_file
 from .resolution import parse_resolution
+from .thumbnail import (  # noqa: F401
+    DEFAULT_RENDITION_SIZES,
+    RENDITION_QUALITY,
+    fit_resolution,
+    scale_image,
+)
 
 LOGGER = get_logger(__name__)
 
 
+def _convert_mode(image, output_format: str):
+    """Convert a PIL image to a mode the output format can store.
+
+    For JPEG, transparent images are flattened on a white background and other
+    modes are converted to RGB. Other formats are returned unchanged.
+
+    Args:
+        image: PIL Image
+        output_format: Output format (e.g., "JPEG")
+
+    Returns:
+        PIL Image in a suitable mode
+    """
+    from PIL import Image
+
+    if output_format.upper() != "JPEG":
+        return image
+    if image.mode in ("RGBA", "LA", "P"):
+        # Convert to RGB for JPEG
+        rgb_image = Image.new("RGB", image.size, (255, 255, 255))
+        if image.mode == "P":
+            image = image.convert("RGBA")
+        rgb_image.paste(image, mask=image.split()[-1] if image.mode == "RGBA" else None)
+        return rgb_image
+    if image.mode not in ("RGB", "L"):
+        return image.convert("RGB")
+    return image
+
+
+def render_image(
+    src: str,
+    resolution: Optional[Tuple[int, int]] = None,
+    output_format: str = "JPEG",
+    logger: Logger = LOGGER,
+    source: Optional[BinaryIO] = None,
+    sink: Optional[BinaryIO] = None,
+) -> BinaryIO:
+    """Render an image file into an in-memory buffer in a standard format.
+
+    Special formats (like NEF) go through the backend system; everything else
+    is decoded with PIL. When resizing, JPEGs are decoded at a reduced scale.
+    Unlike convert_image, nothing is written to disk unless a sink is given, so
+    this can be used from worker processes that hand the bytes back to the caller.
+
+    Args:
+        src: Source file path
+        resolution: Optional target resolution as (width, height) tuple
+        output_format: Output format (default: "JPEG")
+        logger: Logger instance for operation tracking
+        source: Optional already-open binary stream with the file contents
+            (e.g., from an IngestContext). If given, src is not opened again.
+        sink: Optional writable, seekable binary stream (e.g., the destination
+            file). If given, the encoder writes to it directly and the image is
+            never held in memory as a whole.
+
+    Returns:
+        The sink, or a BytesIO positioned at the start of the encoded image if
+        no sink was given
+
+    Raises:
+        Exception: If the image cannot be decoded or encoded
+    """
+    # Try to process through backend first (for special formats like NEF)
+    processed_image = process_image_file(
+        src,
+        output_format=output_format,
+        resolution=resolution,
+        logger=logger,
+        source=source,
+        sink=sink,
+    )
+    if processed_image:
+        return processed_image
+
+    # Fallback to PIL for standard formats
+    from PIL import Image
+
+    if source is not None:
+        source.seek(0)
+    with Image.open(source if source is not None else src) as image:
+        # Resize if resolution is specified. JPEGs are decoded directly at a
+        # reduced scale (see photochart.thumbnail), so this goes before any
+        # operation that loads the full image.
+        if resolution:
+            image = scale_image(image, resolution, logger=logger)
+
+        image = _convert_mode(image, output_format)
+        output_buffer = sink if sink is not None else io.BytesIO()
+        image.save(output_buffer, format=output_format, quality=95)
+
+    if sink is None:
+        output_buffer.seek(0)
+    return output_buffer
+
+
+def render_renditions(
+    src: str,
+    sizes: Iterable[int] = DEFAULT_RENDITION_SIZES,
+    output_format: str = "JPEG",
+    logger: Logger = LOGGER,
+    source: Optional[BinaryIO] = None,
+) -> Dict[int, Tuple[bytes, int, int]]:
+    """Render a ladder of renditions of an image from a single decode.
+
+    The source is decoded once, at the reduced scale needed for the largest
+    rendition (see photochart.thumbnail.scale_image). Each smaller rendition is
+    then resized from the previous one, in cascade. Images are never upscaled:
+    renditions larger than the source keep the source size.
+
+    Special formats (like NEF) go through the backend system, which renders the
+    largest rendition; the smaller ones are resized from it.
+
+    Args:
+        src: Source file path
+        sizes: Longest edge in pixels of each rendition
+        output_format: Output format (default: "JPEG")
+        logger: Logger instance for operation tracking
+        source: Optional already-open binary stream with the file contents
+            (e.g., from an IngestContext). If given, src is not opened again.
+
+    Returns:
+        Dictionary mapping each size to (encoded bytes, width, height)
+
+    Raises:
+        Exception: If the image cannot be decoded or encoded
+    """
+    from PIL import Image
+
+    sizes = sorted(set(sizes), reverse=True)
+    if not sizes:
+        return {}
+
+    processed_image = process_image_file(
+        src,
+        output_format=output_format,
+        resolution=(sizes[0], sizes[0]),
+        logger=logger,
+        source=source,
+    )
+    if processed_image is None and source is not None:
+        source.seek(0)
+
+    renditions: Dict[int, Tuple[bytes, int, int]] = {}
+    with Image.open(
+        processed_image or (source if source is not None else src)
+    ) as image:
+        current = image
+        for size in sizes:
+            if max(current.size) > size:
+                current = scale_image(current, (size, size), logger=logger)
+            current = _convert_mode(current, output_format)
+
+            output_buffer = io.BytesIO()
+            current.save(output_buffer, format=output_format, quality=RENDITION_QUALITY)
+            renditions[size] = (output_buffer.getvalue(), *current.size)
+
+    return renditions
+
+
 def convert_image(
     src: str,
     dst: str,
@@ -80,71 +245,23 @@ def convert_image(
         logger.error("Not enough disk space at destination: %s", dst_dir or ".")
         return False
 
+    # The encoder writes straight into a temporary file next to the destination,
+    # which replaces the destination only once the image is complete
+    temp_dst = dst + ".tmp"
     try:
-        # Try to process through backend first (for special formats like NEF)
-        processed_image = process_image_file(
-            src, output_format=output_format, resolution=resolution_tuple, logger=logger
-        )
-
-        if processed_image:
-            # Backend processed the image successfully
-            # Write the processed image to destination
-            with open(dst, "wb") as f:
-                f.write(processed_image.read())
-            logger.info("Successfully converted %s to %s", src, dst)
-            return True
-
-        # Fallback to PIL for standard formats
-        from PIL import Image
-
-        # Open the image
-        image = Image.open(src)
-
-        # Resize if resolution is specified
-        if resolution_tuple:
-            target_width, target_height = resolution_tuple
-            # Maintain aspect ratio
-            original_width, original_height = image.size
-            aspect_ratio = original_width / original_height
-            target_aspect = target_width / target_height
-
-            if aspect_ratio > target_aspect:
-                # Image is wider - fit to width
-                new_width = target_width
-                new_height = int(target_width / aspect_ratio)
-            else:
-                # Image is taller - fit to height
-                new_height = target_height
-                new_width = int(target_height * aspect_ratio)
-
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            logger.debug(
-                "Resized image to %dx%d (requested: %dx%d)",
-                new_width,
-                new_height,
-                target_width,
-                target_height,
+        with open(temp_dst, "wb") as f:
+            render_image(
+                src,
+                resolution=resolution_tuple,
+                output_format=output_format,
+                logger=logger,
+                sink=f,
             )
-
-        # Convert image mode for JPEG output
-        if output_format.upper() == "JPEG":
-            if image.mode in ("RGBA", "LA", "P"):
-                # Convert to RGB for JPEG
-                rgb_image = Image.new("RGB", image.size, (255, 255, 255))
-                if image.mode == "P":
-                    image = image.convert("RGBA")
-                rgb_image.paste(
-                    image, mask=image.split()[-1] if image.mode == "RGBA" else None
-                )
-                image = rgb_image
-            elif image.mode not in ("RGB", "L"):
-                image = image.convert("RGB")
-
-        # Save the image
-        image.save(dst, format=output_format, quality=95)
+        os.replace(temp_dst, dst)
         logger.info("Successfully converted %s to %s", src, dst)
         return True
-
     except Exception as exc:
         logger.error("Failed to convert %s to %s: %s", src, dst, exc)
+        if os.path.exists(temp_dst):
+            os.remove(temp_dst)
         return False
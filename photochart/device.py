@@ -1,8 +1,17 @@
+import os
+import select
 import socket
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional
 import re
 
+# Mount table of the current process (Linux)
+MOUNTS_FILE = "/proc/mounts"
+
+# Seconds between re-reads of the mount table where changes cannot be polled
+MOUNTS_REFRESH_INTERVAL = 5.0
+
 
 def unescape_mounts_path(path: str) -> str:
     """Unescape a path from /proc/mounts.
@@ -52,60 +61,240 @@ def sanitize_label(label: str) -> str:
     return label
 
 
-def get_mount_point(file_path: str) -> Optional[str]:
+class Mount(NamedTuple):
+    """An entry of the mount table."""
+
+    device: str
+    mount_point: str
+    fstype: str
+
+
+def parse_mounts(lines: Iterable[str]) -> List[Mount]:
+    """Parse lines in the /proc/mounts format.
+
+    Args:
+        lines: Lines of the mount table
+
+    Returns:
+        List of Mount entries, in the order of the table
+    """
+    mounts = []
+    for line in lines:
+        parts = line.split()
+        if len(parts) >= 2:
+            device = unescape_mounts_path(parts[0])
+            mount = unescape_mounts_path(parts[1])
+            fstype = parts[2] if len(parts) > 2 else ""
+            mounts.append(Mount(device, mount, fstype))
+    return mounts
+
+
+def _is_within(path: str, mount_point: str) -> bool:
+    """Check if an absolute path is the mount point or below it."""
+    if mount_point == "/":
+        return path.startswith("/")
+    return path == mount_point or path.startswith(mount_point.rstrip("/") + "/")
+
+
+class MountTable:
+    """Parsed mount table, indexed by the st_dev of each mount point.
+
+    The table is parsed once and only read again when it changes: on Linux
+    /proc/mounts is pollable and reports changes as an exceptional condition,
+    elsewhere it is re-read at most every MOUNTS_REFRESH_INTERVAL seconds.
+
+    Lookups use the st_dev of the file, so a path is mapped to its mount with
+    a dictionary lookup instead of comparing it with every mount point.
+
+    Examples:
+        >>> table = MountTable()
+        >>> table.mount_point_for("/media/usb/photo.jpg")
+        '/media/usb'
+    """
+
+    def __init__(self, mounts_file: str = MOUNTS_FILE):
+        """Initialize the table. The mount table is read on first use.
+
+        Args:
+            mounts_file: Path to the mount table in the /proc/mounts format
+        """
+        self.mounts_file = mounts_file
+        self._entries: List[Mount] = []
+        self._mounts: List[Mount] = []
+        self._by_dev: Dict[int, List[Mount]] = {}
+        self._file = None
+        self._poller = None
+        self._loaded_at: Optional[float] = None
+
+    def _changed(self) -> bool:
+        """Check if the mount table may have changed since it was read."""
+        if self._loaded_at is None:
+            return True
+        if self._poller is not None:
+            try:
+                return bool(self._poller.poll(0))
+            except OSError:
+                return True
+        return time.monotonic() - self._loaded_at >= MOUNTS_REFRESH_INTERVAL
+
+    def refresh(self, force: bool = False) -> None:
+        """Read the mount table again if it changed.
+
+        Args:
+            force: If True, read the mount table even if no change was detected
+        """
+        if not force and not self._changed():
+            return
+
+        try:
+            if self._file is None:
+                self._file = open(self.mounts_file, "r")
+                try:
+                    self._poller = select.poll()
+                    self._poller.register(self._file, select.POLLPRI | select.POLLERR)
+                except (AttributeError, OSError):
+                    # poll() is not available on every platform
+                    self._poller = None
+            self._file.seek(0)
+            entries = parse_mounts(self._file.read().splitlines())
+        except (OSError, IOError):
+            # Mount table not available (not Linux or permission issue)
+            entries = []
+
+        # Index the visible mount at each mount point by its st_dev. A mount
+        # point listed twice is over-mounted, and the last entry is visible.
+        visible = {mount.mount_point: mount for mount in entries}
+        by_dev: Dict[int, List[Mount]] = {}
+        for mount in visible.values():
+            try:
+                by_dev.setdefault(os.stat(mount.mount_point).st_dev, []).append(mount)
+            except OSError:
+                continue
+        for candidates in by_dev.values():
+            candidates.sort(key=lambda m: len(m.mount_point), reverse=True)
+
+        self._entries = entries
+        # Sort by mount path length (longest first) to match most specific mount
+        self._mounts = sorted(entries, key=lambda m: len(m.mount_point), reverse=True)
+        self._by_dev = by_dev
+        self._loaded_at = time.monotonic()
+
+    @property
+    def mounts(self) -> List[Mount]:
+        """Mount entries, most specific (longest mount point) first."""
+        self.refresh()
+        return self._mounts
+
+    def device_at(self, mount_point: str) -> Optional[str]:
+        """Get the device of the first entry mounted at a mount point.
+
+        Args:
+            mount_point: Mount point path
+
+        Returns:
+            Device string, or None if nothing is mounted there
+        """
+        self.refresh()
+        for mount in self._entries:
+            if mount.mount_point == mount_point:
+                return mount.device
+        return None
+
+    def mount_for(
+        self, path: str, stat_result: Optional[os.stat_result] = None
+    ) -> Optional[Mount]:
+        """Get the mount containing an absolute, resolved path.
+
+        Args:
+            path: Absolute path without symbolic links
+            stat_result: Optional stat of the path, to avoid stat-ing it again
+
+        Returns:
+            The Mount containing the path, or None if it cannot be determined
+        """
+        self.refresh()
+        if stat_result is None:
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                stat_result = None
+
+        candidates = self._by_dev.get(stat_result.st_dev) if stat_result else None
+        if candidates and len(candidates) == 1:
+            return candidates[0]
+
+        # The filesystem is mounted more than once (e.g., bind mounts), or its
+        # device differs from the mount point's (e.g., btrfs subvolumes)
+        for mount in candidates or self._mounts:
+            if _is_within(path, mount.mount_point):
+                return mount
+        return None
+
+    def mount_point_for(
+        self, path: str, stat_result: Optional[os.stat_result] = None
+    ) -> Optional[str]:
+        """Get the mount point for an absolute, resolved path.
+
+        Args:
+            path: Absolute path without symbolic links
+            stat_result: Optional stat of the path, to avoid stat-ing it again
+
+        Returns:
+            Mount point path if found, None if on root filesystem or not found
+        """
+        mount = self.mount_for(path, stat_result)
+        if mount is None or mount.mount_point == "/":
+            return None
+        return mount.mount_point
+
+    def close(self) -> None:
+        """Close the mount table file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._poller = None
+            self._loaded_at = None
+
+
+_MOUNT_TABLE: Optional[MountTable] = None
+
+
+def get_mount_table() -> MountTable:
+    """Get the mount table shared by the current process."""
+    global _MOUNT_TABLE
+    if _MOUNT_TABLE is None:
+        _MOUNT_TABLE = MountTable()
+    return _MOUNT_TABLE
+
+
+def get_mount_point(
+    file_path: str, stat_result: Optional[os.stat_result] = None
+) -> Optional[str]:
     """Get the mount point for a file path.
 
     Args:
         file_path: Path to a file
+        stat_result: Optional stat of the file. If given, file_path must be
+            absolute and resolved, and the file is not accessed again.
 
     Returns:
         Mount point path if found, None if on root filesystem or not found
     """
     try:
-        path_obj = Path(file_path)
-        if not path_obj.exists():
-            # Path doesn't exist, try to get mount point from parent directory
-            path_obj = path_obj.parent
-            while path_obj != path_obj.parent and not path_obj.exists():
-                path_obj = path_obj.parent
+        if stat_result is None:
+            path_obj = Path(file_path)
             if not path_obj.exists():
-                return None
-
-        # Resolve to absolute path
-        abs_path = path_obj.resolve()
+                # Path doesn't exist, try to get mount point from parent directory
+                path_obj = path_obj.parent
+                while path_obj != path_obj.parent and not path_obj.exists():
+                    path_obj = path_obj.parent
+                if not path_obj.exists():
+                    return None
 
-        # Read /proc/mounts to find mount points (Linux)
-        try:
-            with open("/proc/mounts", "r") as f:
-                mounts = []
-                for line in f:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        device = unescape_mounts_path(parts[0])
-                        mount = unescape_mounts_path(parts[1])
-                        fstype = parts[2] if len(parts) > 2 else ""
-                        mounts.append((device, mount, fstype))
-
-                # Sort by mount path length (longest first) to match most specific mount
-                mounts.sort(key=lambda x: len(x[1]), reverse=True)
-
-                # Find the mount point that contains our path
-                for device, mount, fstype in mounts:
-                    try:
-                        mount_path = Path(mount)
-                        if mount_path.exists() and abs_path.is_relative_to(mount_path):
-                            # return mount point if it's not the root filesystem
-                            if mount != "/":
-                                return mount
-                            return None
-                    except (ValueError, OSError):
-                        # Path comparison failed, skip
-                        continue
-        except (OSError, IOError):
-            # /proc/mounts not available (not Linux or permission issue)
-            pass
+            # Resolve to absolute path
+            file_path = str(path_obj.resolve())
 
-        return None
+        return get_mount_table().mount_point_for(file_path, stat_result)
     except Exception:
         return None
 
@@ -153,35 +342,12 @@ def get_device_name(file_path: Optional[str] = None) -> str:
         mount_point = None
         device_info = None
 
-        # Read /proc/mounts to find mount points (Linux)
-        try:
-            with open("/proc/mounts", "r") as f:
-                mounts = []
-                for line in f:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        device = unescape_mounts_path(parts[0])
-                        mount = unescape_mounts_path(parts[1])
-                        fstype = parts[2] if len(parts) > 2 else ""
-                        mounts.append((device, mount, fstype))
-
-                # Sort by mount path length (longest first) to match most specific mount
-                mounts.sort(key=lambda x: len(x[1]), reverse=True)
-
-                # Find the mount point that contains our path
-                for device, mount, fstype in mounts:
-                    try:
-                        mount_path = Path(mount)
-                        if mount_path.exists() and abs_path.is_relative_to(mount_path):
-                            mount_point = mount
-                            device_info = (device, fstype)
-                            break
-                    except (ValueError, OSError):
-                        # Path comparison failed, skip
-                        continue
-        except (OSError, IOError):
-            # /proc/mounts not available (not Linux or permission issue)
-            pass
+        # Find the mount point that contains our path
+        mount_table = get_mount_table()
+        mount = mount_table.mount_for(str(abs_path))
+        if mount is not None:
+            mount_point = mount.mount_point
+            device_info = (mount.device, mount.fstype)
 
         # If we found a mount point, try to identify the device
         if mount_point and device_info:
@@ -221,25 +387,8 @@ def get_device_name(file_path: Optional[str] = None) -> str:
                                     uuid = uuid_link.name
                                     # If mount point is /, check if it's actually the root filesystem
                                     if mount_point == "/":
-                                        # Find the actual root filesystem device from /proc/mounts
-                                        root_device = None
-                                        try:
-                                            with open("/proc/mounts", "r") as f:
-                                                for line in f:
-                                                    parts = line.split()
-                                                    if len(parts) >= 2:
-                                                        mount = unescape_mounts_path(
-                                                            parts[1]
-                                                        )
-                                                        if mount == "/":
-                                                            root_device = (
-                                                                unescape_mounts_path(
-                                                                    parts[0]
-                                                                )
-                                                            )
-                                                            break
-                                        except (OSError, IOError):
-                                            pass
+                                        # Find the actual root filesystem device
+                                        root_device = mount_table.device_at("/")
 
                                         # If this is the root filesystem device, return hostname
                                         if root_device and device == root_device:
@@ -276,19 +425,8 @@ def get_device_name(file_path: Optional[str] = None) -> str:
                 # Before using device name, check if it's the root filesystem
                 # Only do this if no label/UUID was found above
                 if mount_point == "/":
-                    # Find the actual root filesystem device from /proc/mounts
-                    root_device = None
-                    try:
-                        with open("/proc/mounts", "r") as f:
-                            for line in f:
-                                parts = line.split()
-                                if len(parts) >= 2:
-                                    mount = unescape_mounts_path(parts[1])
-                                    if mount == "/":
-                                        root_device = unescape_mounts_path(parts[0])
-                                        break
-                    except (OSError, IOError):
-                        pass
+                    # Find the actual root filesystem device
+                    root_device = mount_table.device_at("/")
 
                     # Only treat as root filesystem if this device matches the actual root device
                     if root_device and device == root_device:
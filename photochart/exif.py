@@ -6,7 +6,7 @@ optimized to read the image file only once when extracting multiple tags.
 
 from datetime import datetime
 from enum import Enum, IntEnum
-from typing import Dict, Any, Optional, List
+from typing import BinaryIO, Dict, Any, Optional, List, Union
 from pathlib import Path
 
 
@@ -27,7 +27,7 @@ class ExifTagName(str, Enum):
 
 
 def extract_exif(
-    file_path: str, tags: Optional[List[ExifTagName]] = None
+    file_path: Union[str, BinaryIO], tags: Optional[List[ExifTagName]] = None
 ) -> Dict[str, Any]:
     """Extract specified EXIF tags from an image file.
 
@@ -37,7 +37,8 @@ def extract_exif(
     - ExifTagName.MODEL: Extracts camera model (returns string)
 
     Args:
-        file_path: Path to the image file
+        file_path: Path to the image file, or a seekable binary stream with its
+            contents (e.g., from an IngestContext)
         tags: List of ExifTagName enum values to extract. If None or empty,
             extracts all supported tags.
 
@@ -0,0 +1,59 @@
+"""Image file formats recognized by PhotoChart.
+
+Kept free of Django and image libraries, so it can be imported anywhere.
+"""
+
+# Common image file extensions
+IMAGE_EXTENSIONS = {
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".bmp",
+    ".tiff",
+    ".tif",
+    ".webp",
+    ".heic",
+    ".heif",
+    ".raw",
+    ".cr2",
+    ".nef",
+    ".orf",
+    ".sr2",
+    ".arw",
+    ".dng",
+    ".raf",
+    ".rw2",
+    ".pef",
+    ".srw",
+    ".3fr",
+    ".mef",
+    ".mos",
+    ".ari",
+    ".bay",
+    ".crw",
+    ".cap",
+    ".dcs",
+    ".dcr",
+    ".drf",
+    ".eip",
+    ".erf",
+    ".fff",
+    ".iiq",
+    ".k25",
+    ".kdc",
+    ".mdc",
+    ".mrw",
+    ".nrw",
+    ".obm",
+    ".pbm",
+    ".pxn",
+    ".r3d",
+    ".raf",
+    ".rwl",
+    ".rwz",
+    ".x3f",
+    ".srf",
+    ".srw",
+    ".x3f",
+}
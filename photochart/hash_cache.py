@@ -0,0 +1,218 @@
+"""Persistent cache of file hashes.
+
+This module stores the digests computed for files in a small SQLite database,
+keyed by the identity and version of the file: (st_dev, st_ino, size, mtime_ns).
+A file that did not change since it was last hashed is then recognized from
+its stat alone, without reading it again.
+
+The cache lives in the file named by the PHOTOCHART_HASH_CACHE environment
+variable (by default ~/.cache/photochart/hashes.sqlite3). Setting the variable
+to an empty string, "0" or "off" disables it.
+"""
+
+import os
+import sqlite3
+import threading
+from logging import Logger
+from typing import Callable, Optional
+
+from .log import get_logger
+
+LOGGER = get_logger(__name__)
+
+# Environment variable with the path of the cache database
+HASH_CACHE_ENV = "PHOTOCHART_HASH_CACHE"
+
+DEFAULT_HASH_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "photochart", "hashes.sqlite3"
+)
+
+# Seconds to wait for a lock when several processes write to the cache
+HASH_CACHE_TIMEOUT = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hash (
+    st_dev INTEGER NOT NULL,
+    st_ino INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (st_dev, st_ino, algorithm)
+)
+"""
+
+
+class HashCache:
+    """SQLite-backed cache of file digests.
+
+    Entries are looked up by (st_dev, st_ino, algorithm) and only returned if
+    the stored size and mtime_ns match the current stat of the file, so a
+    modified (or replaced) file is hashed again. Every thread gets its own
+    connection; the database uses WAL mode so ingestion workers can share it.
+
+    The cache is best effort: errors are logged and treated as cache misses.
+
+    Examples:
+        >>> cache = HashCache("/tmp/hashes.sqlite3")
+        >>> stat_result = os.stat("photo.jpg")
+        >>> cache.get(stat_result, "md5") or cache.put(stat_result, "md5", digest)
+    """
+
+    def __init__(self, path: str, logger: Logger = LOGGER):
+        """Initialize the cache. The database is opened on first use.
+
+        Args:
+            path: Path to the SQLite database file
+            logger: Logger instance for error reporting
+        """
+        self.path = path
+        self.logger = logger
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the connection of the current thread, opening it if needed."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, timeout=HASH_CACHE_TIMEOUT, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(_SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def get(self, stat_result: os.stat_result, algorithm: str) -> Optional[str]:
+        """Get the cached digest of a file, if it did not change since it was hashed.
+
+        Args:
+            stat_result: Current os.stat_result of the file
+            algorithm: Hash algorithm name
+
+        Returns:
+            Hexadecimal digest, or None on a cache miss
+        """
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT hash FROM file_hash WHERE st_dev = ? AND st_ino = ? "
+                    "AND algorithm = ? AND size = ? AND mtime_ns = ?",
+                    (
+                        stat_result.st_dev,
+                        stat_result.st_ino,
+                        str(algorithm),
+                        stat_result.st_size,
+                        stat_result.st_mtime_ns,
+                    ),
+                )
+                .fetchone()
+            )
+        except (sqlite3.Error, OSError) as exc:
+            self.logger.warning("Hash cache lookup failed (%s): %s", self.path, exc)
+            return None
+        return row[0] if row else None
+
+    def put(self, stat_result: os.stat_result, algorithm: str, digest: str) -> None:
+        """Store the digest of a file.
+
+        Args:
+            stat_result: os.stat_result of the file taken before it was hashed
+            algorithm: Hash algorithm name
+            digest: Hexadecimal digest
+        """
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO file_hash "
+                "(st_dev, st_ino, algorithm, size, mtime_ns, hash) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    stat_result.st_dev,
+                    stat_result.st_ino,
+                    str(algorithm),
+                    stat_result.st_size,
+                    stat_result.st_mtime_ns,
+                    digest,
+                ),
+            )
+        except (sqlite3.Error, OSError) as exc:
+            self.logger.warning("Hash cache update failed (%s): %s", self.path, exc)
+
+    def close(self) -> None:
+        """Close the connection of the current thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+_HASH_CACHE: Optional[HashCache] = None
+_HASH_CACHE_PID: Optional[int] = None
+
+
+def get_hash_cache() -> Optional[HashCache]:
+    """Get the hash cache of the current process.
+
+    Returns:
+        The HashCache configured by PHOTOCHART_HASH_CACHE, or None if disabled
+    """
+    global _HASH_CACHE, _HASH_CACHE_PID
+
+    path = os.environ.get(HASH_CACHE_ENV, DEFAULT_HASH_CACHE_PATH)
+    if path.strip().lower() in ("", "0", "off"):
+        return None
+
+    # SQLite connections must not be shared with forked worker processes
+    pid = os.getpid()
+    if _HASH_CACHE is None or _HASH_CACHE_PID != pid or _HASH_CACHE.path != path:
+        _HASH_CACHE = HashCache(path)
+        _HASH_CACHE_PID = pid
+    return _HASH_CACHE
+
+
+def cached_hexdigest(
+    stat_result: os.stat_result,
+    algorithm: str,
+    compute: Callable[[], Optional[str]],
+    restat: Optional[Callable[[], os.stat_result]] = None,
+) -> Optional[str]:
+    """Get a file digest from the cache, computing and storing it on a miss.
+
+    Args:
+        stat_result: os.stat_result of the file, taken before it is read
+        algorithm: Hash algorithm name
+        compute: Callable without arguments returning the digest (or None on failure)
+        restat: Optional callable returning the stat of the file after it was
+            hashed. If the file changed meanwhile, the digest is not cached.
+
+    Returns:
+        Hexadecimal digest, or None if it could not be computed
+    """
+    cache = get_hash_cache()
+    if cache is None:
+        return compute()
+
+    digest = cache.get(stat_result, algorithm)
+    if digest is not None:
+        return digest
+
+    digest = compute()
+    if digest is None:
+        return None
+    if restat is not None:
+        try:
+            after = restat()
+        except OSError:
+            return digest
+        if (after.st_size, after.st_mtime_ns) != (
+            stat_result.st_size,
+            stat_result.st_mtime_ns,
+        ):
+            # Modified while it was read: the digest may not match any version
+            return digest
+    cache.put(stat_result, algorithm, digest)
+    return digest
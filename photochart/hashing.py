@@ -0,0 +1,193 @@
+"""Content hashing with a configurable algorithm.
+
+This module provides the digests used to identify photographs and to verify
+file copies. MD5 is the default, for compatibility with existing catalogs;
+BLAKE2b (standard library) and BLAKE3 (optional ``blake3`` package) are faster
+alternatives.
+
+Files are read with readinto() into a single reused MiB-sized buffer, and a
+cheap size + head/tail sample lets callers rule out different files before
+paying for a full hash.
+"""
+
+import hashlib
+import os
+from enum import Enum
+from logging import Logger
+from typing import Any, BinaryIO, Optional, Union
+
+from .log import get_logger
+
+LOGGER = get_logger(__name__)
+
+# Size of the reads (and of the slices fed to the digest) when hashing
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# Bytes read from the start and from the end of a file for the sample digest
+SAMPLE_SIZE = 64 * 1024
+
+# Digest size in bytes for BLAKE2b (hexadecimal digests of 64 characters, like BLAKE3)
+BLAKE2B_DIGEST_SIZE = 32
+
+
+class HashAlgorithm(str, Enum):
+    """Algorithms available for content hashing."""
+
+    MD5 = "md5"
+    BLAKE2B = "blake2b"
+    BLAKE3 = "blake3"
+
+
+DEFAULT_HASH_ALGORITHM = HashAlgorithm.MD5
+
+
+def new_hasher(algorithm: Union[HashAlgorithm, str] = DEFAULT_HASH_ALGORITHM) -> Any:
+    """Create a hash object for an algorithm.
+
+    Args:
+        algorithm: HashAlgorithm (or its value)
+
+    Returns:
+        Hash object with update() and hexdigest()
+
+    Raises:
+        ValueError: If the algorithm is unknown, or BLAKE3 is requested but the
+            blake3 package is not installed
+    """
+    algorithm = HashAlgorithm(algorithm)
+    if algorithm == HashAlgorithm.MD5:
+        return hashlib.md5()
+    if algorithm == HashAlgorithm.BLAKE2B:
+        return hashlib.blake2b(digest_size=BLAKE2B_DIGEST_SIZE)
+    try:
+        import blake3
+    except ImportError as exc:
+        raise ValueError(
+            "BLAKE3 hashing requires the blake3 package. "
+            "Install it with: pip install blake3"
+        ) from exc
+    return blake3.blake3()
+
+
+def hash_buffer(
+    data: Any, algorithm: Union[HashAlgorithm, str] = DEFAULT_HASH_ALGORITHM
+) -> str:
+    """Hash an in-memory buffer (bytes, bytearray, mmap, ...).
+
+    The buffer is fed to the digest in HASH_BUFFER_SIZE slices of a memoryview,
+    so it is never copied.
+
+    Args:
+        data: Object supporting the buffer protocol
+        algorithm: HashAlgorithm (or its value)
+
+    Returns:
+        Hexadecimal digest
+    """
+    hasher = new_hasher(algorithm)
+    with memoryview(data) as view:
+        for offset in range(0, len(view), HASH_BUFFER_SIZE):
+            hasher.update(view[offset : offset + HASH_BUFFER_SIZE])
+    return hasher.hexdigest()
+
+
+def hash_stream(
+    stream: BinaryIO,
+    algorithm: Union[HashAlgorithm, str] = DEFAULT_HASH_ALGORITHM,
+    buffer_size: int = HASH_BUFFER_SIZE,
+) -> str:
+    """Hash a binary stream from its current position to the end.
+
+    Args:
+        stream: Binary file-like object supporting readinto()
+        algorithm: HashAlgorithm (or its value)
+        buffer_size: Size of the reused read buffer in bytes
+
+    Returns:
+        Hexadecimal digest
+    """
+    hasher = new_hasher(algorithm)
+    buffer = bytearray(buffer_size)
+    with memoryview(buffer) as view:
+        while True:
+            size = stream.readinto(buffer)
+            if not size:
+                break
+            hasher.update(view[:size])
+    return hasher.hexdigest()
+
+
+def hash_file(
+    path: str,
+    algorithm: Union[HashAlgorithm, str] = DEFAULT_HASH_ALGORITHM,
+    buffer_size: int = HASH_BUFFER_SIZE,
+    logger: Logger = LOGGER,
+) -> Optional[str]:
+    """Hash a file.
+
+    Args:
+        path: Path to the file
+        algorithm: HashAlgorithm (or its value)
+        buffer_size: Size of the reused read buffer in bytes
+        logger: Logger instance for error reporting
+
+    Returns:
+        Hexadecimal digest, or None if hashing fails
+    """
+    try:
+        # Unbuffered, so readinto() reads straight into our buffer
+        with open(path, "rb", buffering=0) as f:
+            return hash_stream(f, algorithm, buffer_size)
+    except Exception as exc:
+        logger.error("Failed to calculate hash for %s: %s", path, exc)
+        return None
+
+
+def sample_digest(path: str, sample_size: int = SAMPLE_SIZE) -> str:
+    """Get a cheap fingerprint of a file from its size and head/tail bytes.
+
+    Files with different sample digests are certainly different; files with the
+    same sample digest are likely, but not certainly, identical and need a full
+    hash to be compared.
+
+    Args:
+        path: Path to the file
+        sample_size: Number of bytes read from the start and from the end
+
+    Returns:
+        Hexadecimal digest of the size and the sampled bytes
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        hasher.update(size.to_bytes(8, "little"))
+        hasher.update(f.read(sample_size))
+        if size > 2 * sample_size:
+            f.seek(size - sample_size)
+            hasher.update(f.read(sample_size))
+        elif size > sample_size:
+            hasher.update(f.read())
+    return hasher.hexdigest()
+
+
+def files_may_match(path_a: str, path_b: str) -> bool:
+    """Check whether two files can have the same contents, without hashing them.
+
+    Compares the sizes first and, only if they are equal, the head/tail samples.
+
+    Args:
+        path_a: Path to the first file
+        path_b: Path to the second file
+
+    Returns:
+        False if the files certainly differ, True if a full hash is needed
+
+    Raises:
+        OSError: If a file cannot be read
+    """
+    if os.path.getsize(path_a) != os.path.getsize(path_b):
+        return False
+    return sample_digest(path_a) == sample_digest(path_b)
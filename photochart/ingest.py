@@ -8,24 +8,56 @@ import os
 import socket
 import logging
 import traceback
+from collections import Counter
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Sequence, Set, Tuple
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
 from tqdm import tqdm
 
-from photochart.protocols import calculate_hash as calculate_file_hash
 from photochart.resolution import parse_resolution
+from photochart.formats import IMAGE_EXTENSIONS
 from photochart.device import get_device_name, get_mount_point
+from photochart.hashing import DEFAULT_HASH_ALGORITHM, HashAlgorithm, new_hasher
+from photochart.pipeline import (
+    BackgroundIterator,
+    process_file,
+    render_file_renditions,
+    run_pipeline,
+)
 
 try:
-    from photograph.models import PhotoPath, Photograph
+    from photograph.models import (
+        HashPolicy,
+        PhotoPath,
+        Photograph,
+        Rendition,
+        bump_catalog_generation,
+        get_hash_algorithm,
+        get_rendition_sizes,
+        refresh_timeline,
+        split_path,
+        timeline_day,
+        update_path_tree,
+    )
 
     HAS_DJANGO_BACKEND = True
 except (ImportError, ModuleNotFoundError, Exception):
+    HashPolicy = None
+    bump_catalog_generation = None
+    get_hash_algorithm = None
+    get_rendition_sizes = None
+    refresh_timeline = None
+    split_path = None
+    timeline_day = None
+    update_path_tree = None
     PhotoPath = None
     Photograph = None
+    Rendition = None
     HAS_DJANGO_BACKEND = False
 
 
@@ -107,62 +139,6 @@ def is_path_in_media_root(file_path: Path) -> bool:
         return True
 
 
-# Common image file extensions
-IMAGE_EXTENSIONS = {
-    ".jpg",
-    ".jpeg",
-    ".png",
-    ".gif",
-    ".bmp",
-    ".tiff",
-    ".tif",
-    ".webp",
-    ".heic",
-    ".heif",
-    ".raw",
-    ".cr2",
-    ".nef",
-    ".orf",
-    ".sr2",
-    ".arw",
-    ".dng",
-    ".raf",
-    ".rw2",
-    ".pef",
-    ".srw",
-    ".3fr",
-    ".mef",
-    ".mos",
-    ".ari",
-    ".bay",
-    ".crw",
-    ".cap",
-    ".dcs",
-    ".dcr",
-    ".drf",
-    ".eip",
-    ".erf",
-    ".fff",
-    ".iiq",
-    ".k25",
-    ".kdc",
-    ".mdc",
-    ".mrw",
-    ".nrw",
-    ".obm",
-    ".pbm",
-    ".pxn",
-    ".r3d",
-    ".raf",
-    ".rwl",
-    ".rwz",
-    ".x3f",
-    ".srf",
-    ".srw",
-    ".x3f",
-}
-
-
 def is_image_file(file_path: Path) -> bool:
     """Check if a file is an image based on its extension.
 
@@ -175,6 +151,97 @@ def is_image_file(file_path: Path) -> bool:
     return file_path.suffix.lower() in IMAGE_EXTENSIONS
 
 
+def _media_root_identity() -> Optional[Tuple[int, int]]:
+    """Get the (st_dev, st_ino) identity of the Django MEDIA_ROOT directory.
+
+    Returns:
+        Tuple of (device, inode), or None if MEDIA_ROOT does not exist
+    """
+    try:
+        media_stat = os.stat(settings.MEDIA_ROOT)
+    except (OSError, TypeError, ValueError):
+        return None
+    return media_stat.st_dev, media_stat.st_ino
+
+
+def iter_image_files(
+    path: str, recursive: bool = True, unreadable: Optional[List[str]] = None
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """Walk a directory and yield its image files with their stat.
+
+    Uses os.scandir, so directory entries are not stat-ed twice and only image
+    files are stat-ed at all. The stat is yielded along with the path so that
+    later steps do not need to stat the file again.
+
+    MEDIA_ROOT is pruned by comparing the (st_dev, st_ino) identity of each
+    directory with the one of MEDIA_ROOT, resolved once, so thumbnails stored in
+    MEDIA_ROOT are never re-ingested. Symbolic links to directories are not
+    followed.
+
+    Args:
+        path: Path to directory or file
+        recursive: Whether to search recursively
+        unreadable: Optional list extended with the directories that could not
+            be read (and were skipped)
+
+    Yields:
+        Tuples of (resolved absolute path, os.stat_result) for image files
+
+    Raises:
+        ValueError: If the path does not exist or is not a file/directory
+    """
+    root = os.path.realpath(path)
+
+    if os.path.isfile(root):
+        if is_image_file(Path(root)) and not is_path_in_media_root(Path(root)):
+            yield root, os.stat(root)
+        return
+    if not os.path.isdir(root):
+        raise ValueError(f"Path does not exist or is not a file/directory: {path}")
+    if is_path_in_media_root(Path(root)):
+        return
+
+    media_root = _media_root_identity()
+    directories = [root]
+    while directories:
+        directory = directories.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            # Unreadable directories are skipped, as os.walk does
+            if unreadable is not None:
+                unreadable.append(directory)
+            continue
+
+        subdirectories = []
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not recursive:
+                            continue
+                        dir_stat = entry.stat(follow_symlinks=False)
+                        if (dir_stat.st_dev, dir_stat.st_ino) == media_root:
+                            # Skip MEDIA_ROOT and all its subdirectories
+                            continue
+                        subdirectories.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                        if not entry.is_file():
+                            continue
+                        file_path = entry.path
+                        if entry.is_symlink():
+                            file_path = os.path.realpath(file_path)
+                            if is_path_in_media_root(Path(file_path)):
+                                continue
+                        yield file_path, entry.stat()
+                except OSError:
+                    # Entries that vanish or cannot be stat-ed are skipped
+                    continue
+
+        # Visit subdirectories in order, depth first
+        directories.extend(sorted(subdirectories, reverse=True))
+
+
 def get_image_files(path: str, recursive: bool = True) -> List[Path]:
     """Get all image files from a directory.
 
@@ -188,44 +255,805 @@ def get_image_files(path: str, recursive: bool = True) -> List[Path]:
     Returns:
         List of Path objects for image files (excluding those in MEDIA_ROOT)
     """
-    path_obj = Path(path)
-    image_files = []
-
-    if path_obj.is_file():
-        # Single file
-        if is_image_file(path_obj) and not is_path_in_media_root(path_obj):
-            image_files.append(path_obj)
-    elif path_obj.is_dir():
-        # Directory
-        if recursive:
-            # Recursive search
-            for root, dirs, files in os.walk(path):
-                # Skip directories that are within MEDIA_ROOT
-                root_path = Path(root)
-                if is_path_in_media_root(root_path):
-                    # Skip this directory and all subdirectories
-                    dirs[:] = []
-                    continue
+    return [Path(file_path) for file_path, _ in iter_image_files(path, recursive)]
 
-                for file in files:
-                    file_path = Path(root) / file
-                    if is_image_file(file_path) and not is_path_in_media_root(
-                        file_path
-                    ):
-                        image_files.append(file_path)
-        else:
-            # Non-recursive search
-            for file in path_obj.iterdir():
-                if (
-                    file.is_file()
-                    and is_image_file(file)
-                    and not is_path_in_media_root(file)
-                ):
-                    image_files.append(file)
+
+def _resolve_hash_algorithm(hash_algorithm: Optional[str] = None) -> str:
+    """Get the hash algorithm to use, checking that it is available.
+
+    Args:
+        hash_algorithm: Requested algorithm, or None for the configured default
+
+    Returns:
+        The algorithm name
+
+    Raises:
+        ValueError: If the algorithm is unknown or its package is not installed
+    """
+    algorithm = HashAlgorithm(hash_algorithm or get_hash_algorithm())
+    # Fail once here rather than for every file in the workers
+    new_hasher(algorithm)
+    return algorithm.value
+
+
+def _get_path_to_store(
+    file_path_str: str, stat_result: Optional[os.stat_result] = None
+) -> Tuple[str, Optional[str]]:
+    """Get the path to store for a file, relative to its mount point if any.
+
+    For files on mounted devices, the path is stored relative to the mount point.
+    For files on the root filesystem, the absolute path is stored.
+
+    Args:
+        file_path_str: Absolute path to the file
+        stat_result: Optional stat of the file (then file_path_str must be
+            resolved), so its mount is found from st_dev without accessing it
+
+    Returns:
+        Tuple of (path_to_store, mount_point). mount_point is None on the root filesystem.
+    """
+    mount_point = get_mount_point(file_path_str, stat_result)
+    if not mount_point:
+        return file_path_str, None
+
+    try:
+        return str(Path(file_path_str).relative_to(Path(mount_point))), mount_point
+    except ValueError:
+        # If relative_to fails, fall back to absolute path
+        return file_path_str, mount_point
+
+
+# Number of known paths fetched from the database per round trip
+KNOWN_PATHS_CHUNK_SIZE = 5000
+
+
+def _known_paths_queryset(device: str, prefix: Optional[str] = None):
+    """Get the PhotoPaths of a device, optionally restricted to a stored path prefix."""
+    queryset = PhotoPath.objects.filter(device=device)
+    if prefix and prefix != ".":
+        queryset = queryset.filter(
+            Q(path=prefix) | Q(path__startswith=prefix.rstrip(os.sep) + os.sep)
+        )
+    return queryset.order_by()
+
+
+def load_known_paths(device: str, prefix: Optional[str] = None) -> Set[str]:
+    """Load the stored paths of a device into memory.
+
+    Used to skip already-ingested files with a set lookup instead of one
+    query per file.
+
+    Args:
+        device: Device identifier
+        prefix: Optional stored path of the ingested directory (or file). Only
+            that path and the paths below it are loaded. If None, all paths of
+            the device are loaded.
+
+    Returns:
+        Set of stored paths
+    """
+    return set(
+        _known_paths_queryset(device, prefix)
+        .values_list("path", flat=True)
+        .iterator(chunk_size=KNOWN_PATHS_CHUNK_SIZE)
+    )
+
+
+def load_path_fingerprints(
+    device: str, prefix: Optional[str] = None
+) -> Dict[str, Tuple[int, Optional[int], Optional[datetime], bool]]:
+    """Load the stored paths of a device with their file fingerprints.
+
+    Used by incremental ingestion to detect changed and missing files.
+
+    Args:
+        device: Device identifier
+        prefix: Optional stored path of the ingested directory (or file), as in
+            load_known_paths()
+
+    Returns:
+        Dictionary mapping each stored path to a tuple of
+        (PhotoPath id, size, file_updated_at, missing)
+    """
+    return {
+        path: (photo_path_id, size, file_updated_at, missing)
+        for photo_path_id, path, size, file_updated_at, missing in (
+            _known_paths_queryset(device, prefix)
+            .values_list("id", "path", "size", "file_updated_at", "missing")
+            .iterator(chunk_size=KNOWN_PATHS_CHUNK_SIZE)
+        )
+    }
+
+
+def mark_missing(photo_path_ids: List[int]) -> int:
+    """Flag PhotoPaths whose files were not found anymore.
+
+    Args:
+        photo_path_ids: Ids of the PhotoPaths to flag
+
+    Returns:
+        Number of PhotoPaths flagged
+    """
+    now = timezone.now()
+    marked = 0
+    for start in range(0, len(photo_path_ids), KNOWN_PATHS_CHUNK_SIZE):
+        chunk = photo_path_ids[start : start + KNOWN_PATHS_CHUNK_SIZE]
+        marked += PhotoPath.objects.filter(id__in=chunk).update(
+            missing=True, updated_at=now
+        )
+    if marked:
+        bump_catalog_generation()
+    return marked
+
+
+def _apply_processed(
+    photograph: "Photograph",
+    processed: Dict[str, Any],
+    file_path_str: str,
+    store_images: bool,
+) -> bool:
+    """Fill in the EXIF data, error flag and thumbnail from the output of process_file.
+
+    Fields that are already set on the Photograph are kept. The thumbnail file
+    is written to storage, but the Photograph itself is not saved.
+
+    Args:
+        photograph: Photograph to update
+        processed: Result dictionary returned by process_file
+        file_path_str: Absolute path to the processed file
+        store_images: Whether to store the rendered thumbnail
+
+    Returns:
+        True if any field of the Photograph was changed, False otherwise
+    """
+    changed = False
+
+    # A file was found again for a photograph kept as missing
+    if photograph.missing:
+        photograph.missing = False
+        changed = True
+
+    # Set datetime if not already set
+    exif_time = processed.get("datetime")
+    if not photograph.time and exif_time:
+        photograph.time = (
+            timezone.make_aware(exif_time)
+            if timezone.is_naive(exif_time)
+            else exif_time
+        )
+        changed = True
+
+    # Set model if not already set
+    if not photograph.model and processed.get("model"):
+        photograph.model = processed["model"]
+        changed = True
+
+    if processed.get("errors") and not photograph.has_errors:
+        photograph.has_errors = True
+        changed = True
+
+    if (
+        store_images
+        and not photograph.thumbnail
+        and processed.get("thumbnail") is not None
+    ):
+        photograph.set_thumbnail_from_bytes(
+            processed["thumbnail"],
+            file_path_str,
+            extension=processed.get("thumbnail_ext"),
+            save=False,
+        )
+        changed = True
+
+    return changed
+
+
+def _store_renditions(
+    items: Iterable[Tuple[Optional["Photograph"], Optional[Dict[str, Any]]]],
+    stored_files: Optional[List[str]] = None,
+) -> int:
+    """Store the renditions rendered by process_file for saved photographs.
+
+    Sizes a photograph already has a rendition for are skipped, so a photograph
+    found through several paths gets its renditions only once.
+    Should be called inside a transaction.
+
+    Args:
+        items: Iterable of (photograph, processed) tuples. Photographs must be saved.
+        stored_files: Optional list extended with the names of the files written
+            to storage
+
+    Returns:
+        Number of renditions stored
+    """
+    wanted = [
+        (photograph, processed["renditions"])
+        for photograph, processed in items
+        if photograph is not None and processed and processed.get("renditions")
+    ]
+    if not wanted:
+        return 0
+
+    photograph_ids = list({photograph.pk for photograph, _ in wanted})
+    existing: Set[Tuple[int, int]] = set()
+    for start in range(0, len(photograph_ids), HASH_LOOKUP_CHUNK_SIZE):
+        chunk = photograph_ids[start : start + HASH_LOOKUP_CHUNK_SIZE]
+        existing.update(
+            Rendition.objects.filter(photograph_id__in=chunk).values_list(
+                "photograph_id", "size"
+            )
+        )
+
+    renditions = []
+    for photograph, rendered in wanted:
+        for size, (data, width, height) in sorted(rendered.items()):
+            if (photograph.pk, size) in existing:
+                continue
+            existing.add((photograph.pk, size))
+            rendition = Rendition.from_bytes(photograph, size, data, width, height)
+            if stored_files is not None:
+                stored_files.append(rendition.image.name)
+            renditions.append(rendition)
+
+    Rendition.objects.bulk_create(renditions)
+    if renditions:
+        bump_catalog_generation()
+    return len(renditions)
+
+
+def _delete_stored_files(storage: Any, names: Iterable[str]) -> None:
+    """Delete files from storage, ignoring the ones that cannot be deleted."""
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception:
+            pass
+
+
+def prune_photographs(photograph_ids: Iterable[int]) -> int:
+    """Remove photographs that were left without paths.
+
+    When an incremental ingest finds a changed file, its PhotoPath is linked
+    to the photograph of the new content, which can leave the previous
+    photograph without paths. Such photographs are deleted (their timeline
+    days are refreshed by the post_delete receiver of Photograph), and their
+    thumbnail and rendition files are removed from storage once the
+    transaction commits. Photographs that belong to an album are kept, so the
+    album does not lose them, and flagged as missing instead.
+    Should be called inside a transaction.
+
+    Args:
+        photograph_ids: Ids of the photographs whose paths were re-linked
+
+    Returns:
+        Number of photographs deleted
+    """
+    photograph_ids = list(set(photograph_ids))
+    orphan_ids: List[int] = []
+    for start in range(0, len(photograph_ids), HASH_LOOKUP_CHUNK_SIZE):
+        chunk = photograph_ids[start : start + HASH_LOOKUP_CHUNK_SIZE]
+        orphan_ids.extend(
+            Photograph.objects.filter(id__in=chunk, paths__isnull=True).values_list(
+                "id", flat=True
+            )
+        )
+    if not orphan_ids:
+        return 0
+
+    in_albums = set(
+        Photograph.objects.filter(id__in=orphan_ids, albums__isnull=False)
+        .values_list("id", flat=True)
+        .distinct()
+    )
+    if in_albums:
+        Photograph.objects.filter(id__in=in_albums).update(
+            missing=True, updated_at=timezone.now()
+        )
+        bump_catalog_generation()
+
+    removed = [
+        photograph_id for photograph_id in orphan_ids if photograph_id not in in_albums
+    ]
+    if not removed:
+        return 0
+    photographs = Photograph.objects.filter(id__in=removed)
+    thumbnails = [
+        name for name in photographs.values_list("thumbnail", flat=True) if name
+    ]
+    renditions = list(
+        Rendition.objects.filter(photograph_id__in=removed).values_list(
+            "image", flat=True
+        )
+    )
+    photographs.delete()
+
+    def delete_files():
+        _delete_stored_files(
+            Photograph._meta.get_field("thumbnail").storage, thumbnails
+        )
+        _delete_stored_files(Rendition._meta.get_field("image").storage, renditions)
+
+    # Files are not transactional: keep them until the deletion is committed
+    transaction.on_commit(delete_files)
+    return len(removed)
+
+
+def _link_photograph(
+    processed: Dict[str, Any],
+    file_path_str: str,
+    store_images: bool,
+) -> "Photograph":
+    """Find or create the Photograph for the output of process_file.
+
+    Fills in EXIF data and the thumbnail if they are not set yet.
+    Should be called inside a transaction.
+
+    Args:
+        processed: Result dictionary returned by process_file
+        file_path_str: Absolute path to the processed file
+        store_images: Whether to store the rendered thumbnail
+
+    Returns:
+        The saved Photograph instance
+    """
+    hash_value = processed.get("hash")
+    if hash_value:
+        photograph, _ = Photograph.objects.get_or_create(
+            hash=hash_value,
+            hash_algorithm=processed.get("hash_algorithm", DEFAULT_HASH_ALGORITHM),
+            defaults={},
+        )
     else:
-        raise ValueError(f"Path does not exist or is not a file/directory: {path}")
+        # Hash computation failed - create photograph without hash
+        photograph = Photograph.objects.create()
+
+    if _apply_processed(photograph, processed, file_path_str, store_images):
+        photograph.save()
+    return photograph
+
 
-    return image_files
+def _store_result(
+    task: Dict[str, Any],
+    processed: Optional[Dict[str, Any]],
+    device: str,
+    store_images: bool,
+) -> "PhotoPath":
+    """Apply the output of process_file to the database.
+
+    Links the Photograph for the computed hash and creates the PhotoPath (or
+    updates it, if the task has a photo_path_id). If processed is None, the
+    path is only indexed with a deferred hash.
+    Should be called inside a transaction.
+
+    Args:
+        task: Task dictionary with file_path, path_to_store, mount_point and
+            optionally photo_path_id
+        processed: Result dictionary returned by process_file, or None to defer hashing
+        device: Device identifier
+        store_images: Whether to store the rendered thumbnail
+
+    Returns:
+        The saved PhotoPath instance
+    """
+    file_path_str = task["file_path"]
+
+    previous_photograph_id = None
+    if task.get("photo_path_id"):
+        # Changed file found by an incremental ingest: its previous
+        # photograph no longer applies
+        photo_path = PhotoPath.objects.get(id=task["photo_path_id"])
+        previous_photograph_id = photo_path.photograph_id
+        photo_path.photograph = None
+        photo_path.missing = False
+    else:
+        # Store the relative path (or absolute for root filesystem)
+        # but pass the full path to save() for file access
+        photo_path = PhotoPath(path=task["path_to_store"], device=device)
+
+    if processed is None:
+        photo_path.save(
+            full_path=file_path_str if task["mount_point"] else None,
+            hash_policy=HashPolicy.DEFERRED,
+        )
+    else:
+        photo_path.photograph = _link_photograph(processed, file_path_str, store_images)
+        photo_path.save(
+            full_path=file_path_str if task["mount_point"] else None,
+            extract_exif=False,
+        )
+    if previous_photograph_id is not None:
+        prune_photographs([previous_photograph_id])
+    return photo_path
+
+
+def _check_photograph(
+    result: Dict[str, Any],
+    logger: Optional[logging.Logger],
+    photograph: Optional["Photograph"],
+    file_path_str: str,
+    processed: Dict[str, Any],
+    store_images: bool,
+) -> None:
+    """Record errors flagged on a stored Photograph and count stored images.
+
+    Args:
+        result: Result dictionary to update
+        logger: Optional logger for detailed error information
+        photograph: The Photograph linked to the processed file
+        file_path_str: Absolute path to the processed file
+        processed: Result dictionary returned by process_file
+        store_images: Whether thumbnail storage was requested
+    """
+    if not photograph:
+        return
+
+    # Check for errors that were caught during processing
+    if photograph.has_errors:
+        error_msg = (
+            f"Error processing {file_path_str}: "
+            "Photograph has_errors flag is set. "
+            "This indicates an error occurred during image processing, "
+            "EXIF extraction, or hash computation."
+        )
+        result["errors"].append(error_msg)
+
+        # Log detailed error information if logger is available
+        if logger:
+            logger.error(
+                f"Error detected for file: {file_path_str} - "
+                f"Photograph ID: {photograph.id}, "
+                f"has_errors=True. "
+                f"Details: {'; '.join(processed.get('errors', []))}",
+                extra={
+                    "file_path": file_path_str,
+                    "photograph_id": photograph.id,
+                    "has_errors": True,
+                },
+            )
+
+    # Check if image storage was requested but failed
+    if store_images:
+        if not photograph.thumbnail:
+            error_msg = (
+                f"Failed to store thumbnail for {file_path_str}: "
+                "no thumbnail could be rendered from the file."
+            )
+            result["errors"].append(error_msg)
+
+            # Log detailed error information if logger is available
+            if logger:
+                logger.warning(
+                    f"Thumbnail storage failed for file: {file_path_str}",
+                    extra={
+                        "file_path": file_path_str,
+                        "photograph_id": photograph.id,
+                    },
+                )
+        else:
+            result["images_stored"] += 1
+
+
+def _record_error(
+    result: Dict[str, Any],
+    logger: Optional[logging.Logger],
+    file_path: str,
+    exc: Exception,
+) -> None:
+    """Record an error for a file in the ingestion result and the log."""
+    result["errors"].append(f"Error processing {file_path}: {str(exc)}")
+
+    # Log detailed error information if logger is available
+    if logger:
+        logger.error(
+            f"Error processing file: {file_path}",
+            exc_info=exc,
+            extra={"file_path": file_path},
+        )
+
+
+# Number of processed files written to the database in a single transaction
+DEFAULT_BATCH_SIZE = 500
+
+# Number of hashes looked up per query, to stay below database parameter limits
+HASH_LOOKUP_CHUNK_SIZE = 500
+
+# Photograph fields that can change when an existing photograph gets a new path
+PHOTOGRAPH_UPDATE_FIELDS = [
+    "time",
+    "model",
+    "has_errors",
+    "missing",
+    "thumbnail",
+    "updated_at",
+]
+
+# PhotoPath fields refreshed when an incremental ingest finds a changed file
+PHOTO_PATH_UPDATE_FIELDS = [
+    "photograph",
+    "hash_pending",
+    "missing",
+    "size",
+    "file_created_at",
+    "file_updated_at",
+    "updated_at",
+]
+
+
+class BatchWriter:
+    """Write processed files to the database in batches.
+
+    Results from the pipeline are buffered and written with one transaction per
+    batch: existing photographs are looked up with a single query per batch,
+    new photographs and paths are inserted with bulk_create and changed ones are
+    updated with bulk_update, instead of one save() per row.
+
+    If a batch fails (e.g., a path was added concurrently), its thumbnail files
+    are removed from storage and the batch is retried one file at a time, so a
+    single bad file does not drop the rest of the batch.
+
+    Examples:
+        >>> writer = BatchWriter(result, device="laptop")
+        >>> for task, processed in run_pipeline(...):
+        ...     writer.add(task, processed)
+        >>> writer.flush()
+    """
+
+    def __init__(
+        self,
+        result: Dict[str, Any],
+        device: str,
+        store_images: bool = False,
+        calculate_hash: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Initialize the writer.
+
+        Args:
+            result: Ingestion result dictionary to update with counts and errors
+            device: Device identifier for the created paths
+            store_images: Whether to store the rendered thumbnails
+            calculate_hash: Whether computed hashes are counted in the result
+            batch_size: Number of files written per transaction
+            logger: Optional logger for detailed error information
+        """
+        self.result = result
+        self.device = device
+        self.store_images = store_images
+        self.calculate_hash = calculate_hash
+        self.batch_size = max(1, batch_size)
+        self.logger = logger
+        self._pending: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = []
+        self._renditions_stored = 0
+
+    def add(self, task: Dict[str, Any], processed: Optional[Dict[str, Any]]) -> None:
+        """Queue a processed file, writing the batch once it is full.
+
+        Args:
+            task: Task dictionary with file_path, path_to_store, mount_point and,
+                for changed files of an incremental ingest, photo_path_id
+            processed: Result dictionary returned by process_file, or None to defer hashing
+        """
+        self._pending.append((task, processed))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all queued files to the database."""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        stored_files: List[str] = []
+        try:
+            with transaction.atomic():
+                photo_paths = self._write_batch(batch, stored_files)
+        except Exception as exc:
+            # Thumbnails and renditions are written to storage outside the transaction
+            storage = Photograph._meta.get_field("thumbnail").storage
+            for name in stored_files:
+                try:
+                    storage.delete(name)
+                except Exception:
+                    pass
+            if self.logger:
+                self.logger.warning(
+                    f"Batch of {len(batch)} file(s) failed, retrying one by one: {exc}"
+                )
+            self._write_each(batch)
+            return
+
+        self.result["renditions_stored"] += self._renditions_stored
+        for (task, processed), photo_path in zip(batch, photo_paths):
+            self._count(task, processed, photo_path.photograph)
+
+    def _write_batch(
+        self,
+        batch: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]],
+        stored_files: List[str],
+    ) -> List["PhotoPath"]:
+        """Insert a batch of files. Should be called inside a transaction.
+
+        Args:
+            batch: List of (task, processed) tuples
+            stored_files: List extended with the names of thumbnail and rendition
+                files written to storage
+
+        Returns:
+            The created PhotoPath instances, in the order of the batch
+        """
+        # Look up the photographs for all hashes in the batch at once,
+        # one query per hash algorithm (and chunk of hashes)
+        hashes: Dict[str, Set[str]] = {}
+        for _, processed in batch:
+            if processed and processed.get("hash"):
+                algorithm = processed.get("hash_algorithm", DEFAULT_HASH_ALGORITHM)
+                hashes.setdefault(algorithm, set()).add(processed["hash"])
+        photographs: Dict[Tuple[str, str], "Photograph"] = {}
+        for algorithm, algorithm_hashes in hashes.items():
+            algorithm_hashes = list(algorithm_hashes)
+            for start in range(0, len(algorithm_hashes), HASH_LOOKUP_CHUNK_SIZE):
+                chunk = algorithm_hashes[start : start + HASH_LOOKUP_CHUNK_SIZE]
+                for photograph in Photograph.objects.filter(
+                    hash__in=chunk, hash_algorithm=algorithm
+                ).order_by("id"):
+                    # Keep the oldest photograph if a hash is duplicated
+                    photographs.setdefault((algorithm, photograph.hash), photograph)
+
+        new_photographs: List["Photograph"] = []
+        changed_photographs: Dict[int, "Photograph"] = {}
+        linked: List[Optional["Photograph"]] = []
+        for task, processed in batch:
+            if processed is None:
+                # Deferred hash: only index the path
+                linked.append(None)
+                continue
+
+            hash_value = processed.get("hash")
+            key = (processed.get("hash_algorithm", DEFAULT_HASH_ALGORITHM), hash_value)
+            photograph = photographs.get(key) if hash_value else None
+            if photograph is None:
+                # Files with the same hash within the batch share one new photograph
+                photograph = Photograph(hash=hash_value, hash_algorithm=key[0])
+                new_photographs.append(photograph)
+                if hash_value:
+                    photographs[key] = photograph
+
+            thumbnail_name = photograph.thumbnail.name
+            changed = _apply_processed(
+                photograph, processed, task["file_path"], self.store_images
+            )
+            if photograph.thumbnail.name != thumbnail_name:
+                stored_files.append(photograph.thumbnail.name)
+            if changed and photograph.pk:
+                changed_photographs[photograph.pk] = photograph
+            linked.append(photograph)
+
+        # bulk_update does not apply auto_now, so updated_at is set explicitly
+        now = timezone.now()
+
+        Photograph.objects.bulk_create(new_photographs)
+        if changed_photographs:
+            for photograph in changed_photographs.values():
+                photograph.updated_at = now
+            Photograph.objects.bulk_update(
+                list(changed_photographs.values()), PHOTOGRAPH_UPDATE_FIELDS
+            )
+
+        # Bulk writes do not send post_save, so the timeline is refreshed here
+        # for the days of the new photographs and the old and new days of the
+        # changed ones (see TimelineBucket)
+        timeline_days = {
+            timeline_day(photograph.time) for photograph in new_photographs
+        }
+        for photograph in changed_photographs.values():
+            new_day = timeline_day(photograph.time)
+            timeline_days.add(getattr(photograph, "_timeline_day", new_day))
+            timeline_days.add(new_day)
+            photograph._timeline_day = new_day
+        refresh_timeline(timeline_days)
+        self._renditions_stored = _store_renditions(
+            zip(linked, (processed for _, processed in batch)), stored_files
+        )
+
+        photo_paths = []
+        new_photo_paths = []
+        changed_photo_paths = []
+        for (task, processed), photograph in zip(batch, linked):
+            photo_path = PhotoPath(
+                id=task.get("photo_path_id"),
+                path=task["path_to_store"],
+                directory=split_path(task["path_to_store"])[0],
+                device=self.device,
+                photograph=photograph,
+                hash_pending=photograph is None,
+                updated_at=now,
+            )
+            if photo_path.id:
+                changed_photo_paths.append(photo_path)
+            else:
+                new_photo_paths.append(photo_path)
+            # Reuse the stat taken by the worker when the file was read,
+            # or by the walker for deferred hashes
+            stat_result = processed.get("stat") if processed else None
+            if stat_result is None:
+                stat_result = task.get("stat")
+            if stat_result is None:
+                try:
+                    stat_result = os.stat(task["file_path"])
+                except OSError:
+                    stat_result = None
+            if stat_result is not None:
+                photo_path.set_file_stat(stat_result)
+            photo_paths.append(photo_path)
+
+        PhotoPath.objects.bulk_create(new_photo_paths)
+        # bulk_create does not send post_save: count the new paths in the
+        # directory tree here (see PathNode)
+        update_path_tree(
+            Counter(photo_path.directory for photo_path in new_photo_paths)
+        )
+        if changed_photo_paths:
+            # Changed files of an incremental ingest may leave their previous
+            # photographs without paths
+            changed_ids = [photo_path.id for photo_path in changed_photo_paths]
+            previous_photograph_ids: Set[int] = set()
+            for start in range(0, len(changed_ids), HASH_LOOKUP_CHUNK_SIZE):
+                previous_photograph_ids.update(
+                    PhotoPath.objects.filter(
+                        id__in=changed_ids[start : start + HASH_LOOKUP_CHUNK_SIZE]
+                    )
+                    .exclude(photograph=None)
+                    .values_list("photograph_id", flat=True)
+                )
+            PhotoPath.objects.bulk_update(changed_photo_paths, PHOTO_PATH_UPDATE_FIELDS)
+            prune_photographs(previous_photograph_ids)
+        # Nor do bulk writes invalidate cached API responses
+        bump_catalog_generation()
+        return photo_paths
+
+    def _write_each(
+        self, batch: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]
+    ) -> None:
+        """Write a batch one file per transaction, recording per-file errors."""
+        for task, processed in batch:
+            try:
+                with transaction.atomic():
+                    photo_path = _store_result(
+                        task, processed, self.device, self.store_images
+                    )
+                    renditions_stored = _store_renditions(
+                        [(photo_path.photograph, processed)]
+                    )
+            except Exception as e:
+                _record_error(self.result, self.logger, task["file_path"], e)
+                continue
+            self.result["renditions_stored"] += renditions_stored
+            self._count(task, processed, photo_path.photograph)
+
+    def _count(
+        self,
+        task: Dict[str, Any],
+        processed: Optional[Dict[str, Any]],
+        photograph: Optional["Photograph"],
+    ) -> None:
+        """Update the result counts for a written file."""
+        if task.get("photo_path_id"):
+            self.result["updated"] += 1
+        if processed is None:
+            self.result["hashes_deferred"] += 1
+        else:
+            if self.calculate_hash and processed.get("hash"):
+                self.result["hashes_calculated"] += 1
+            _check_photograph(
+                self.result,
+                self.logger,
+                photograph,
+                task["file_path"],
+                processed,
+                self.store_images,
+            )
+        self.result["count"] += 1
 
 
 def ingest_photos(
@@ -236,6 +1064,12 @@ def ingest_photos(
     device: Optional[str] = None,
     store_images: bool = False,
     log_path: Optional[str] = None,
+    workers: int = 1,
+    defer_hash: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    incremental: bool = False,
+    hash_algorithm: Optional[str] = None,
+    rendition_sizes: Optional[Sequence[int]] = None,
 ) -> Dict[str, Any]:
     """Ingest photos from a directory and store them in the database.
 
@@ -246,8 +1080,18 @@ def ingest_photos(
     4. Optionally stores image files in the database
     5. Creates PhotoPath models (which automatically create/link Photograph models)
 
-    Each photo is persisted to the database immediately after processing to avoid
-    creating orphaned files in the media directory if the process is aborted.
+    Processed photos are persisted in batches of batch_size files, each in its own
+    transaction. If the process is aborted, at most the current batch is lost
+    (thumbnails already written for it may be left in the media directory).
+
+    The CPU-bound work per file (hashing, EXIF reading, decoding and resizing)
+    can run in a pool of worker processes, while the calling thread is the single
+    writer applying the results to the database.
+
+    Already-ingested paths are skipped. In incremental mode, their size and
+    modification time are compared with the stored values instead: changed
+    files are hashed and thumbnailed again, and stored paths below the ingested
+    directory that no longer exist are flagged as missing.
 
     Args:
         path: Path to directory or file to ingest
@@ -263,20 +1107,42 @@ def ingest_photos(
             specified, images will be resized accordingly.
         log_path: Optional path to log file where detailed error information will be written.
             If provided, all errors will be logged with full traceback information.
+        workers: Number of worker processes for per-file processing. 1 processes
+            files in the calling process; 0 uses all available CPUs.
+        defer_hash: If True, only index the paths without reading the files.
+            Hashing, EXIF extraction and image storage happen later through
+            hash_pending_paths().
+        batch_size: Number of processed files written to the database per
+            transaction, using bulk inserts.
+        incremental: If True, re-process known paths whose file changed and flag
+            known paths whose file is gone, instead of skipping all known paths.
+        hash_algorithm: Hash algorithm ('md5', 'blake2b' or 'blake3'). Defaults
+            to the PHOTOCHART_HASH_ALGORITHM setting.
+        rendition_sizes: Optional sizes (longest edge in pixels) of the renditions
+            to store for new photographs (e.g., get_rendition_sizes()). All
+            sizes are rendered from a single decode of each file.
 
     Returns:
         Dictionary with:
             - success: bool indicating if ingestion was successful
             - count: number of photos ingested
             - hashes_calculated: number of hashes calculated
+            - hashes_deferred: number of paths queued for deferred hashing
             - images_stored: number of images stored (if store_images=True)
+            - renditions_stored: number of renditions stored
+            - updated: number of known paths re-processed because their file changed
+            - missing: number of known paths flagged as missing
             - errors: list of error messages
     """
     result = {
         "success": True,
         "count": 0,
         "hashes_calculated": 0,
+        "hashes_deferred": 0,
         "images_stored": 0,
+        "renditions_stored": 0,
+        "updated": 0,
+        "missing": 0,
         "errors": [],
     }
 
@@ -293,7 +1159,9 @@ def ingest_photos(
         logger.info(f"Starting photo ingestion from: {path}")
         logger.info(
             f"Parameters: resolution={resolution}, calculate_hash={calculate_hash}, "
-            f"recursive={recursive}, store_images={store_images}"
+            f"recursive={recursive}, store_images={store_images}, workers={workers}, "
+            f"defer_hash={defer_hash}, batch_size={batch_size}, incremental={incremental}, "
+            f"hash_algorithm={hash_algorithm}, rendition_sizes={rendition_sizes}"
         )
 
     try:
@@ -302,6 +1170,8 @@ def ingest_photos(
         if device is None:
             device = get_device_name(path)
 
+        hash_algorithm = _resolve_hash_algorithm(hash_algorithm)
+
         # Parse resolution if provided
         resolution_tuple: Optional[Tuple[int, int]] = None
         if resolution:
@@ -313,208 +1183,512 @@ def ingest_photos(
                 )
                 # Continue anyway, just without resolution processing
 
-        # Get all image files
-        image_files = get_image_files(path, recursive=recursive)
+        # Known paths are loaded once per mount point; the ingested directory's
+        # own mount only needs the paths below it. Incremental ingestion also
+        # loads the stored fingerprints, and removes each path found on disk
+        # so that the remaining ones are the missing files.
+        load_known = load_path_fingerprints if incremental else load_known_paths
+        root_path_to_store, root_mount_point = _get_path_to_store(
+            str(Path(path).resolve())
+        )
+        known_paths = {root_mount_point: load_known(device, root_path_to_store)}
+
+        def _pending_tasks():
+            """Yield files that still need processing, skipping known ones."""
+            # Files in MEDIA_ROOT were already pruned by the walker
+            seen_paths: Set[str] = set()
+            for file_path_str, file_stat in image_files:
+                # Symbolic links resolve to a file that may be walked as well
+                if file_path_str in seen_paths:
+                    _advance()
+                    continue
+                seen_paths.add(file_path_str)
+
+                try:
+                    path_to_store, mount_point = _get_path_to_store(
+                        file_path_str, file_stat
+                    )
+
+                    if mount_point not in known_paths:
+                        # Files on a mount nested below the ingested directory
+                        known_paths[mount_point] = load_known(device)
+
+                    task = {
+                        "file_path": file_path_str,
+                        "path_to_store": path_to_store,
+                        "mount_point": mount_point,
+                        "stat": file_stat,
+                    }
+
+                    if incremental:
+                        known = known_paths[mount_point].pop(path_to_store, None)
+                        if known is not None:
+                            photo_path_id, size, file_updated_at, missing = known
+                            # Skip if the file did not change since it was stored
+                            if not missing and (
+                                size,
+                                file_updated_at,
+                            ) == PhotoPath.stat_fingerprint(file_stat):
+                                _advance()
+                                continue
+                            task["photo_path_id"] = photo_path_id
+                    # Check if PhotoPath already exists for this path and device
+                    elif path_to_store in known_paths[mount_point]:
+                        # Skip if already exists
+                        _advance()
+                        continue
+
+                    yield task
+                except Exception as e:
+                    _record_error(result, logger, file_path_str, e)
+                    _advance()
+
+        def _advance():
+            """Count a file as processed, out of the files discovered so far."""
+            pbar.total = image_files.produced
+            pbar.update(1)
+
+        # The directory walk runs in a background thread and feeds the pipeline
+        # through a bounded queue, so processing starts right away. The progress
+        # bar shows processed vs discovered files, as the total is not known
+        # until the walk finishes.
+        unreadable_dirs: List[str] = []
+        image_files = BackgroundIterator(
+            iter_image_files(path, recursive=recursive, unreadable=unreadable_dirs)
+        )
+        pbar = tqdm(
+            desc="Ingesting photos",
+            unit="file",
+            unit_scale=False,
+            dynamic_ncols=True,
+            bar_format=(
+                "{desc}: {n_fmt} processed / {total_fmt} discovered "
+                "[{elapsed}, {rate_fmt}{postfix}]"
+            ),
+        )
+        with image_files, pbar:
+            # Hashing, EXIF reading and thumbnail rendering run in the pipeline
+            # (in worker processes if workers > 1); this loop is the single writer.
+            # With deferred hashing, files are only indexed and never read.
+            if defer_hash:
+                processed_results = ((task, None) for task in _pending_tasks())
+            else:
+                processed_results = run_pipeline(
+                    _pending_tasks(),
+                    process_file,
+                    lambda task: (
+                        task["file_path"],
+                        resolution_tuple,
+                        store_images,
+                        hash_algorithm,
+                        rendition_sizes,
+                    ),
+                    workers=workers,
+                )
 
-        if not image_files:
+            writer = BatchWriter(
+                result,
+                device,
+                store_images=store_images,
+                calculate_hash=calculate_hash,
+                batch_size=batch_size,
+                logger=logger,
+            )
+            try:
+                for task, processed in processed_results:
+                    # Update progress bar description with current file name
+                    pbar.set_postfix_str(
+                        os.path.basename(task["file_path"])[:50], refresh=False
+                    )
+                    writer.add(task, processed)
+                    _advance()
+            finally:
+                # Write what was processed so far, even if the walk failed
+                writer.flush()
+
+        for directory in unreadable_dirs:
+            result["errors"].append(f"Could not read directory: {directory}")
+            if logger:
+                logger.warning(f"Skipped unreadable directory: {directory}")
+
+        if incremental:
+            # Known paths below the ingested directory that were not found,
+            # except below directories that could not be read
+            root_dir = "" if root_path_to_store == "." else root_path_to_store
+            unreadable_prefixes = []
+            for directory in unreadable_dirs:
+                dir_to_store, mount_point = _get_path_to_store(directory)
+                if mount_point != root_mount_point:
+                    continue
+                # The mount point itself is stored as "."
+                unreadable_prefixes.append(
+                    "" if dir_to_store == "." else dir_to_store.rstrip(os.sep) + os.sep
+                )
+            result["missing"] = mark_missing(
+                [
+                    photo_path_id
+                    for stored_path, (photo_path_id, _, _, missing) in known_paths[
+                        root_mount_point
+                    ].items()
+                    if not missing
+                    and (
+                        recursive
+                        or stored_path == root_dir
+                        or os.path.dirname(stored_path) == root_dir
+                    )
+                    and not stored_path.startswith(tuple(unreadable_prefixes))
+                ]
+            )
+        elif image_files.produced == 0:
+            # An incremental ingest of an emptied directory only flags its
+            # known paths as missing
             result["errors"].append(f"No image files found in: {path}")
             result["success"] = False
             return result
 
-        # Process each image file with progress bar
-        # Use tqdm to show progress across all files (including nested ones) in a single bar
+        if result["errors"]:
+            # Some errors occurred but we may have processed some files
+            if result["count"] == 0:
+                result["success"] = False
+
+    except Exception as e:
+        result["success"] = False
+        error_msg = f"Error during ingestion: {str(e)}"
+        result["errors"].append(error_msg)
+
+        # Log detailed error information if logger is available
+        if logger:
+            logger.critical(
+                f"Critical error during ingestion: {error_msg}",
+                exc_info=True,
+                extra={"ingestion_path": path},
+            )
+
+    # Log completion summary if logger is available
+    if logger:
+        logger.info(
+            f"Ingestion completed. Success: {result['success']}, "
+            f"Count: {result['count']}, Errors: {len(result['errors'])}"
+        )
+
+    return result
+
+
+# Number of queued paths loaded from the database at a time
+PENDING_HASH_CHUNK_SIZE = 1000
+
+
+def hash_pending_paths(
+    resolution: Optional[str] = None,
+    store_images: bool = False,
+    limit: Optional[int] = None,
+    log_path: Optional[str] = None,
+    workers: int = 1,
+    hash_algorithm: Optional[str] = None,
+    rendition_sizes: Optional[Sequence[int]] = None,
+) -> Dict[str, Any]:
+    """Hash paths from the deferred-hash queue and link them to photographs.
+
+    Paths indexed with a deferred hash (see ingest_photos(defer_hash=True)) are
+    read, hashed and linked to a new or existing Photograph, with EXIF data and
+    optionally a stored image. This can run later or in the background, using
+    the same worker pipeline and single writer as ingest_photos.
+
+    Args:
+        resolution: Optional resolution for stored images (explicit or preset name)
+        store_images: Whether to store image files in the Photograph's thumbnail field
+        limit: Optional maximum number of queued paths to process
+        log_path: Optional path to log file where detailed error information will be written
+        workers: Number of worker processes for per-file processing. 1 processes
+            files in the calling process; 0 uses all available CPUs.
+        hash_algorithm: Hash algorithm ('md5', 'blake2b' or 'blake3'). Defaults
+            to the PHOTOCHART_HASH_ALGORITHM setting.
+        rendition_sizes: Optional sizes (longest edge in pixels) of the renditions
+            to store for new photographs
+
+    Returns:
+        Dictionary with:
+            - success: bool indicating if hashing was successful
+            - count: number of paths linked to a photograph
+            - hashes_calculated: number of hashes calculated
+            - images_stored: number of images stored (if store_images=True)
+            - renditions_stored: number of renditions stored
+            - errors: list of error messages
+    """
+    result = {
+        "success": True,
+        "count": 0,
+        "hashes_calculated": 0,
+        "images_stored": 0,
+        "renditions_stored": 0,
+        "errors": [],
+    }
+
+    if not HAS_DJANGO_BACKEND:
+        raise ImportError(
+            "Django backend models not available.\n "
+            "Please, run using the Django shell:\n"
+            "`python manage.py shell [-i ipython]`"
+        )
+
+    logger = _setup_logger(log_path)
+    if logger:
+        logger.info("Starting deferred hashing")
+
+    resolution_tuple: Optional[Tuple[int, int]] = None
+    if resolution:
+        resolution_tuple = parse_resolution(resolution)
+        if resolution_tuple is None:
+            result["errors"].append(
+                f"Invalid resolution format: '{resolution}'. "
+                "Use format 'WIDTHxHEIGHT' or a preset name (e.g., 'low', 'medium', 'high')"
+            )
+
+    try:
+        hash_algorithm = _resolve_hash_algorithm(hash_algorithm)
+
+        # Snapshot the queue by id, since processed rows leave it while we iterate
+        queue = PhotoPath.objects.pending_hash().order_by("id")
+        if limit:
+            queue = queue[:limit]
+        pending_ids = list(queue.values_list("id", flat=True))
+
+        def _queued_tasks():
+            """Yield queued paths whose files can be located."""
+            for start in range(0, len(pending_ids), PENDING_HASH_CHUNK_SIZE):
+                chunk = pending_ids[start : start + PENDING_HASH_CHUNK_SIZE]
+                for photo_path in PhotoPath.objects.filter(id__in=chunk).order_by("id"):
+                    full_path = photo_path.get_full_path()
+                    if not full_path or not os.path.exists(full_path):
+                        _record_error(
+                            result,
+                            logger,
+                            photo_path.path,
+                            FileNotFoundError(f"File not found on {photo_path.device}"),
+                        )
+                        pbar.update(1)
+                        continue
+                    yield {"photo_path": photo_path, "file_path": full_path}
+
         with tqdm(
-            total=len(image_files),
-            desc="Ingesting photos",
+            total=len(pending_ids),
+            desc="Hashing queued paths",
             unit="file",
             unit_scale=False,
             dynamic_ncols=True,
         ) as pbar:
-            for file_path in image_files:
-                # Use a transaction per file to ensure each file is persisted immediately
-                # This prevents orphaned files in the media directory if the process is aborted
+            for task, processed in run_pipeline(
+                _queued_tasks(),
+                process_file,
+                lambda task: (
+                    task["file_path"],
+                    resolution_tuple,
+                    store_images,
+                    hash_algorithm,
+                    rendition_sizes,
+                ),
+                workers=workers,
+            ):
+                file_path_str = task["file_path"]
+                photo_path = task["photo_path"]
+                pbar.set_postfix_str(
+                    os.path.basename(file_path_str)[:50], refresh=False
+                )
+
                 try:
                     with transaction.atomic():
-                        file_path_str = str(file_path.resolve())
+                        photo_path.photograph = _link_photograph(
+                            processed, file_path_str, store_images
+                        )
+                        photo_path.save(
+                            full_path=file_path_str,
+                            extract_exif=False,
+                            update_fields=[
+                                "photograph",
+                                "hash_pending",
+                                "file_created_at",
+                                "file_updated_at",
+                                "size",
+                                "updated_at",
+                            ],
+                        )
+                        renditions_stored = _store_renditions(
+                            [(photo_path.photograph, processed)]
+                        )
 
-                        # Safety check: Never ingest files from MEDIA_ROOT
-                        # This prevents loops where thumbnails stored in MEDIA_ROOT would be re-ingested
-                        if is_path_in_media_root(file_path):
-                            # Skip this file silently - it's in the media directory
-                            pbar.update(1)
-                            continue
+                    result["renditions_stored"] += renditions_stored
+                    if processed.get("hash"):
+                        result["hashes_calculated"] += 1
+                    _check_photograph(
+                        result,
+                        logger,
+                        photo_path.photograph,
+                        file_path_str,
+                        processed,
+                        store_images,
+                    )
+                    result["count"] += 1
+                except Exception as e:
+                    _record_error(result, logger, file_path_str, e)
 
-                        # Update progress bar description with current file name
-                        pbar.set_postfix_str(
-                            os.path.basename(file_path_str)[:50], refresh=False
-                        )
+                pbar.update(1)
 
-                        # For files on mounted devices, store path relative to mount point
-                        # For files on root filesystem, store absolute path
-                        mount_point = get_mount_point(file_path_str)
-                        if mount_point:
-                            # Calculate relative path from mount point
-                            mount_path = Path(mount_point)
-                            file_path_obj = Path(file_path_str)
-                            try:
-                                path_to_store = str(
-                                    file_path_obj.relative_to(mount_path)
-                                )
-                            except ValueError:
-                                # If relative_to fails, fall back to absolute path
-                                path_to_store = file_path_str
-                        else:
-                            # On root filesystem, store absolute path
-                            path_to_store = file_path_str
-
-                        # Check if PhotoPath already exists for this path and device
-                        existing_path = PhotoPath.objects.filter(
-                            path=path_to_store, device=device
-                        ).first()
-
-                        if existing_path:
-                            # Skip if already exists
-                            pbar.update(1)
-                            continue
+        if result["errors"] and result["count"] == 0 and pending_ids:
+            result["success"] = False
 
-                        # If hash calculation is requested, do it before creating PhotoPath
-                        # This way the Photograph will be created with the hash
-                        photograph = None
-                        if calculate_hash:
-                            hash_value = calculate_file_hash(file_path_str)
-                            if hash_value:
-                                # Check if Photograph with this hash exists
-                                photograph, created = Photograph.objects.get_or_create(
-                                    hash=hash_value, defaults={}
-                                )
-                                result["hashes_calculated"] += 1
-
-                        # Create PhotoPath
-                        # Note: The save() method will automatically create/link Photograph
-                        # if the file exists and no photograph is set. If we already have
-                        # a photograph (from hash calculation), it will be used.
-                        # We store the relative path (or absolute for root filesystem)
-                        # but need to pass the full path to save() for file access
-                        photo_path = PhotoPath(
-                            path=path_to_store,
-                            device=device,
-                            photograph=photograph,
-                        )
+    except Exception as e:
+        result["success"] = False
+        error_msg = f"Error during deferred hashing: {str(e)}"
+        result["errors"].append(error_msg)
+        if logger:
+            logger.critical(error_msg, exc_info=True)
 
-                        # Set file size if file exists
-                        if os.path.exists(file_path_str):
-                            try:
-                                photo_path.size = os.path.getsize(file_path_str)
-                            except (OSError, ValueError):
-                                # If we can't get file size, leave it as None
-                                pass
+    if logger:
+        logger.info(
+            f"Deferred hashing completed. Success: {result['success']}, "
+            f"Count: {result['count']}, Errors: {len(result['errors'])}"
+        )
 
-                        # Pass the full path for file access, but store the relative path
-                        photo_path.save(
-                            store_image=store_images,
-                            resolution=resolution,
-                            full_path=file_path_str if mount_point else None,
-                        )
+    return result
 
-                        # Refresh photograph from database to get latest has_errors value
-                        # (it may have been set in a transaction)
-                        if photo_path.photograph:
-                            photo_path.photograph.refresh_from_db()
-
-                        # Check for errors that were silently caught in model methods
-                        if photo_path.photograph and photo_path.photograph.has_errors:
-                            error_msg = (
-                                f"Error processing {file_path_str}: "
-                                "Photograph has_errors flag is set. "
-                                "This indicates an error occurred during image processing, "
-                                "EXIF extraction, or hash computation."
-                            )
-                            result["errors"].append(error_msg)
-
-                            # Log detailed error information if logger is available
-                            if logger:
-                                logger.error(
-                                    f"Error detected for file: {file_path_str} - "
-                                    f"Photograph ID: {photo_path.photograph.id}, "
-                                    f"has_errors=True. "
-                                    f"This error was caught silently in model methods. "
-                                    f"Possible causes: EXIF extraction failure, "
-                                    f"hash computation failure, or image processing error.",
-                                    extra={
-                                        "file_path": file_path_str,
-                                        "photograph_id": photo_path.photograph.id,
-                                        "has_errors": True,
-                                    },
-                                )
-
-                        # Check if image storage was requested but failed
-                        if store_images and photo_path.photograph:
-                            if not photo_path.photograph.thumbnail:
-                                error_msg = (
-                                    f"Failed to store thumbnail for {file_path_str}: "
-                                    "get_image_from_file() returned False or no thumbnail was created."
-                                )
-                                result["errors"].append(error_msg)
-
-                                # Log detailed error information if logger is available
-                                if logger:
-                                    logger.warning(
-                                        f"Thumbnail storage failed for file: {file_path_str}",
-                                        extra={
-                                            "file_path": file_path_str,
-                                            "photograph_id": photo_path.photograph.id,
-                                        },
-                                    )
-
-                        # Count images stored if requested
-                        if (
-                            store_images
-                            and photo_path.photograph
-                            and photo_path.photograph.thumbnail
-                        ):
-                            result["images_stored"] += 1
 
-                        result["count"] += 1
-                        # Transaction commits here automatically when exiting the context
+# Number of photographs loaded from the database at a time when rendering renditions
+RENDITION_CHUNK_SIZE = 500
+
+
+def generate_renditions(
+    sizes: Optional[Sequence[int]] = None,
+    replace: bool = False,
+    limit: Optional[int] = None,
+    log_path: Optional[str] = None,
+    workers: int = 1,
+) -> Dict[str, Any]:
+    """Render the rendition ladder for photographs that are already ingested.
+
+    Photographs missing any of the sizes are rendered from the first of their
+    paths found on disk, so changing PHOTOCHART_RENDITION_SIZES does not require
+    re-ingesting. Rendering runs in the same worker pipeline as ingest_photos,
+    with the calling thread as the single writer.
+
+    Args:
+        sizes: Sizes (longest edge in pixels) of the renditions. Defaults to the
+            PHOTOCHART_RENDITION_SIZES setting.
+        replace: If True, render all photographs and replace their existing
+            renditions of these sizes
+        limit: Optional maximum number of photographs to process
+        log_path: Optional path to log file where detailed error information will be written
+        workers: Number of worker processes for rendering. 1 processes files in
+            the calling process; 0 uses all available CPUs.
+
+    Returns:
+        Dictionary with:
+            - success: bool indicating if rendering was successful
+            - count: number of photographs processed
+            - renditions_stored: number of renditions stored
+            - errors: list of error messages
+    """
+    result = {
+        "success": True,
+        "count": 0,
+        "renditions_stored": 0,
+        "errors": [],
+    }
+
+    if not HAS_DJANGO_BACKEND:
+        raise ImportError(
+            "Django backend models not available.\n "
+            "Please, run using the Django shell:\n"
+            "`python manage.py shell [-i ipython]`"
+        )
+
+    logger = _setup_logger(log_path)
+    sizes = tuple(sorted(set(sizes or get_rendition_sizes())))
+    if logger:
+        logger.info(f"Starting rendition generation: sizes={sizes}, replace={replace}")
+
+    try:
+        queue = Photograph.objects.order_by("id")
+        if not replace:
+            queue = queue.annotate(
+                rendition_count=Count(
+                    "renditions", filter=Q(renditions__size__in=sizes)
+                )
+            ).filter(rendition_count__lt=len(sizes))
+        if limit:
+            queue = queue[:limit]
+        photograph_ids = list(queue.values_list("id", flat=True))
+
+        def _rendition_tasks():
+            """Yield photographs with a source file that can be located."""
+            for start in range(0, len(photograph_ids), RENDITION_CHUNK_SIZE):
+                chunk = photograph_ids[start : start + RENDITION_CHUNK_SIZE]
+                for photograph in (
+                    Photograph.objects.filter(id__in=chunk)
+                    .prefetch_related("paths")
+                    .order_by("id")
+                ):
+                    for photo_path in photograph.paths.all():
+                        full_path = photo_path.get_full_path()
+                        if full_path and os.path.exists(full_path):
+                            yield {"photograph": photograph, "file_path": full_path}
+                            break
+                    else:
+                        _record_error(
+                            result,
+                            logger,
+                            str(photograph),
+                            FileNotFoundError("No path of the photograph was found"),
+                        )
                         pbar.update(1)
 
-                except Exception as e:
-                    error_msg = f"Error processing {file_path}: {str(e)}"
-                    result["errors"].append(error_msg)
+        with tqdm(
+            total=len(photograph_ids),
+            desc="Rendering renditions",
+            unit="photo",
+            unit_scale=False,
+            dynamic_ncols=True,
+        ) as pbar:
+            for task, processed in run_pipeline(
+                _rendition_tasks(),
+                render_file_renditions,
+                lambda task: (task["file_path"], sizes),
+                workers=workers,
+            ):
+                file_path_str = task["file_path"]
+                pbar.set_postfix_str(
+                    os.path.basename(file_path_str)[:50], refresh=False
+                )
 
-                    # Log detailed error information if logger is available
+                for error in processed.get("errors", []):
+                    result["errors"].append(error)
                     if logger:
-                        logger.error(
-                            f"Error processing file: {file_path}",
-                            exc_info=True,
-                            extra={"file_path": str(file_path)},
-                        )
+                        logger.error(error)
+                if processed.get("renditions"):
+                    try:
+                        with transaction.atomic():
+                            created = task["photograph"].set_renditions(
+                                processed["renditions"], replace=replace
+                            )
+                        result["renditions_stored"] += len(created)
+                        result["count"] += 1
+                    except Exception as e:
+                        _record_error(result, logger, file_path_str, e)
 
-                    pbar.update(1)
-                    # Continue processing other files
+                pbar.update(1)
 
-        if result["errors"]:
-            # Some errors occurred but we may have processed some files
-            if result["count"] == 0:
-                result["success"] = False
+        if result["errors"] and result["count"] == 0 and photograph_ids:
+            result["success"] = False
 
     except Exception as e:
         result["success"] = False
-        error_msg = f"Error during ingestion: {str(e)}"
+        error_msg = f"Error during rendition generation: {str(e)}"
         result["errors"].append(error_msg)
-
-        # Log detailed error information if logger is available
         if logger:
-            logger.critical(
-                f"Critical error during ingestion: {error_msg}",
-                exc_info=True,
-                extra={"ingestion_path": path},
-            )
+            logger.critical(error_msg, exc_info=True)
 
-    # Log completion summary if logger is available
     if logger:
         logger.info(
-            f"Ingestion completed. Success: {result['success']}, "
+            f"Rendition generation completed. Success: {result['success']}, "
             f"Count: {result['count']}, Errors: {len(result['errors'])}"
         )
 
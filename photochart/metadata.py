@@ -1,12 +1,17 @@
 """Metadata extraction utilities for image files.
 
 This module provides functions to extract comprehensive metadata from image files,
-including EXIF data, RAW image metadata, and file information.
+including EXIF data, RAW image metadata, and file information. A projection of
+fields (e.g., "exif.Model") restricts extraction to what is needed, and
+iter_metadata extracts the metadata of many files with a pool of workers.
 """
 
+import json
+import math
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, FrozenSet, Iterable, Iterator, Optional
 from logging import Logger
 
 from .log import get_logger
@@ -14,17 +19,83 @@ from .backends import get_backend
 
 LOGGER = get_logger(__name__)
 
+# Metadata categories, in output order
+METADATA_CATEGORIES = ("file", "image", "exif", "raw")
 
-def extract_metadata(file_path: str, logger: Logger = LOGGER) -> Dict[str, Any]:
+# EXIF tags holding the offset of the Exif and GPS sub-IFDs
+EXIF_IFD_TAG = 0x8769
+GPS_IFD_TAG = 0x8825
+
+# Fields projection: category -> names of the fields to keep (None keeps all)
+Projection = Dict[str, Optional[FrozenSet[str]]]
+
+
+def parse_fields(fields: Iterable[str]) -> Projection:
+    """Parse a fields projection.
+
+    Each field is either a category ("exif") or a category and a key separated
+    by a dot ("exif.Model", "file.size", "image.size").
+
+    Args:
+        fields: Field names
+
+    Returns:
+        Dictionary mapping each requested category to the set of requested
+        keys, or to None if the whole category is requested
+
+    Raises:
+        ValueError: If a field does not start with a known category
+
+    Examples:
+        >>> parse_fields(["file", "exif.Model", "exif.DateTimeOriginal"])
+        {'file': None, 'exif': frozenset({'Model', 'DateTimeOriginal'})}
+    """
+    keys: Dict[str, Optional[set]] = {}
+    for field in fields:
+        category, _, key = field.strip().partition(".")
+        if category not in METADATA_CATEGORIES:
+            raise ValueError(
+                f"Unknown metadata field '{field}': fields must start with one of "
+                + ", ".join(METADATA_CATEGORIES)
+            )
+        if not key:
+            keys[category] = None
+        elif category not in keys:
+            keys[category] = {key}
+        elif keys[category] is not None:
+            keys[category].add(key)
+    return {
+        category: None if names is None else frozenset(names)
+        for category, names in keys.items()
+    }
+
+
+def _project(values: Dict[str, Any], keys: Optional[FrozenSet[str]]) -> Dict[str, Any]:
+    """Keep the requested keys of a metadata category (missing keys are None)."""
+    if keys is None:
+        return values
+    return {key: values.get(key) for key in sorted(keys)}
+
+
+def extract_metadata(
+    file_path: str, logger: Logger = LOGGER, fields: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
     """Extract all available metadata from an image file.
 
     This function extracts metadata from both standard image formats (JPEG, PNG, etc.)
     and RAW formats (NEF, CR2, etc.). It returns a comprehensive dictionary with
     all available metadata including EXIF data, file information, and RAW-specific data.
 
+    With a fields projection, only the requested categories and keys are
+    returned, and only the work they need is done: the file is not opened for
+    file fields, RAW files are only opened with rawpy for raw fields, and only
+    the requested EXIF tags are decoded.
+
     Args:
         file_path: Path to the image file
         logger: Logger instance for error reporting
+        fields: Optional fields projection (see parse_fields), e.g.
+            ["file.size", "exif.Model"]. If None, everything is extracted.
 
     Returns:
         Dictionary containing all available metadata, organized by category:
@@ -32,17 +103,23 @@ def extract_metadata(file_path: str, logger: Logger = LOGGER) -> Dict[str, Any]:
         - exif: EXIF metadata (if available)
         - raw: RAW-specific metadata (if applicable)
         - image: Image properties (dimensions, format, mode, etc.)
+        With a projection, only the requested categories are present, and
+        requested keys that are not available are None.
+
+    Raises:
+        ValueError: If fields contains an unknown category
 
     Examples:
         >>> metadata = extract_metadata("photo.jpg")
         >>> print(metadata["exif"]["DateTimeOriginal"])
         '2023:12:25 14:30:00'
+        >>> extract_metadata("photo.jpg", fields=["exif.Model"])
+        {'exif': {'Model': 'NIKON D750'}}
     """
+    projection = parse_fields(fields) if fields is not None else None
+    categories = METADATA_CATEGORIES if projection is None else tuple(projection)
     metadata: Dict[str, Any] = {
-        "file": {},
-        "exif": {},
-        "raw": {},
-        "image": {},
+        category: {} for category in METADATA_CATEGORIES if category in categories
     }
 
     if not os.path.exists(file_path):
@@ -50,40 +127,62 @@ def extract_metadata(file_path: str, logger: Logger = LOGGER) -> Dict[str, Any]:
         return metadata
 
     # Extract file system metadata
-    path = Path(file_path)
-    stat = os.stat(file_path)
-    metadata["file"] = {
-        "path": str(path.absolute()),
-        "name": path.name,
-        "extension": path.suffix.lower(),
-        "size": stat.st_size,
-        "size_mb": round(stat.st_size / (1024 * 1024), 2),
-        "created": stat.st_ctime,
-        "modified": stat.st_mtime,
-    }
+    if "file" in categories:
+        path = Path(file_path)
+        stat = os.stat(file_path)
+        metadata["file"] = {
+            "path": str(path.absolute()),
+            "name": path.name,
+            "extension": path.suffix.lower(),
+            "size": stat.st_size,
+            "size_mb": round(stat.st_size / (1024 * 1024), 2),
+            "created": stat.st_ctime,
+            "modified": stat.st_mtime,
+        }
 
     # Try to extract metadata using backend first (for RAW files)
-    backend = get_backend(file_path)
-    if backend:
-        raw_metadata = _extract_raw_metadata(file_path, logger)
-        if raw_metadata:
-            metadata["raw"] = raw_metadata
+    if "raw" in categories:
+        backend = get_backend(file_path)
+        if backend:
+            raw_metadata = _extract_raw_metadata(
+                file_path,
+                logger,
+                keys=projection["raw"] if projection is not None else None,
+            )
+            if raw_metadata:
+                metadata["raw"] = raw_metadata
 
     # Extract standard image metadata using PIL
-    pil_metadata = _extract_pil_metadata(file_path, logger)
-    if pil_metadata:
-        metadata["image"].update(pil_metadata.get("image", {}))
-        metadata["exif"].update(pil_metadata.get("exif", {}))
+    if "image" in categories or "exif" in categories:
+        pil_metadata = _extract_pil_metadata(
+            file_path,
+            logger,
+            exif_tags=projection.get("exif") if projection is not None else None,
+            include_exif="exif" in categories,
+        )
+        if pil_metadata:
+            if "image" in categories:
+                metadata["image"].update(pil_metadata.get("image", {}))
+            if "exif" in categories:
+                metadata["exif"].update(pil_metadata.get("exif", {}))
+
+    if projection is not None:
+        for category, keys in projection.items():
+            metadata[category] = _project(metadata[category], keys)
 
     return metadata
 
 
-def _extract_raw_metadata(file_path: str, logger: Logger = LOGGER) -> Dict[str, Any]:
+def _extract_raw_metadata(
+    file_path: str, logger: Logger = LOGGER, keys: Optional[FrozenSet[str]] = None
+) -> Dict[str, Any]:
     """Extract metadata from RAW image files using rawpy.
 
     Args:
         file_path: Path to the RAW image file
         logger: Logger instance for error reporting
+        keys: Optional keys to extract. The embedded thumbnail is only
+            extracted if "thumbnail" is requested (or all keys are).
 
     Returns:
         Dictionary containing RAW-specific metadata, or empty dict if extraction fails
@@ -124,7 +223,7 @@ def _extract_raw_metadata(file_path: str, logger: Logger = LOGGER) -> Dict[str,
                 raw_metadata["camera_color_matrix"] = raw.camera_color_matrix.tolist()
 
             # Extract EXIF data from RAW file
-            if hasattr(raw, "extract_thumb"):
+            if hasattr(raw, "extract_thumb") and (keys is None or "thumbnail" in keys):
                 try:
                     thumb = raw.extract_thumb()
                     raw_metadata["thumbnail"] = {
@@ -148,12 +247,49 @@ def _extract_raw_metadata(file_path: str, logger: Logger = LOGGER) -> Dict[str,
     return raw_metadata
 
 
-def _extract_pil_metadata(file_path: str, logger: Logger = LOGGER) -> Dict[str, Any]:
+def _decode_value(value: Any) -> Any:
+    """Convert bytes metadata values to strings."""
+    if isinstance(value, bytes):
+        try:
+            return value.decode("utf-8", errors="ignore")
+        except Exception:
+            return f"<binary data: {len(value)} bytes>"
+    return value
+
+
+@lru_cache(maxsize=None)
+def _exif_tag_ids() -> Dict[str, int]:
+    """Map EXIF tag names to tag IDs (the reverse of PIL.ExifTags.TAGS)."""
+    from PIL.ExifTags import TAGS
+
+    return {name: tag_id for tag_id, name in TAGS.items()}
+
+
+def _gps_data(exif_data: Any) -> Dict[Any, Any]:
+    """Decode the GPS sub-IFD of an Exif object, naming its tags."""
+    from PIL.ExifTags import GPSTAGS
+
+    gps_info = exif_data.get_ifd(GPS_IFD_TAG)
+    return {GPSTAGS.get(tag_id, tag_id): value for tag_id, value in gps_info.items()}
+
+
+def _extract_pil_metadata(
+    file_path: str,
+    logger: Logger = LOGGER,
+    exif_tags: Optional[FrozenSet[str]] = None,
+    include_exif: bool = True,
+) -> Dict[str, Any]:
     """Extract metadata from standard image files using PIL/Pillow.
 
+    EXIF tags are read from the main IFD and from the Exif sub-IFD (where e.g.
+    DateTimeOriginal and ExposureTime live).
+
     Args:
         file_path: Path to the image file
         logger: Logger instance for error reporting
+        exif_tags: Optional names of the EXIF tags (or image info keys) to
+            extract. Only these tags are looked up and decoded.
+        include_exif: Whether to extract EXIF data at all
 
     Returns:
         Dictionary containing image and EXIF metadata, or empty dict if extraction fails
@@ -162,7 +298,7 @@ def _extract_pil_metadata(file_path: str, logger: Logger = LOGGER) -> Dict[str,
 
     try:
         from PIL import Image
-        from PIL.ExifTags import TAGS, GPSTAGS
+        from PIL.ExifTags import TAGS
 
         with Image.open(file_path) as img:
             # Extract basic image properties
@@ -173,42 +309,145 @@ def _extract_pil_metadata(file_path: str, logger: Logger = LOGGER) -> Dict[str,
                 "has_transparency": img.mode in ("RGBA", "LA", "P"),
             }
 
-            # Extract EXIF data
+            if not include_exif:
+                return metadata
+
             exif_data = img.getexif()
+            if exif_tags is not None:
+                # Look up only the requested tags
+                tag_ids = _exif_tag_ids()
+                exif_ifd = None
+                for tag_name in exif_tags:
+                    tag_id = tag_ids.get(tag_name)
+                    if tag_id == GPS_IFD_TAG:
+                        if tag_id in exif_data:
+                            metadata["exif"][tag_name] = _gps_data(exif_data)
+                    elif tag_id is not None and tag_id in exif_data:
+                        metadata["exif"][tag_name] = _decode_value(exif_data[tag_id])
+                    elif tag_id is not None and EXIF_IFD_TAG in exif_data:
+                        if exif_ifd is None:
+                            exif_ifd = exif_data.get_ifd(EXIF_IFD_TAG)
+                        if tag_id in exif_ifd:
+                            metadata["exif"][tag_name] = _decode_value(exif_ifd[tag_id])
+                    if tag_name not in metadata["exif"] and tag_name in img.info:
+                        metadata["exif"][tag_name] = _decode_value(img.info[tag_name])
+                return metadata
+
+            # Extract EXIF data
             if exif_data:
-                # Standard EXIF tags
-                for tag_id, value in exif_data.items():
+                # Standard EXIF tags, then the Exif sub-IFD
+                tags = dict(exif_data.items())
+                if EXIF_IFD_TAG in exif_data:
+                    tags.update(exif_data.get_ifd(EXIF_IFD_TAG))
+                for tag_id, value in tags.items():
                     tag_name = TAGS.get(tag_id, tag_id)
-                    # Convert bytes to string if necessary
-                    if isinstance(value, bytes):
-                        try:
-                            value = value.decode("utf-8", errors="ignore")
-                        except Exception:
-                            value = f"<binary data: {len(value)} bytes>"
-                    metadata["exif"][tag_name] = value
+                    metadata["exif"][tag_name] = _decode_value(value)
 
                 # Extract GPS data if available
-                if 34853 in exif_data:  # GPSInfo tag
-                    gps_info = exif_data[34853]
-                    gps_data = {}
-                    for tag_id, value in gps_info.items():
-                        tag_name = GPSTAGS.get(tag_id, tag_id)
-                        gps_data[tag_name] = value
-                    metadata["exif"]["GPSInfo"] = gps_data
+                if GPS_IFD_TAG in exif_data:
+                    metadata["exif"]["GPSInfo"] = _gps_data(exif_data)
 
             # Try to get additional metadata
             if hasattr(img, "info"):
                 for key, value in img.info.items():
                     if key not in metadata["exif"]:
-                        # Convert bytes to string if necessary
-                        if isinstance(value, bytes):
-                            try:
-                                value = value.decode("utf-8", errors="ignore")
-                            except Exception:
-                                value = f"<binary data: {len(value)} bytes>"
-                        metadata["exif"][key] = value
+                        metadata["exif"][key] = _decode_value(value)
 
     except Exception as exc:
         logger.warning("Failed to extract PIL metadata from %s: %s", file_path, exc)
 
     return metadata
+
+
+def _json_default(value: Any) -> Any:
+    """Convert metadata values that json cannot serialize."""
+    if isinstance(value, bytes):
+        return _decode_value(value)
+    if hasattr(value, "numerator") and hasattr(value, "denominator"):
+        # EXIF rationals (PIL.TiffImagePlugin.IFDRational)
+        try:
+            number = float(value)
+        except (ZeroDivisionError, ValueError):
+            return None
+        return number if math.isfinite(number) else None
+    return str(value)
+
+
+def metadata_to_json(record: Dict[str, Any]) -> str:
+    """Serialize a metadata record as a single line of JSON.
+
+    EXIF rationals become numbers (None if undefined) and other values that
+    JSON cannot represent become strings.
+
+    Args:
+        record: Metadata dictionary (e.g., from extract_metadata)
+
+    Returns:
+        JSON string without newlines
+    """
+    return json.dumps(record, default=_json_default, ensure_ascii=False)
+
+
+def extract_metadata_record(
+    file_path: str, fields: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """Extract the metadata of a file as a record with its path.
+
+    Top-level (picklable) wrapper around extract_metadata for run_pipeline.
+
+    Args:
+        file_path: Path to the image file
+        fields: Optional fields projection (see parse_fields)
+
+    Returns:
+        Dictionary with the file path under "path" and the metadata categories
+    """
+    record: Dict[str, Any] = {"path": file_path}
+    record.update(extract_metadata(file_path, fields=fields))
+    return record
+
+
+def iter_metadata(
+    sources: Iterable[str],
+    fields: Optional[Iterable[str]] = None,
+    recursive: bool = True,
+    workers: int = 1,
+) -> Iterator[Dict[str, Any]]:
+    """Extract the metadata of files, directories and glob patterns.
+
+    Records are yielded as soon as they are extracted; with several workers
+    they are not in a stable order.
+
+    Args:
+        sources: Files, directories or glob patterns
+        fields: Optional fields projection (see parse_fields)
+        recursive: Whether to descend into subdirectories of directory sources
+        workers: Number of worker processes (0 uses all CPUs)
+
+    Yields:
+        Metadata records (see extract_metadata_record). If extraction failed
+        in a worker, the record has the path and an "errors" list.
+
+    Raises:
+        ValueError: If fields contains an unknown category
+
+    Examples:
+        >>> for record in iter_metadata(["/mnt/drive"], ["file.size", "exif.Model"]):
+        ...     print(metadata_to_json(record))
+        {"path": "/mnt/drive/a.jpg", "file": {"size": 1843}, "exif": {"Model": "D750"}}
+    """
+    from .pipeline import run_pipeline
+    from .sources import iter_image_sources
+
+    if fields is not None:
+        # Validate before starting, and send plain lists to the workers
+        fields = list(fields)
+        parse_fields(fields)
+
+    paths = (path for path, _ in iter_image_sources(sources, recursive))
+    for path, record in run_pipeline(
+        paths, extract_metadata_record, lambda path: (path, fields), workers=workers
+    ):
+        if "path" not in record:
+            record = {"path": path, **record}
+        yield record
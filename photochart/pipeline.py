@@ -0,0 +1,356 @@
+"""Per-file processing pipeline for photo ingestion.
+
+This module holds the CPU-bound part of ingestion: hashing, EXIF reading,
+decoding and thumbnail rendering. It does not depend on Django, so its
+functions can run in worker processes while a single writer applies the
+results to the database.
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from logging import Logger
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .log import get_logger
+from .context import IngestContext
+from .backends import process_image_file
+from .convert import render_image, render_renditions
+from .hashing import DEFAULT_HASH_ALGORITHM
+
+LOGGER = get_logger(__name__)
+
+# Number of tasks kept in flight per worker, so that workers never starve
+# while the writer is busy but finished thumbnails do not pile up in memory
+TASKS_PER_WORKER = 4
+
+# Default number of items a BackgroundIterator may produce ahead of its consumer
+BACKGROUND_QUEUE_SIZE = 10000
+
+
+def render_thumbnail(
+    file_path: str,
+    context: IngestContext,
+    resolution: Optional[Tuple[int, int]] = None,
+    logger: Logger = LOGGER,
+    sink: Optional[BinaryIO] = None,
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """Render the thumbnail bytes for a file from an open ingest context.
+
+    Special formats (like NEF) are processed through their backend. Standard
+    formats are resized only if a resolution is given; otherwise the original
+    bytes are kept as they are.
+
+    Args:
+        file_path: Path to the image file (used for backend selection and logging)
+        context: Open IngestContext for the file
+        resolution: Optional target resolution as (width, height) tuple
+        logger: Logger instance for error reporting
+        sink: Optional writable, seekable binary stream. If given, the thumbnail
+            is written to it directly instead of being returned as bytes.
+
+    Returns:
+        Tuple of (encoded bytes, extension). The bytes are None if a sink was
+        given. The extension is ".jpg" for re-encoded images and None when the
+        original bytes are kept.
+
+    Raises:
+        Exception: If the image cannot be decoded or encoded
+    """
+    if resolution:
+        processed_image = render_image(
+            file_path,
+            resolution=resolution,
+            logger=logger,
+            source=context.stream(),
+            sink=sink,
+        )
+        return (None if sink is not None else processed_image.getvalue()), ".jpg"
+
+    processed_image = process_image_file(
+        file_path, logger=logger, source=context.stream(), sink=sink
+    )
+    if processed_image:
+        return (None if sink is not None else processed_image.getvalue()), ".jpg"
+
+    # Standard format without resizing: keep the original bytes
+    if sink is not None:
+        # Written straight from the memory map
+        sink.write(context.data)
+        return None, None
+    return context.read(), None
+
+
+def process_file(
+    file_path: str,
+    resolution: Optional[Tuple[int, int]] = None,
+    store_image: bool = False,
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM.value,
+    rendition_sizes: Optional[Sequence[int]] = None,
+    logger: Logger = LOGGER,
+) -> Dict[str, Any]:
+    """Run the expensive per-file ingestion steps without touching the database.
+
+    Args:
+        file_path: Absolute path to the image file
+        resolution: Optional target resolution as (width, height) tuple for the
+            thumbnail
+        store_image: Whether to render the thumbnail bytes
+        hash_algorithm: Hash algorithm to use (see photochart.hashing.HashAlgorithm)
+        rendition_sizes: Optional sizes (longest edge in pixels) of the
+            renditions to render
+        logger: Logger instance for error reporting
+
+    Returns:
+        Dictionary with:
+            - file_path: the processed path
+            - hash: hash of the file, or None if hashing failed
+            - hash_algorithm: the algorithm used for hash
+            - datetime: photograph time from EXIF, or None
+            - model: camera model from EXIF, or None
+            - thumbnail: encoded thumbnail bytes, or None
+            - thumbnail_ext: extension for the thumbnail (None keeps the original)
+            - renditions: dictionary mapping each rendition size to
+              (JPEG bytes, width, height); empty if none were requested
+            - stat: os.stat_result of the file, or None if it could not be read
+            - errors: list of error messages for steps that failed
+    """
+    result: Dict[str, Any] = {
+        "file_path": file_path,
+        "stat": None,
+        "hash": None,
+        "hash_algorithm": hash_algorithm,
+        "datetime": None,
+        "model": None,
+        "thumbnail": None,
+        "thumbnail_ext": None,
+        "renditions": {},
+        "errors": [],
+    }
+
+    try:
+        context = IngestContext(file_path, logger=logger)
+        context.open()
+    except Exception as exc:
+        result["errors"].append(f"Could not read {file_path}: {exc}")
+        return result
+
+    # Every step below reads from the same buffer, so the file is read only once
+    with context:
+        result["stat"] = context.stat()
+        result["hash"] = context.hexdigest(hash_algorithm)
+        if not result["hash"]:
+            result["errors"].append(f"Hash computation failed for {file_path}")
+
+        try:
+            from .exif import extract_exif, ExifTagName
+
+            exif_data = extract_exif(
+                context.stream(), [ExifTagName.DATETIME, ExifTagName.MODEL]
+            )
+            result["datetime"] = exif_data.get(ExifTagName.DATETIME.value)
+            result["model"] = exif_data.get(ExifTagName.MODEL.value)
+        except Exception as exc:
+            result["errors"].append(f"EXIF extraction failed for {file_path}: {exc}")
+
+        if store_image:
+            try:
+                result["thumbnail"], result["thumbnail_ext"] = render_thumbnail(
+                    file_path, context, resolution=resolution, logger=logger
+                )
+            except Exception as exc:
+                result["errors"].append(
+                    f"Image processing failed for {file_path}: {exc}"
+                )
+
+        if rendition_sizes:
+            try:
+                result["renditions"] = render_renditions(
+                    file_path, rendition_sizes, logger=logger, source=context.stream()
+                )
+            except Exception as exc:
+                result["errors"].append(
+                    f"Rendition rendering failed for {file_path}: {exc}"
+                )
+
+    return result
+
+
+def render_file_renditions(
+    file_path: str,
+    rendition_sizes: Sequence[int],
+    logger: Logger = LOGGER,
+) -> Dict[str, Any]:
+    """Render the renditions of a file, without hashing or reading EXIF data.
+
+    Used to add renditions to photographs that are already ingested.
+
+    Args:
+        file_path: Absolute path to the image file
+        rendition_sizes: Sizes (longest edge in pixels) of the renditions
+        logger: Logger instance for error reporting
+
+    Returns:
+        Dictionary with:
+            - file_path: the processed path
+            - renditions: dictionary mapping each rendition size to
+              (JPEG bytes, width, height)
+            - errors: list of error messages for steps that failed
+    """
+    result: Dict[str, Any] = {"file_path": file_path, "renditions": {}, "errors": []}
+    try:
+        with IngestContext(file_path, logger=logger) as context:
+            result["renditions"] = render_renditions(
+                file_path, rendition_sizes, logger=logger, source=context.stream()
+            )
+    except Exception as exc:
+        result["errors"].append(f"Rendition rendering failed for {file_path}: {exc}")
+    return result
+
+
+def run_pipeline(
+    tasks: Iterable[Any],
+    func: Callable[..., Dict[str, Any]],
+    args: Callable[[Any], tuple],
+    workers: int = 1,
+) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    """Run a processing function over tasks, optionally in a process pool.
+
+    With a single worker everything runs in the calling thread. Otherwise the
+    function runs in a pool of processes and results are yielded as they
+    complete, so the caller (the single database writer) can apply them while
+    the workers keep going. Only a bounded number of tasks are in flight at once.
+
+    Args:
+        tasks: Iterable of task objects
+        func: Picklable top-level function to run for each task
+        args: Callable mapping a task to the positional arguments for func
+        workers: Number of worker processes (0 uses all CPUs)
+
+    Yields:
+        Tuples of (task, result). If func raised in a worker, result is
+        a dictionary with a single "errors" entry describing the failure.
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        for task in tasks:
+            yield task, func(*args(task))
+        return
+
+    window = workers * TASKS_PER_WORKER
+    task_iter = iter(tasks)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        exhausted = False
+        while pending or not exhausted:
+            # Keep the pool fed up to the window size
+            while not exhausted and len(pending) < window:
+                try:
+                    task = next(task_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[pool.submit(func, *args(task))] = task
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    result = {"errors": [f"Worker failed: {exc}"]}
+                yield task, result
+
+
+class BackgroundIterator:
+    """Consume an iterable in a background thread through a bounded queue.
+
+    Used to start processing files while the directory walk is still running:
+    the walk runs ahead of the pipeline, but never by more than maxsize items,
+    so memory stays bounded on very large trees. Exceptions raised by the
+    iterable are re-raised in the consuming thread.
+
+    Attributes:
+        produced: Number of items taken from the iterable so far
+        done: True once the iterable is exhausted (or failed)
+
+    Examples:
+        >>> with BackgroundIterator(iter_image_files(path)) as files:
+        ...     for file_path, file_stat in files:
+        ...         print(f"{file_path} ({files.produced} found so far)")
+    """
+
+    _END = object()
+
+    def __init__(self, iterable: Iterable[Any], maxsize: int = BACKGROUND_QUEUE_SIZE):
+        """Start consuming the iterable.
+
+        Args:
+            iterable: Iterable to consume in the background
+            maxsize: Maximum number of items buffered ahead of the consumer
+        """
+        self.produced = 0
+        self.done = False
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, args=(iterable,), daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        """Put an item in the queue, giving up if the consumer closed it."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, iterable: Iterable[Any]) -> None:
+        try:
+            for item in iterable:
+                self.produced += 1
+                if not self._put(item):
+                    return
+        except BaseException as exc:
+            self._error = exc
+        finally:
+            self.done = True
+            self._put(self._END)
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            item = self._queue.get()
+            if item is self._END:
+                break
+            yield item
+        if self._error is not None:
+            raise self._error
+
+    def close(self) -> None:
+        """Stop the background thread, discarding items not consumed yet."""
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self) -> "BackgroundIterator":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -14,41 +14,58 @@ Key features:
 
 import os
 import shutil
-import hashlib
 from logging import Logger
-from typing import Optional
+from typing import Optional, Union
 
 from .log import get_logger
+from .hashing import DEFAULT_HASH_ALGORITHM, HashAlgorithm, files_may_match, hash_file
+from .hash_cache import cached_hexdigest
 
 LOGGER = get_logger(__name__)
 
 
-def calculate_hash(path: str, logger: Logger = LOGGER) -> Optional[str]:
-    """Calculate MD5 hash of a file for integrity checking.
+def calculate_hash(
+    path: str,
+    logger: Logger = LOGGER,
+    algorithm: Union[HashAlgorithm, str] = DEFAULT_HASH_ALGORITHM,
+    use_cache: bool = True,
+) -> Optional[str]:
+    """Calculate the hash of a file for integrity checking.
 
     This function reads the file in chunks to handle large files efficiently
-    and calculates an MD5 hash for integrity verification.
+    and calculates a hash (MD5 by default) for integrity verification.
+
+    Unless use_cache is False, the persistent hash cache (see
+    photochart.hash_cache) is consulted first, so a file that did not change
+    since it was last hashed costs only a stat.
 
     Args:
         path: Path to the file to hash
         logger: Logger instance for error reporting
+        algorithm: Hash algorithm to use (see photochart.hashing.HashAlgorithm)
+        use_cache: Whether to use the persistent hash cache
 
     Returns:
-        MD5 hash as a hexadecimal string, or None if hashing fails
+        Hash as a hexadecimal string, or None if hashing fails
 
     Note:
-        Uses a chunk size of 4096 bytes for efficient memory usage
+        Reads into a reused buffer of photochart.hashing.HASH_BUFFER_SIZE bytes
     """
-    hash_md5 = hashlib.md5()
+    algorithm = HashAlgorithm(algorithm)
+    if not use_cache:
+        return hash_file(path, algorithm=algorithm, logger=logger)
+
     try:
-        with open(path, "rb") as f:
-            # Read file in chunks to handle large files efficiently
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
-    except Exception as exc:
+        stat_result = os.stat(path)
+    except OSError as exc:
         logger.error("Failed to calculate hash for %s: %s", path, exc)
         return None
+    return cached_hexdigest(
+        stat_result,
+        algorithm.value,
+        lambda: hash_file(path, algorithm=algorithm, logger=logger),
+        restat=lambda: os.stat(path),
+    )
 
 
 def check_disk_space(path: str, required_size: int, logger: Logger = LOGGER) -> bool:
@@ -148,9 +165,14 @@ def mv(src: str, dst: str, logger: Logger = LOGGER) -> None:
         # Perform chunked copy to temporary location
         cp(src, temp_dst)
 
-        # Verify file integrity through hash comparison
-        src_hash = calculate_hash(src)
-        dst_hash = calculate_hash(temp_dst)
+        # Verify file integrity through hash comparison. Size and head/tail
+        # samples are compared first, so a bad copy fails without hashing.
+        # The hash cache is bypassed: verification must read the actual bytes.
+        if files_may_match(src, temp_dst):
+            src_hash = calculate_hash(src, use_cache=False)
+            dst_hash = calculate_hash(temp_dst, use_cache=False)
+        else:
+            src_hash = dst_hash = None
 
         if src_hash and dst_hash and src_hash == dst_hash:
             logger.info("Integrity check passed for file %s", src)
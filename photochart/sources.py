@@ -0,0 +1,101 @@
+"""Expansion of source arguments into image files.
+
+Commands that work on many files (convert, info) accept files, directories and
+glob patterns. This module expands them into image files, together with the
+directory each file is relative to, so outputs can mirror the source tree.
+"""
+
+import glob
+import os
+from typing import Iterable, Iterator, Tuple
+
+from .formats import IMAGE_EXTENSIONS
+
+# Characters that make a source argument a glob pattern
+GLOB_CHARACTERS = "*?["
+
+
+def is_glob(pattern: str) -> bool:
+    """Check whether a source argument is a glob pattern."""
+    return any(character in pattern for character in GLOB_CHARACTERS)
+
+
+def glob_root(pattern: str) -> str:
+    """Get the directory part of a glob pattern before its first wildcard.
+
+    Files matched by the pattern are mirrored relative to this directory, e.g.
+    "shoot/**/*.nef" mirrors "shoot/day1/a.nef" as "day1/a.jpg".
+    """
+    root_parts = []
+    for part in pattern.split(os.sep):
+        if is_glob(part):
+            break
+        root_parts.append(part)
+    else:
+        # No wildcard at all: the last part is the file name
+        root_parts = root_parts[:-1]
+    root = os.sep.join(root_parts)
+    if not root and pattern.startswith(os.sep):
+        return os.sep
+    return root or "."
+
+
+def iter_directory_images(directory: str, recursive: bool = True) -> Iterator[str]:
+    """Yield the image files below a directory, in a stable (sorted) order.
+
+    Directory symlinks are not followed.
+
+    Args:
+        directory: Directory to walk
+        recursive: Whether to descend into subdirectories
+
+    Yields:
+        Paths of the image files
+    """
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        if not recursive:
+            dirs.clear()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                yield os.path.join(root, name)
+
+
+def iter_image_sources(
+    sources: Iterable[str], recursive: bool = True
+) -> Iterator[Tuple[str, str]]:
+    """Expand source arguments into image files.
+
+    - Files are yielded as they are, relative to their own directory.
+    - Directories are walked, and files are relative to the directory.
+    - Glob patterns (recursive "**" included) are expanded; matched files are
+      relative to the part of the pattern before the first wildcard, and only
+      image files are kept.
+
+    Args:
+        sources: Files, directories or glob patterns
+        recursive: Whether to descend into subdirectories of directory sources
+
+    Yields:
+        Tuples of (file path, base directory the file is relative to)
+    """
+    for source in sources:
+        if is_glob(source):
+            base = glob_root(source)
+            matches = sorted(glob.glob(source, recursive=True))
+        else:
+            base = None
+            matches = [source]
+
+        for match in matches:
+            if os.path.isdir(match):
+                directory_base = base if base is not None else match
+                for src in iter_directory_images(match, recursive):
+                    yield src, directory_base
+            elif os.path.isfile(match):
+                if (
+                    base is not None
+                    and os.path.splitext(match)[1].lower() not in IMAGE_EXTENSIONS
+                ):
+                    continue
+                yield match, base if base is not None else os.path.dirname(match)